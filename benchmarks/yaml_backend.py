@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+#
+# Copyright (c) 2026 Rackslab
+#
+# This file is part of RacksDB.
+#
+# SPDX-License-Identifier: MIT
+
+"""Compare parsing and dumping times of RacksDB YAML backend based on libyaml C
+bindings with PyYAML pure Python implementation, on the files of examples/db
+database scaled up by a factor.
+
+Run from the root of the repository:
+
+  $ PYTHONPATH=. python3 benchmarks/yaml_backend.py --scale 100
+"""
+
+import argparse
+import copy
+import time
+from pathlib import Path
+
+import yaml
+
+from racksdb.generic import yamlbackend
+
+EXAMPLES_DB = Path(__file__).parent.parent / "examples" / "db"
+
+
+def scaled_documents(path: Path, scale: int):
+    """Return the list of YAML documents of the database files, each document being
+    the concatenation of the content of a file repeated scale times in a list."""
+    documents = []
+    for _path in sorted(path.rglob("*.yml")):
+        content = yaml.safe_load(_path.read_text())
+        # Copy the content to avoid YAML aliases in scaled document.
+        documents.append(
+            yaml.dump(
+                [copy.deepcopy(content) for _ in range(scale)], Dumper=yaml.Dumper
+            )
+        )
+    return documents
+
+
+def measure(func, documents, repeat):
+    """Return the best time of repeat runs of func over all documents."""
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for document in documents:
+            func(document)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--db",
+        help="Database directory (default: %(default)s)",
+        default=EXAMPLES_DB,
+        type=Path,
+    )
+    parser.add_argument(
+        "--scale",
+        help="Scale factor of database files (default: %(default)s)",
+        default=100,
+        type=int,
+    )
+    parser.add_argument(
+        "--repeat",
+        help="Number of runs, the best time is reported (default: %(default)s)",
+        default=3,
+        type=int,
+    )
+    args = parser.parse_args()
+
+    if not yamlbackend.WITH_LIBYAML:
+        print("warning: PyYAML libyaml C bindings are not available")
+
+    documents = scaled_documents(args.db, args.scale)
+    size = sum(len(document) for document in documents)
+    print(f"Parsing {len(documents)} documents ({size / 1024**2:.1f} MiB)")
+    pure = measure(
+        lambda document: yaml.load(document, Loader=yaml.SafeLoader),
+        documents,
+        args.repeat,
+    )
+    backend = measure(yamlbackend.load, documents, args.repeat)
+    print(f"  pure Python: {pure:.3f}s")
+    print(f"  backend:     {backend:.3f}s (x{pure / backend:.1f})")
+
+    data = [yaml.safe_load(document) for document in documents]
+    print(f"Dumping {len(data)} documents")
+    pure = measure(lambda item: yaml.dump(item, Dumper=yaml.Dumper), data, args.repeat)
+    backend = measure(yamlbackend.dump, data, args.repeat)
+    print(f"  pure Python: {pure:.3f}s")
+    print(f"  backend:     {backend:.3f}s (x{pure / backend:.1f})")
+
+
+if __name__ == "__main__":
+    main()
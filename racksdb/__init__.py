@@ -8,7 +8,14 @@ from pathlib import Path
 import typing as t
 
 from .generic.schema import Schema, SchemaFileLoader, SchemaDefinedTypeLoader
-from .generic.db import GenericDB, DBDict, DBList, DBSplittedFilesLoader
+from .generic.db import (
+    GenericDB,
+    DBDict,
+    DBList,
+    DBSplittedFilesLoader,
+    cached_property,
+)
+from .generic.snapshot import DBSnapshot
 from .generic.errors import DBSchemaError, DBFormatError
 from .errors import (
     RacksDBFormatError,
@@ -31,15 +38,26 @@ class RacksDB(GenericDB):
         super().__init__(self.PREFIX, schema, bases)
         self._loader = loader
 
-    @property
-    def nodes(self):
+    @cached_property
+    def _nodes(self):
+        """Nodes of all infrastructures, shared by all accesses to nodes property. It
+        must not be modified."""
         result = DBDict()
         for infrastructure in self.infrastructures:
-            result.update(infrastructure.nodes)
+            result.update(infrastructure._nodes)
         return result
 
     @property
-    def racks(self):
+    def nodes(self):
+        """Return a copy of the nodes of all infrastructures. The nodes are gathered
+        once, the returned DBDict can be modified by callers without altering the
+        following results."""
+        return self._nodes.copy()
+
+    @cached_property
+    def _racks(self):
+        """Racks of all datacenters, shared by all accesses to racks property. It
+        must not be modified."""
         result = DBList()
         for datacenter in self.datacenters:
             for room in datacenter.rooms:
@@ -48,6 +66,23 @@ class RacksDB(GenericDB):
                         result.append(rack)
         return result
 
+    @property
+    def racks(self):
+        """Return a copy of the racks of all datacenters. The racks are gathered
+        once, the returned DBList can be modified by callers without altering the
+        following results."""
+        return self._racks.copy()
+
+    @cached_property
+    def _racks_parts(self):
+        """Reverse index of infrastructures parts by rack name. It is shared by all
+        racks and must not be modified."""
+        result = {}
+        for infrastructure in self.infrastructures:
+            for part in infrastructure.layout:
+                result.setdefault(part.rack.name, []).append(part)
+        return result
+
     def tags(
         self,
         node: t.Optional[str] = None,
@@ -90,6 +125,9 @@ class RacksDB(GenericDB):
         schema: t.Union[str, Path, None] = None,
         ext: t.Union[str, Path, None] = None,
         db: t.Union[str, Path, None] = None,
+        cache: t.Union[str, Path, None] = None,
+        workers: int = 1,
+        previous: t.Optional["RacksDB"] = None,
     ):
         # Unfortunately, default values to arguments cannot be used as they are
         # class attributes and the class is not defined yet at this stage at
@@ -108,16 +146,41 @@ class RacksDB(GenericDB):
             db = Path(cls.DEFAULT_DB)
         elif isinstance(db, str):
             db = Path(db)
+        # When cache directory is defined, content parsed from schema and database
+        # files is restored from snapshot in this directory when files are unmodified.
+        if cache is not None:
+            snapshot = DBSnapshot(Path(cache), schema, ext, db)
+            schema_loader = snapshot.schema_loader()
+        else:
+            snapshot = None
+            schema_loader = SchemaFileLoader(schema, ext)
         try:
             _schema = Schema(
-                SchemaFileLoader(schema, ext),
+                schema_loader,
                 SchemaDefinedTypeLoader(cls.DEFINED_TYPES_MODULE),
             )
         except DBSchemaError as err:
             raise RacksDBSchemaError(str(err)) from err
+        # When previous RacksDB is provided, unmodified files are not parsed again
+        # and the objects of unmodified content are reused, as long as the schema is
+        # unmodified.
+        previous_loader = None
+        if previous is not None:
+            previous_loader = previous._loader
+            if _schema._schema == previous._schema._schema:
+                _schema = previous._schema
         try:
-            _db = cls(_schema, DBSplittedFilesLoader(db))
-            super(cls, _db).load(_db._loader)
+            if snapshot is not None:
+                db_loader = snapshot.db_loader(workers, previous_loader)
+            else:
+                db_loader = DBSplittedFilesLoader(db, workers, previous_loader)
+            _db = cls(_schema, db_loader)
+            if snapshot is not None and not snapshot.valid:
+                snapshot.save(_schema._schema, db_loader.content)
+            if previous is not None and previous._schema is _schema:
+                _db.load_incremental(_db._loader, previous)
+            else:
+                super(cls, _db).load(_db._loader)
         except DBFormatError as err:
             raise RacksDBFormatError(str(err)) from err
         return _db
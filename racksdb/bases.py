@@ -6,22 +6,18 @@
 
 import math
 
-try:
-    from functools import cached_property
-except ImportError:
-    # For Python 3.[6-7] compatibility. The dependency to cached_property
-    # external library is not declared in pyproject.toml, it is added
-    # explicitely in packages codes only for distributions stuck with these old
-    # versions of Python.
-    #
-    # This try/except block can be removed when support of Python < 3.8 is
-    # dropped in RacksDB.
-    from cached_property import cached_property
-
-from .generic.db import DBList, DBDict
+from .generic.db import (
+    DBList,
+    DBDict,
+    DBObjectRange,
+    cached_property,
+    expanded_cached_property,
+)
 
 
 class RacksDBDatacenterBase:
+    __slots__ = ()
+
     def _filter(self, name=None, tags=None):
         # filter by name
         if name is not None and name != self.name:
@@ -33,18 +29,23 @@ class RacksDBDatacenterBase:
                     return False
         return True
 
-    @property
-    def racks(self):
+    @cached_property
+    def _racks(self):
         result = DBList()
         for room in self.rooms:
             for row in room.rows:
                 result.extend(row.racks)
         return result
 
+    @property
+    def racks(self):
+        # Return a copy so callers cannot alter the cached list.
+        return self._racks.copy()
+
     @property
     def racks_tags(self):
         result = DBList()
-        for rack in self.racks:
+        for rack in self._racks:
             for tag in getattr(rack, "tags", []):
                 if tag not in result:
                     result.append(tag)
@@ -52,8 +53,10 @@ class RacksDBDatacenterBase:
 
 
 class RacksDBInfrastructureBase:
-    @property
-    def nodes(self):
+    __slots__ = ()
+
+    @cached_property
+    def _nodes(self):
         result = DBDict()
         for part in self.layout:
             # Iterate over the keys of DBDict instead of the DBDict itself to
@@ -62,10 +65,15 @@ class RacksDBInfrastructureBase:
                 result[key] = part.nodes[key]
         return result
 
+    @property
+    def nodes(self):
+        # Return a copy so callers cannot alter the cached dict.
+        return self._nodes.copy()
+
     @property
     def nodes_tags(self):
         result = DBList()
-        for node in self.nodes:
+        for node in self._nodes:
             for tag in node.tags:
                 if tag not in result:
                     result.append(tag)
@@ -84,6 +92,8 @@ class RacksDBInfrastructureBase:
 
 
 class RacksDBGenericEquipment:
+    __slots__ = ()
+
     @property
     def tags(self):
         result = DBList()
@@ -98,7 +108,7 @@ class RacksDBGenericEquipment:
                 result.append(tag)
         return result
 
-    @cached_property
+    @expanded_cached_property
     def position(self):
         obj = self._db.create_object_by_name("EquipmentPosition")
         obj.height = (
@@ -126,22 +136,24 @@ class RacksDBGenericEquipment:
 
 
 class RacksDBNodeBase(RacksDBGenericEquipment):
-    pass
+    __slots__ = ()
 
 
 class RacksDBStorageEquipmentBase(RacksDBGenericEquipment):
-    pass
+    __slots__ = ()
 
 
 class RacksDBNetworkEquipmentBase(RacksDBGenericEquipment):
-    pass
+    __slots__ = ()
 
 
 class RacksDBMiscEquipmentBase(RacksDBGenericEquipment):
-    pass
+    __slots__ = ()
 
 
 class RacksDBRackBase:
+    __slots__ = ()
+
     def _filter(self, name=None):
         # filter by name
         if name is not None and name != self.name:
@@ -152,32 +164,36 @@ class RacksDBRackBase:
     def fillrate(self):
         """Return the fill rate of the rack as a float normalized between 0 and 1."""
         occupied = 0.0
-        for infrastructure in self._db.infrastructures:
-            for part in infrastructure.layout:
-                if self.name == part.rack.name:
-                    for equipment in part.nodes:
-                        occupied += equipment.type.height * equipment.type.width
-                    for equipment in part.storage:
-                        occupied += equipment.type.height * equipment.type.width
-                    for equipment in part.network:
-                        occupied += equipment.type.height * equipment.type.width
-                    for equipment in part.misc:
-                        occupied += equipment.type.height * equipment.type.width
+        for part in self._db._racks_parts.get(self.name, []):
+            for equipments in [part.nodes, part.storage, part.network, part.misc]:
+                # Iterate over the items of DBDict instead of the DBDict itself to
+                # avoid triggering expansion of expandable objects, the number of
+                # equipments is given by the length of their key ranges. The area
+                # is added once per equipment, as a multiplication would round the
+                # sum differently.
+                for key, equipment in equipments.items():
+                    if isinstance(key, DBObjectRange):
+                        count = len(key.rangeset)
+                    else:
+                        count = 1
+                    area = equipment.type.height * equipment.type.width
+                    for _ in range(count):
+                        occupied += area
         return occupied / self.type.slots
 
     @property
     def nodes(self):
         result = DBList()
         # add reference to infrastructures nodes
-        for infrastructure in self._db.infrastructures:
-            for part in infrastructure.layout:
-                if self.name == part.rack.name:
-                    for nodes in part.nodes.values():
-                        result.append(nodes)
+        for part in self._db._racks_parts.get(self.name, []):
+            for nodes in part.nodes.values():
+                result.append(nodes)
         return result
 
 
 class RacksDBRacksRowBase:
+    __slots__ = ()
+
     @property
     def nbracks(self):
         """Return the number of racks in the row."""
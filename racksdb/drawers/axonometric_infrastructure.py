@@ -19,6 +19,32 @@ logger = logging.getLogger(__name__)
 
 
 class AxonometricInfrastructureDrawer(InfrastructureDrawer):
+    def __init__(
+        self,
+        db,
+        name,
+        file,
+        output_format,
+        parameters,
+        coordinates_fh,
+        coordinates_format,
+    ):
+        super().__init__(
+            db,
+            name,
+            file,
+            output_format,
+            parameters,
+            coordinates_fh,
+            coordinates_format,
+        )
+        # Vertical positions in mm of the bottom-left corners of rack rows
+        self.rows_dl_abs = {}
+
+    def _reset_layout(self):
+        super()._reset_layout()
+        self.rows_dl_abs = {}
+
     @property
     def x_cos(self):
         return math.cos(math.radians(self.parameters.axonometric.angles.x))
@@ -47,39 +73,33 @@ class AxonometricInfrastructureDrawer(InfrastructureDrawer):
     def _rack_row_depth(self, row) -> int:
         """Return rack row depth, ie. the maximum rack depth among the represented
         racks in the row, in mm."""
-        row_max_depth = 0
-        for rack in row.racks:
-            if self._rack_must_be_represented(rack):
-                row_max_depth = max(row_max_depth, rack.type.depth)
-        return row_max_depth
+        return self._rack_row_layout(row).depth
 
     def _nb_represented_racks_in_row(self, row) -> int:
         """Return the number of represented racks in a given row."""
-        nb = 0
-        for rack in row.racks:
-            if self._rack_must_be_represented(rack):
-                nb += 1
-        return nb
+        return len(self._rack_row_layout(row).represented)
 
     def _rack_row_dl_abs(self, row) -> ImagePoint:
-        point = ImagePoint(self._rack_row_depth(row) * self.x_cos, 0)
-        # sum height of all previous rows
-        for index, rack_row in enumerate(self.rack_rows):
-            # Add width of first row
-            point.y += (
-                self._rack_row_height(rack_row)
-                + self._rack_row_depth(rack_row) * self.x_sin
-            )
-            # Add first row width
-            if index == 0:
-                point.y += self._rack_row_width(rack_row) * self.z_sin
-            else:
-                point.y += self._rack_row_depth(rack_row) * self.z_sin
-            if rack_row is row:
-                break
-        return point
-
-    def _rack_row_dl(self, row) -> ImagePoint:
+        """Return the bottom-left corner of the given rack row in mm, computed once for
+        all rows."""
+        if not self.rows_dl_abs:
+            # sum height of all previous rows
+            y = 0
+            for index, rack_row in enumerate(self.rack_rows):
+                # Add width of first row
+                y += (
+                    self._rack_row_height(rack_row)
+                    + self._rack_row_depth(rack_row) * self.x_sin
+                )
+                # Add first row width
+                if index == 0:
+                    y += self._rack_row_width(rack_row) * self.z_sin
+                else:
+                    y += self._rack_row_depth(rack_row) * self.z_sin
+                self.rows_dl_abs[rack_row] = y
+        return ImagePoint(self._rack_row_depth(row) * self.x_cos, self.rows_dl_abs[row])
+
+    def _compute_rack_row_dl(self, row) -> ImagePoint:
         point = self._rack_row_dl_abs(row)
         point.x *= self.ratio
         point.y *= self.ratio
@@ -102,21 +122,13 @@ class AxonometricInfrastructureDrawer(InfrastructureDrawer):
 
     def _rack_dl_abs(self, rack) -> ImagePoint:
         point = self._rack_row_dl_abs(rack.row)
-        x_offset = 0
         # Sum the width of all racks in row before the current rack
-        if rack.row.reversed:
-            for row_rack in rack.row.racks:
-                if row_rack.slot > rack.slot:
-                    x_offset += row_rack.type.width
-        else:
-            for row_rack in rack.row.racks:
-                if row_rack.slot < rack.slot:
-                    x_offset += row_rack.type.width
+        x_offset = self._rack_row_layout(rack.row).offsets[rack.name]
         point.x += x_offset * self.z_cos
         point.y -= x_offset * self.z_sin
         return point
 
-    def _rack_dl(self, rack) -> ImagePoint:
+    def _compute_rack_dl(self, rack) -> ImagePoint:
         dl = self._rack_dl_abs(rack)
         dl.x *= self.ratio
         dl.y *= self.ratio
@@ -135,27 +147,16 @@ class AxonometricInfrastructureDrawer(InfrastructureDrawer):
                 break
             dl.y += self._rack_row_spacing_height()
 
-        # Add x spacing between all racks in row before the current rack
-        x_offset = 0
-        if rack.row.reversed:
-            for row_rack in rack.row.racks:
-                if (
-                    self._rack_must_be_represented(row_rack)
-                    and row_rack.slot > rack.slot
-                ):
-                    x_offset += self.parameters.rack.spacing
-        else:
-            for row_rack in rack.row.racks:
-                if (
-                    self._rack_must_be_represented(row_rack)
-                    and row_rack.slot < rack.slot
-                ):
-                    x_offset += self.parameters.rack.spacing
+        # Add x spacing between all represented racks in row before the current rack
+        x_offset = (
+            self.parameters.rack.spacing
+            * self._rack_row_layout(rack.row).represented_before[rack.name]
+        )
         dl.x += x_offset * self.z_cos
         dl.y -= x_offset * self.z_sin
         return dl
 
-    def _equipment_tl(self, equipment) -> ImagePoint:
+    def _compute_equipment_tl(self, equipment) -> ImagePoint:
         tl = self._rack_dl(equipment.rack)
 
         logger.debug(
@@ -379,16 +380,15 @@ class AxonometricInfrastructureDrawer(InfrastructureDrawer):
         self.ctx.fill()
 
         # draw equipments in rack
-        for part in self.infrastructure.layout:
-            if part.rack.name == rack.name:
-                for equipment in sorted(
-                    chain(part.nodes, part.storage, part.network, part.misc),
-                    key=lambda equipment: (
-                        equipment.position.height,
-                        -equipment.position.width,
-                    ),
-                ):
-                    self._draw_rack_equipment(equipment)
+        for part in self.racks_parts.get(rack.name, []):
+            for equipment in sorted(
+                chain(part.nodes, part.storage, part.network, part.misc),
+                key=lambda equipment: (
+                    equipment.position.height,
+                    -equipment.position.width,
+                ),
+            ):
+                self._draw_rack_equipment(equipment)
 
         # draw rack front panes
         self.ctx.set_source_rgba(*colorset.pane)
@@ -508,6 +508,8 @@ class AxonometricInfrastructureDrawer(InfrastructureDrawer):
             self.parameters.dimensions.height,
         )
 
+        self._reset_layout()
+
         # Get list of racks and rows used by the infrastructure
         for part in self.infrastructure.layout:
             # If discard_empty_racks is True, skip parts without equipment selected for
@@ -598,6 +600,7 @@ class AxonometricInfrastructureDrawer(InfrastructureDrawer):
         logger.debug("Final width: %d", surface_width)
         logger.debug("Final height: %d", surface_height)
 
+        self._compute_positions()
         self.init_ctx(surface_width, surface_height)
         self._draw_infrastructure()
         self.write()
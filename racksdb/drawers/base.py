@@ -6,6 +6,7 @@
 
 from typing import Union
 import logging
+import weakref
 
 import cairo
 import gi
@@ -22,21 +23,114 @@ gi.require_version("PangoCairo", "1.0")
 # ruff QA exception on E402.
 from gi.repository import Pango, PangoCairo  # noqa: E402
 
-
 logger = logging.getLogger(__name__)
 
+# Decreasing font sizes tried to fit text labels into maximum width and height, with
+# their font descriptions.
+TEXT_FONT_SIZES = range(12, 4, -1)
+_fonts_descriptions = {
+    size: Pango.font_description_from_string(f"Sans Serif Normal {size}")
+    for size in TEXT_FONT_SIZES
+}
 
-def default_rack_colorset(parameters):
-    schema_object = parameters.colors._schema.prop("racks").type.content
+
+# Default color sets and compiled coloring rules memoized per drawing parameters
+# instance, released with the drawing parameters.
+_colorsets = weakref.WeakKeyDictionary()
+
+
+def _memoized(parameters, key, builder):
+    """Return the value with the given key memoized for the given drawing parameters,
+    build it with the given function if not memoized yet."""
+    values = _colorsets.get(parameters)
+    if values is None:
+        values = _colorsets.setdefault(parameters, {})
+    try:
+        return values[key]
+    except KeyError:
+        values[key] = builder()
+        return values[key]
+
+
+def _default_colorset(parameters, kind):
+    schema_object = parameters.colors._schema.prop(kind).type.content
     return GenericDB("DefaultsColorSet", parameters.colors._schema, None).load_object(
-        "racks", schema_object.recursive_defaults(), schema_object, None
+        kind, schema_object.recursive_defaults(), schema_object, None
+    )
+
+
+def default_rack_colorset(parameters):
+    return _memoized(
+        parameters,
+        "default_racks",
+        lambda: _default_colorset(parameters, "racks"),
     )
 
 
 def default_equipment_colorset(parameters):
-    schema_object = parameters.colors._schema.prop("equipments").type.content
-    return GenericDB("DefaultsColorSet", parameters.colors._schema, None).load_object(
-        "equipments", schema_object.recursive_defaults(), schema_object, None
+    return _memoized(
+        parameters,
+        "default_equipments",
+        lambda: _default_colorset(parameters, "equipments"),
+    )
+
+
+class ColoringRules:
+    """Coloring rules compiled for fast lookups of the rule matching an object. The
+    rules are indexed by type id, with the rules without type in every index, in
+    their order of definition. Tags of rules are converted to sets to check inclusion
+    of tags. The result of lookup is saved for every pair of type and set of tags of
+    objects."""
+
+    def __init__(self, rules):
+        compiled = [
+            (
+                rule.type if hasattr(rule, "type") else None,
+                frozenset(rule.tags) if hasattr(rule, "tags") else None,
+                rule,
+            )
+            for rule in rules
+        ]
+        # Rules that match objects of any type
+        self.untyped = [(tags, rule) for _type, tags, rule in compiled if _type is None]
+        self.types = {}
+        for _type, _, _ in compiled:
+            if _type is None or _type in self.types:
+                continue
+            self.types[_type] = [
+                (tags, rule)
+                for __type, tags, rule in compiled
+                if __type is None or __type == _type
+            ]
+        self.results = {}
+
+    def find(self, obj):
+        """Return the first rule matching the given object, or None if no rule
+        matches."""
+        tags = frozenset(obj.tags) if hasattr(obj, "tags") else None
+        key = (obj.type.id, tags)
+        try:
+            return self.results[key]
+        except KeyError:
+            pass
+        result = None
+        for rule_tags, rule in self.types.get(obj.type.id, self.untyped):
+            if rule_tags is None or (tags is not None and rule_tags <= tags):
+                result = rule
+                break
+        self.results[key] = result
+        return result
+
+
+def rack_coloring_rules(parameters):
+    return _memoized(
+        parameters, "racks", lambda: ColoringRules(parameters.colors.racks)
+    )
+
+
+def equipment_coloring_rules(parameters):
+    return _memoized(
+        parameters, "equipments", lambda: ColoringRules(parameters.colors.equipments)
     )
 
 
@@ -59,6 +153,13 @@ class Drawer:
         self.coordinates = {}
         self.surface = None
         self.ctx = None
+        # Pango layout reused to print all text labels, with the context it has been
+        # created for.
+        self._layout = None
+        self._layout_ctx = None
+        # Font sizes and heights of text labels measured by _print_text(), indexed
+        # by text, maximum width and height and context transformation.
+        self._text_measures = {}
 
     def init_ctx(self, width, height):
         if self.output_format == "png":
@@ -97,16 +198,10 @@ class Drawer:
 
         In other cases, the coloring rule does not match. If no coloring rule matches
         the rack, the default rack color set is returned."""
-        for rule in self.parameters.colors.racks:
-            if hasattr(rule, "type") and rule.type != rack.type.id:
-                continue
-            if hasattr(rule, "tags") and (
-                not hasattr(rack, "tags")
-                or not all(tag in rack.tags for tag in rule.tags)
-            ):
-                continue
-            return rule
-        return default_rack_colorset(self.parameters)
+        rule = rack_coloring_rules(self.parameters).find(rack)
+        if rule is None:
+            return default_rack_colorset(self.parameters)
+        return rule
 
     def _find_equipment_colorset(self, equipment):
         """Return the equipment matching coloring rule defined in drawing parameters or
@@ -122,16 +217,21 @@ class Drawer:
 
         In other cases, the coloring rule does not match. If no coloring rule matches
         the equipment, the default equipment color set is returned."""
-        for rule in self.parameters.colors.equipments:
-            if hasattr(rule, "type") and rule.type != equipment.type.id:
-                continue
-            if hasattr(rule, "tags") and (
-                not hasattr(equipment, "tags")
-                or not all(tag in equipment.tags for tag in rule.tags)
-            ):
-                continue
-            return rule
-        return default_equipment_colorset(self.parameters)
+        rule = equipment_coloring_rules(self.parameters).find(equipment)
+        if rule is None:
+            return default_equipment_colorset(self.parameters)
+        return rule
+
+    def _text_layout(self):
+        """Return Pango layout to print text labels, created once per context and
+        updated with the current transformation of the context."""
+        if self._layout is None or self._layout_ctx is not self.ctx:
+            self._layout = PangoCairo.create_layout(self.ctx)
+            self._layout.set_alignment(Pango.Alignment.CENTER)
+            self._layout_ctx = self.ctx
+        else:
+            PangoCairo.update_layout(self.ctx, self._layout)
+        return self._layout
 
     def _print_text(
         self,
@@ -145,21 +245,31 @@ class Drawer:
         maximum width and height. The boolean shift_x and shift_y can be set to True in
         order to shift the position of the text label by its height vertically or
         horizontally respectively."""
-        layout = PangoCairo.create_layout(self.ctx)
-        layout.set_alignment(Pango.Alignment.CENTER)
-        # Try multiple decreasing size until it fits into optional max width/height
-        for size in range(12, 4, -1):
-            layout.set_font_description(
-                Pango.font_description_from_string(f"Sans Serif Normal {size}")
-            )
+        layout = self._text_layout()
+        # Text extents depend on the linear part of the context transformation
+        # matrix, due to fonts hinting, but not on its translation.
+        matrix = self.ctx.get_matrix()
+        key = (text, max_width, max_height, matrix.xx, matrix.yx, matrix.xy, matrix.yy)
+        measure = self._text_measures.get(key)
+        if measure is not None:
+            size, th = measure
+            layout.set_font_description(_fonts_descriptions[size])
             layout.set_markup(text, -1)
-            _, extents = layout.get_pixel_extents()
-            tw, th = extents.width, extents.height
-            # If max_{width/height} is set, text label width/height must be smaller.
-            if (max_width is None or tw < max_width) and (
-                max_height is None or th < max_height
-            ):
-                break
+        else:
+            # Try multiple decreasing size until it fits into optional max
+            # width/height
+            for size in TEXT_FONT_SIZES:
+                layout.set_font_description(_fonts_descriptions[size])
+                layout.set_markup(text, -1)
+                _, extents = layout.get_pixel_extents()
+                tw, th = extents.width, extents.height
+                # If max_{width/height} is set, text label width/height must be
+                # smaller.
+                if (max_width is None or tw < max_width) and (
+                    max_height is None or th < max_height
+                ):
+                    break
+            self._text_measures[key] = (size, th)
         if shift_x:
             self.ctx.rel_move_to(-th, 0)
         if shift_y:
@@ -0,0 +1,189 @@
+# Copyright (c) 2026 Rackslab
+#
+# This file is part of RacksDB.
+#
+# SPDX-License-Identifier: MIT
+
+import multiprocessing
+import time
+import logging
+import typing as t
+from pathlib import Path
+
+from .room import RoomDrawer
+from .infrastructure import InfrastructureDrawer
+from .axonometric_infrastructure import AxonometricInfrastructureDrawer
+from ..errors import RacksDBError
+
+logger = logging.getLogger(__name__)
+
+# Batch of drawings rendered by the pool of processes. The loaded database and
+# drawing parameters cannot be serialized as their classes are dynamically defined,
+# they are inherited by forked processes with this global variable instead.
+_batch = None
+
+
+def drawer_class(entity: str, parameters):
+    """Return the drawer class for the given type of entity and drawing parameters."""
+    if entity == "infrastructure":
+        if parameters.axonometric.enabled:
+            return AxonometricInfrastructureDrawer
+        return InfrastructureDrawer
+    elif entity == "room":
+        return RoomDrawer
+    raise RacksDBError(f"Unsupported entity {entity} to draw")
+
+
+class BatchDrawing:
+    """Drawing of an entity in a given format rendered in batch, with the duration of
+    the rendering in seconds and the error message when the rendering failed."""
+
+    def __init__(
+        self,
+        entity: str,
+        name: str,
+        format: str,
+        path: Path,
+        coordinates_path: t.Optional[Path],
+    ):
+        self.entity = entity
+        self.name = name
+        self.format = format
+        self.path = path
+        self.coordinates_path = coordinates_path
+        self.duration = None
+        self.error = None
+
+
+class DrawingsBatch:
+    """Batch of drawings of multiple entities in multiple formats, rendered with the
+    database and the drawing parameters loaded once. The image files are generated in
+    a subdirectory of the output directory named after the type of entity. When the
+    coordinates format is set, the coordinates are dumped in files next to the image
+    files in the first format of every entity."""
+
+    ENTITIES = ["infrastructure", "room"]
+
+    def __init__(
+        self,
+        db,
+        parameters,
+        output: Path,
+        entities: t.Optional[t.List[str]] = None,
+        formats: t.Optional[t.List[str]] = None,
+        coordinates_format: t.Optional[str] = None,
+    ):
+        self.db = db
+        self.parameters = parameters
+        self.output = output
+        self.coordinates_format = coordinates_format
+        if entities is None:
+            entities = self.ENTITIES
+        if formats is None:
+            formats = ["png"]
+        self.drawings = []
+        for entity in entities:
+            for name in self._names(entity):
+                for index, _format in enumerate(formats):
+                    coordinates_path = None
+                    if coordinates_format is not None and not index:
+                        coordinates_path = (
+                            output / entity / f"{name}.{coordinates_format}"
+                        )
+                    self.drawings.append(
+                        BatchDrawing(
+                            entity,
+                            name,
+                            _format,
+                            output / entity / f"{name}.{_format}",
+                            coordinates_path,
+                        )
+                    )
+
+    def _names(self, entity: str) -> t.List[str]:
+        """Return the names of all entities of the given type in database."""
+        if entity == "infrastructure":
+            return [infrastructure.name for infrastructure in self.db.infrastructures]
+        elif entity == "room":
+            return [
+                room.name
+                for datacenter in self.db.datacenters
+                for room in datacenter.rooms
+            ]
+        raise RacksDBError(f"Unsupported entity {entity} to draw")
+
+    def _draw(self, index: int) -> t.Tuple[float, t.Optional[str]]:
+        """Render the drawing at the given index and return the duration of the
+        rendering and the error message if it failed."""
+        drawing = self.drawings[index]
+        start = time.perf_counter()
+        error = None
+        coordinates_fh = None
+        try:
+            if drawing.coordinates_path is not None:
+                coordinates_fh = open(drawing.coordinates_path, "w+")
+            drawer = drawer_class(drawing.entity, self.parameters)(
+                self.db,
+                drawing.name,
+                str(drawing.path),
+                drawing.format,
+                self.parameters,
+                coordinates_fh,
+                self.coordinates_format,
+            )
+            drawer.draw()
+        except (RacksDBError, OSError) as err:
+            error = str(err)
+        finally:
+            if coordinates_fh is not None:
+                coordinates_fh.close()
+        return time.perf_counter() - start, error
+
+    def render(self, workers: int = 1) -> t.List[BatchDrawing]:
+        """Render all drawings of the batch with the given number of parallel worker
+        processes and return the list of drawings with their durations and errors.
+        The processes are forked to inherit the loaded database, drawings are rendered
+        sequentially when fork is not supported on the platform."""
+        global _batch
+        for entity in {drawing.entity for drawing in self.drawings}:
+            (self.output / entity).mkdir(parents=True, exist_ok=True)
+        if workers > 1 and "fork" not in multiprocessing.get_all_start_methods():
+            logger.warning(
+                "Unable to render drawings in parallel processes without fork support"
+            )
+            workers = 1
+        indexes = range(len(self.drawings))
+        if workers > 1 and len(self.drawings) > 1:
+            logger.debug(
+                "Rendering %d drawings with %d processes",
+                len(self.drawings),
+                workers,
+            )
+            _batch = self
+            try:
+                with multiprocessing.get_context("fork").Pool(workers) as pool:
+                    results = pool.map(_draw_batch, indexes)
+            finally:
+                _batch = None
+        else:
+            results = [self._draw(index) for index in indexes]
+        for drawing, (duration, error) in zip(self.drawings, results):
+            drawing.duration = duration
+            drawing.error = error
+            if error is None:
+                logger.info("Generated image file %s", drawing.path)
+            else:
+                logger.error(
+                    "Unable to draw %s %s in format %s: %s",
+                    drawing.entity,
+                    drawing.name,
+                    drawing.format,
+                    error,
+                )
+        return self.drawings
+
+
+def _draw_batch(index: int) -> t.Tuple[float, t.Optional[str]]:
+    """Render drawing at the given index of the batch inherited from parent
+    process."""
+    return _batch._draw(index)
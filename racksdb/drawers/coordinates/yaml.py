@@ -4,9 +4,8 @@
 #
 # SPDX-License-Identifier: MIT
 
-import yaml
-
 from .base import CoordinatesDumper
+from ...generic import yamlbackend
 
 
 class CoordinatesDumperYaml(CoordinatesDumper):
@@ -14,6 +13,6 @@ class CoordinatesDumperYaml(CoordinatesDumper):
         pass
 
     def dump(self, coordinates):
-        return yaml.dump(
+        return yamlbackend.dump(
             {key: coordinate._serialized for key, coordinate in coordinates.items()}
         )
@@ -29,6 +29,59 @@ class EquipmentCoordinate:
         return [self.x, self.y, self.width, self.height]
 
 
+class RackRowLayout:
+    """Layout of a row of racks in mm, computed in a single pass over the racks of the
+    row, with the dimensions of the row restricted to its represented racks."""
+
+    def __init__(self, row, represented):
+        self.row = row
+        # Names of represented racks in the row
+        self.represented = {rack.name for rack in row.racks if represented(rack)}
+        racks = [rack for rack in row.racks if rack.name in self.represented]
+        self.height = max([0] + [rack.type.height for rack in racks])
+        self.depth = max([0] + [rack.type.depth for rack in racks])
+        if row.reversed:
+            # If row is reversed, sum widths of all racks over the minimum slot among
+            # racks to represent in the row.
+            min_slot = min([rack.slot for rack in racks], default=math.inf)
+            self.width = sum(
+                rack.type.width for rack in row.racks if rack.slot >= min_slot
+            )
+        else:
+            # Else, sum widths of all racks below the maximum slot among racks to
+            # represent in the row.
+            max_slot = max([0] + [rack.slot for rack in racks])
+            self.width = sum(
+                rack.type.width for rack in row.racks if rack.slot <= max_slot
+            )
+        # Sum of widths of racks and number of represented racks before every rack in
+        # row.
+        self.offsets = self.before(lambda rack: rack.type.width)
+        self.represented_before = self.before(
+            lambda rack: int(rack.name in self.represented)
+        )
+
+    def before(self, value) -> dict:
+        """Return dict of racks names with the sum of the given function results for
+        all racks before in the row, ie. racks with lower slots or higher slots if the
+        row is reversed."""
+        result = {}
+        total = 0
+        # Sum of values of racks in the same slot
+        pending = 0
+        slot = None
+        for rack in sorted(
+            self.row.racks, key=lambda rack: rack.slot, reverse=self.row.reversed
+        ):
+            if rack.slot != slot:
+                total += pending
+                pending = 0
+                slot = rack.slot
+            result[rack.name] = total
+            pending += value(rack)
+        return result
+
+
 class InfrastructureDrawer(Drawer):
     def __init__(
         self,
@@ -57,14 +110,23 @@ class InfrastructureDrawer(Drawer):
         self.racks = []
         # Calculated at draw time based on dimensions
         self.ratio = 1
+        # Parts of the infrastructure indexed by rack name
+        self.racks_parts = {}
+        for part in self.infrastructure.layout:
+            self.racks_parts.setdefault(part.rack.name, []).append(part)
+        # Layout of the drawing, with racks represented and rack rows dimensions in
+        # mm computed once for every rack and row, and positions in pixels of rows,
+        # racks and equipment computed once per draw by _compute_positions().
+        self.represented_racks = {}
+        self.rows_layouts = {}
+        self.rows_dl = {}
+        self.rows_x_offsets = {}
+        self.racks_dl = {}
+        self.equipments_tl = {}
 
     def _rack_in_infrastructure(self, rack) -> bool:
         """Return True if rack is used in infrastructure, False otherwise."""
-        for part in self.infrastructure.layout:
-            if part.rack.name == rack.name:
-                return True
-
-        return False
+        return rack.name in self.racks_parts
 
     def _part_contains_selected_equipment(self, part) -> bool:
         """Return True if the infrastructure part contains equipment that is selected
@@ -86,55 +148,45 @@ class InfrastructureDrawer(Drawer):
     def _rack_contains_selected_equipment(self, rack) -> bool:
         """Return True if the given rack contains equipment that is selected
         for representation in the diagram, False otherwise."""
-        for part in self.infrastructure.layout:
-            if part.rack.name == rack.name:
-                if self._part_contains_selected_equipment(part):
-                    return True
-        return False
+        return any(
+            self._part_contains_selected_equipment(part)
+            for part in self.racks_parts.get(rack.name, [])
+        )
 
     def _rack_must_be_represented(self, rack) -> bool:
         """Return true if the given rack must be represented in infrastructure diagram.
         This method must be called only with racks in rows where the infrastructure is
-        present."""
+        present. The result is computed once per rack."""
+        try:
+            return self.represented_racks[rack.name]
+        except KeyError:
+            pass
         # When other_racks is true, the rack must be represented as soon as it is in the
         # row.
         if self.parameters.infrastructure.other_racks:
-            return True
+            result = True
         # Else the rack must be represented if it used in infrastructure and if it
         # contains selected equipment or discard_empty_rack is disabled.
-        return self._rack_in_infrastructure(rack) and (
-            not self.parameters.infrastructure.discard_empty_racks
-            or self._rack_contains_selected_equipment(rack)
-        )
+        else:
+            result = self._rack_in_infrastructure(rack) and (
+                not self.parameters.infrastructure.discard_empty_racks
+                or self._rack_contains_selected_equipment(rack)
+            )
+        self.represented_racks[rack.name] = result
+        return result
+
+    def _rack_row_layout(self, row) -> RackRowLayout:
+        """Return the layout of the given rack row, computed once per row."""
+        try:
+            return self.rows_layouts[row]
+        except KeyError:
+            pass
+        self.rows_layouts[row] = RackRowLayout(row, self._rack_must_be_represented)
+        return self.rows_layouts[row]
 
     def _rack_row_width(self, row) -> int:
         """Return rack row width in mm"""
-        total = 0
-
-        if row.reversed:
-            # If row is reversed, search for the minimum slot among racks to represent
-            # in the row.
-            min_slot = math.inf
-            for rack in row.racks:
-                if self._rack_must_be_represented(rack) and rack.slot < min_slot:
-                    min_slot = rack.slot
-            # Sum widths of all racks over this minimum slot
-            for rack in row.racks:
-                if rack.slot >= min_slot:
-                    total += rack.type.width
-
-        else:
-            max_slot = 0
-            # Else, search for the maximum slot among racks to represent in the row.
-            for rack in row.racks:
-                if self._rack_must_be_represented(rack) and rack.slot > max_slot:
-                    max_slot = rack.slot
-            # Sum widths of all racks below this maximum slot
-            for rack in row.racks:
-                if rack.slot <= max_slot:
-                    total += rack.type.width
-
-        return total
+        return self._rack_row_layout(row).width
 
     def _rack_row_labels_height(self) -> int:
         """Return height of labels above row of racks if enabled, in mm."""
@@ -157,11 +209,7 @@ class InfrastructureDrawer(Drawer):
     def _rack_row_height(self, row) -> int:
         """Return rack row height, ie. the maximum rack height among the represented
         racks in the row, in mm."""
-        row_max_height = 0
-        for rack in row.racks:
-            if self._rack_must_be_represented(rack):
-                row_max_height = max(row_max_height, rack.type.height)
-        return row_max_height
+        return self._rack_row_layout(row).height
 
     def _rack_width(self, rack) -> Union[float, int]:
         """Return the width of a given rack as a number of pixels. If
@@ -220,6 +268,50 @@ class InfrastructureDrawer(Drawer):
         return width
 
     def _rack_row_dl(self, row) -> ImagePoint:
+        """Return the bottom-left corner of the given rack row computed by
+        _compute_positions()."""
+        dl = self.rows_dl[row]
+        return ImagePoint(dl.x, dl.y)
+
+    def _rack_dl(self, rack) -> ImagePoint:
+        """Return the bottom-left corner of the given rack computed by
+        _compute_positions()."""
+        dl = self.racks_dl[rack.name]
+        return ImagePoint(dl.x, dl.y)
+
+    def _equipment_tl(self, equipment) -> ImagePoint:
+        """Return the top-left corner of the given equipment computed by
+        _compute_positions()."""
+        tl = self.equipments_tl[equipment.name]
+        return ImagePoint(tl.x, tl.y)
+
+    def _reset_layout(self):
+        """Reset the layout of the drawing, as drawing parameters may have been
+        modified since the previous draw."""
+        self.represented_racks = {}
+        self.rows_layouts = {}
+
+    def _compute_positions(self):
+        """Compute the positions in pixels of the rows, racks and equipment to
+        draw. This must be called once the drawing ratio is known."""
+        self.rows_dl = {}
+        self.rows_x_offsets = {}
+        self.racks_dl = {}
+        self.equipments_tl = {}
+        for row in self.rack_rows:
+            self.rows_dl[row] = self._compute_rack_row_dl(row)
+        for rack in self.racks:
+            self.racks_dl[rack.name] = self._compute_rack_dl(rack)
+        for rack in self.racks:
+            for part in self.racks_parts.get(rack.name, []):
+                for equipment in chain(
+                    part.nodes, part.storage, part.network, part.misc
+                ):
+                    self.equipments_tl[equipment.name] = self._compute_equipment_tl(
+                        equipment
+                    )
+
+    def _compute_rack_row_dl(self, row) -> ImagePoint:
         # first add top margin and vertical spacing above first row
         pos_y = self.parameters.margin.top
         pos_y += self._vertical_spacing_above_first_row()
@@ -232,27 +324,20 @@ class InfrastructureDrawer(Drawer):
         pos_y += int(row.height * self.ratio)
         return ImagePoint(self.parameters.margin.left, pos_y)
 
-    def _rack_dl(self, rack) -> ImagePoint:
+    def _compute_rack_dl(self, rack) -> ImagePoint:
         dl = self._rack_row_dl(rack.row)
 
-        # Sum the width of all racks in row before the current rack
-        if rack.row.reversed:
-            for row_rack in rack.row.racks:
-                if row_rack.slot > rack.slot:
-                    dl.x += (
-                        int(row_rack.type.width * self.ratio)
-                        + self.parameters.rack.spacing
-                    )
-        else:
-            for row_rack in rack.row.racks:
-                if row_rack.slot < rack.slot:
-                    dl.x += (
-                        int(row_rack.type.width * self.ratio)
-                        + self.parameters.rack.spacing
-                    )
+        # Sum the width of all racks in row before the current rack, computed once for
+        # all racks in row.
+        if rack.row not in self.rows_x_offsets:
+            self.rows_x_offsets[rack.row] = self._rack_row_layout(rack.row).before(
+                lambda row_rack: int(row_rack.type.width * self.ratio)
+                + self.parameters.rack.spacing
+            )
+        dl.x += self.rows_x_offsets[rack.row][rack.name]
         return dl
 
-    def _equipment_tl(self, equipment) -> ImagePoint:
+    def _compute_equipment_tl(self, equipment) -> ImagePoint:
         tl = self._rack_dl(equipment.rack)
 
         logger.debug(
@@ -491,12 +576,9 @@ class InfrastructureDrawer(Drawer):
             return
 
         # draw equipments in rack
-        for part in self.infrastructure.layout:
-            if part.rack.name == rack.name:
-                for equipment in chain(
-                    part.nodes, part.storage, part.network, part.misc
-                ):
-                    self._draw_rack_equipment(equipment)
+        for part in self.racks_parts.get(rack.name, []):
+            for equipment in chain(part.nodes, part.storage, part.network, part.misc):
+                self._draw_rack_equipment(equipment)
 
     def _draw_rack_row(self, row):
         logger.debug("Drawing row %s", row.name)
@@ -532,6 +614,8 @@ class InfrastructureDrawer(Drawer):
             self.parameters.dimensions.height,
         )
 
+        self._reset_layout()
+
         # Get list of racks and rows used by the infrastructure
         for part in self.infrastructure.layout:
             # If discard_empty_racks is True, skip parts without equipment selected for
@@ -608,6 +692,7 @@ class InfrastructureDrawer(Drawer):
         logger.debug("Final width: %d", surface_width)
         logger.debug("Final height: %d", surface_height)
 
+        self._compute_positions()
         self.init_ctx(surface_width, surface_height)
         self._draw_infrastructure()
         self.write()
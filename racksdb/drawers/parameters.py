@@ -21,11 +21,10 @@ class DrawingParameters(GenericDB):
         self._loader = loader
 
     @classmethod
-    def load(
-        cls,
-        db_loader,
-        schema: Union[str, Path, None] = None,
-    ):
+    def load_schema(cls, schema: Union[str, Path, None] = None) -> Schema:
+        """Return the drawing parameters Schema loaded from the given path, or from
+        the default path if not defined. The Schema can be kept to load multiple
+        drawing parameters without parsing the schema file again."""
         # Unfortunately, default values to arguments cannot be used as they are
         # class attributes and the class is not defined yet at this stage at
         # compilation time. As an alternative, the value None is checked at
@@ -36,10 +35,23 @@ class DrawingParameters(GenericDB):
         elif isinstance(schema, str):
             schema = Path(schema)
 
-        _schema = Schema(
+        return Schema(
             SchemaFileLoader(schema),
             SchemaDefinedTypeLoader(cls.DEFINED_TYPES_MODULE),
         )
+
+    @classmethod
+    def load(
+        cls,
+        db_loader,
+        schema: Union[str, Path, Schema, None] = None,
+    ):
+        # The schema is loaded from file unless an already loaded Schema is
+        # provided.
+        if isinstance(schema, Schema):
+            _schema = schema
+        else:
+            _schema = cls.load_schema(schema)
         _db = cls(_schema, db_loader)
         super(cls, _db).load(_db._loader)
         return _db
@@ -56,6 +56,9 @@ class RoomDrawer(Drawer):
             raise RacksDBDrawingError(f"Unable to find room {name} in database")
         # Calculated at draw time based on dimensions
         self.ratio = 0
+        # Horizontal offsets in pixels of slots in rack rows, computed once per row
+        # at draw time by _racks_row_offsets().
+        self.rows_offsets = {}
 
     def _racks_row_tl(self, row):
         return ImagePoint(
@@ -63,30 +66,52 @@ class RoomDrawer(Drawer):
             self.parameters.margin.top + int(row.position.depth * self.ratio),
         )
 
+    def _racks_row_offsets(self, row):
+        """Return the list of horizontal offsets in pixels of all slots in the given
+        rack row, relative to the top-left corner of the row. The offsets are
+        computed once per row in a single pass over the slots, by summing the width of
+        all racks in the previous slots. Empty slots are filled with the width of the
+        rack in the closest previous slot, except the first slot, or with the width of
+        the first rack type in database."""
+        try:
+            return self.rows_offsets[row]
+        except KeyError:
+            pass
+        # Width of racks in every slot and last rack of every slot
+        slots_widths = {}
+        slots_racks = {}
+        for rack in row.racks:
+            slots_widths[rack.slot] = slots_widths.get(rack.slot, 0) + int(
+                rack.type.width * self.ratio
+            )
+            slots_racks[rack.slot] = rack
+        offsets = []
+        offset = 0
+        last_rack_width = 0
+        default_rack_width = None
+        for slot in range(max(slots_racks, default=-1) + 1):
+            offsets.append(offset)
+            if slot in slots_racks:
+                offset += slots_widths[slot]
+                if slot > 0:
+                    last_rack_width = slots_racks[slot].type.width
+                continue
+            # filling empty slot with previous rack width
+            logger.debug("Row %s slot %d is not filled", row.name, slot)
+            if last_rack_width:
+                offset += int(last_rack_width * self.ratio)
+            else:
+                if default_rack_width is None:
+                    default_rack_width = self.db.types.racks.first().width
+                offset += int(default_rack_width * self.ratio)
+        self.rows_offsets[row] = offsets
+        return offsets
+
     def _rack_tl(self, rack):
         # Start from top-left corner of the rack row, which is (0,0) after
-        # context matrix translation.
-        tl = ImagePoint(0, 0)
-        # Sum the width of all racks in row before the current rack
-        filled_slots = {}
-        for row_rack in rack.row.racks:
-            if row_rack.slot < rack.slot:
-                tl.x += int(row_rack.type.width * self.ratio)
-                filled_slots[row_rack.slot] = row_rack
-        # filling empty slots with previous rack width
-        for slot in range(rack.slot):
-            if slot not in filled_slots:
-                logger.debug("Row %s slot %d is not filled", rack.row.name, slot)
-                last_rack_width = 0
-                reversed_slot = slot
-                for reversed_slot in range(slot, 0, -1):
-                    if reversed_slot in filled_slots:
-                        last_rack_width = filled_slots[reversed_slot].type.width
-                        break
-                if not (last_rack_width):
-                    last_rack_width = self.db.types.racks.first().width
-                tl.x += int(last_rack_width * self.ratio)
-        return tl
+        # context matrix translation, shifted by the width of all racks in row before
+        # the current rack.
+        return ImagePoint(self._racks_row_offsets(rack.row)[rack.slot], 0)
 
     def _draw_rack(self, rack):
         tl = self._rack_tl(rack)
@@ -187,6 +212,7 @@ class RoomDrawer(Drawer):
         )
 
         logger.debug("Final ratio is: %f", self.ratio)
+        self.rows_offsets = {}
 
         # Compute final surface width and height
         surface_width = int(self.ratio * self.room.dimensions.width + width_whitespace)
@@ -15,11 +15,17 @@ class RacksDBEnv:
     SCHEMA = "RACKSDB_SCHEMA"
     EXTENSIONS = "RACKSDB_EXTENSIONS"
     DB = "RACKSDB_DB"
+    CACHE = "RACKSDB_CACHE"
 
 
-def env_or_default(env_key: str, fallback: t.Union[str, Path]) -> Path:
-    """Path from ``os.environ[env_key]`` if set and non-empty, else *fallback*."""
+def env_or_default(
+    env_key: str, fallback: t.Union[str, Path, None]
+) -> t.Optional[Path]:
+    """Path from ``os.environ[env_key]`` if set and non-empty, else *fallback*, or
+    None if *fallback* is None."""
     val = os.environ.get(env_key)
     if val:
         return Path(val)
+    if fallback is None:
+        return None
     return Path(fallback)
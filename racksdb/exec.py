@@ -7,6 +7,7 @@
 import argparse
 import sys
 import logging
+import time
 from itertools import chain
 import typing as t
 from pathlib import Path
@@ -23,7 +24,7 @@ from .generic.db import (
 from .generic.dumpers import DBDumperFactory, SchemaDumperFactory
 from . import RacksDB
 from .env import RacksDBEnv, env_or_default
-from .drawers import InfrastructureDrawer, AxonometricInfrastructureDrawer, RoomDrawer
+from .drawers.batch import DrawingsBatch, drawer_class
 from .drawers.parameters import DrawingParameters
 from .errors import RacksDBError
 from .views import RacksDBViews
@@ -33,6 +34,8 @@ logger = logging.getLogger(__name__)
 
 class RacksDBExec:
     DEFAULT_FORMAT = "yaml"
+    # Formats written on standard output as they are generated
+    STREAMED_FORMATS = ["json", "ndjson"]
 
     @classmethod
     def run(cls):
@@ -75,6 +78,24 @@ class RacksDBExec:
             default=env_or_default(RacksDBEnv.DB, RacksDB.DEFAULT_DB),
             type=Path,
         )
+        parser.add_argument(
+            "--cache",
+            help=(
+                "Directory of database snapshots to speed up loading when files are "
+                "unmodified (default: %(default)s)"
+            ),
+            default=env_or_default(RacksDBEnv.CACHE, None),
+            type=Path,
+        )
+        parser.add_argument(
+            "--workers",
+            help=(
+                "Number of parallel processes to parse database files "
+                "(default: %(default)s)"
+            ),
+            default=1,
+            type=int,
+        )
 
         # Unfortunately, Python 3.6 does support add_subparsers() required
         # attribute. The requirement is later handled with hasattr() check on
@@ -127,6 +148,11 @@ class RacksDBExec:
                     kwargs["default"] = parameter.default
                     if parameter.default_in_help:
                         kwargs["help"] += " (default: %(default)s)"
+                elif parser.get_default(parameter.name) is not None:
+                    # The parameter shares its value with the global option of the
+                    # same name, the value of the global option is kept when the
+                    # parameter is omitted.
+                    kwargs["default"] = argparse.SUPPRESS
                 if parameter.const is not None:
                     kwargs["const"] = parameter.const
                 if parameter.required:
@@ -141,7 +167,13 @@ class RacksDBExec:
         self._setup_logger()
 
         try:
-            self.db = RacksDB.load(self.args.schema, self.args.ext, self.args.db)
+            self.db = RacksDB.load(
+                self.args.schema,
+                self.args.ext,
+                self.args.db,
+                self.args.cache,
+                self.args.workers,
+            )
         except DBSchemaError as err:
             logger.error("Error while loading schema: %s", err)
             sys.exit(1)
@@ -222,40 +254,64 @@ class RacksDBExec:
     def _dump_view(self):
         data = getattr(self.db, self.args.action)
         view = self.views[self.args.action]
-        # Filter data with optional filters specified in arguments
-        data = data.filter(
-            **{
-                _filter.name: getattr(self.args, _filter.name)
-                for _filter in view.filters
-            }
-        )
-
-        # Select only the item names
-        if self.args.list:
-            # When list option is select and no output format is specified, select the
-            # console dumper by default.
-            if self.args.format is None:
-                self.args.format = "console"
-            data = [item.name for item in data]
 
+        # When list option is select and no output format is specified, select the
+        # console dumper by default.
+        if self.args.list and self.args.format is None:
+            self.args.format = "console"
         # If the output format is not defined at this stage, fallback to default.
         if self.args.format is None:
             self.args.format = self.DEFAULT_FORMAT
+        streamed = self.args.format in self.STREAMED_FORMATS
+
+        # Filter data with optional filters specified in arguments. With streamed
+        # formats, values are filtered lazily while the output is generated, without
+        # building a filtered copy of the data.
+        filters = {
+            _filter.name: getattr(self.args, _filter.name) for _filter in view.filters
+        }
+        if streamed:
+            data = data.iter_filter(**filters)
+        else:
+            data = data.filter(**filters)
 
+        # Select only the item names
+        if self.args.list:
+            names = (item.name for item in data)
+            data = names if streamed else list(names)
+
+        dumper = DBDumperFactory.get(self.args.format)(
+            show_types=self.args.with_objects_types,
+            objects_map=view.objects_map,
+            fold=self.args.fold,
+        )
         with AutoPager():
             try:
-                print(
-                    DBDumperFactory.get(self.args.format)(
-                        show_types=self.args.with_objects_types,
-                        objects_map=view.objects_map,
-                        fold=self.args.fold,
-                    ).dump(data)
-                )
+                if streamed:
+                    # Write JSON representation on stdout as it is generated, without
+                    # serializing the whole result in memory.
+                    for chunk in dumper.stream(data):
+                        sys.stdout.write(chunk)
+                    # NDJSON lines are already terminated by newlines.
+                    if self.args.format == "json":
+                        sys.stdout.write("\n")
+                else:
+                    print(dumper.dump(data))
             except BrokenPipeError:
                 pass
 
     def _run_draw(self):
-        file = f"{self.args.name}.{self.args.format}"
+        if self.args.all:
+            self._run_draw_batch()
+            return
+        if self.args.entity is None or self.args.name is None:
+            logger.critical("Entity type and --name are required unless --all is set")
+            sys.exit(1)
+        if len(self.args.format) > 1:
+            logger.critical("Multiple formats are supported only with --all")
+            sys.exit(1)
+        image_format = self.args.format[0]
+        file = f"{self.args.name}.{image_format}"
 
         # Handle coordinates opts
         if self.args.coordinates is False:
@@ -267,6 +323,62 @@ class RacksDBExec:
         coordinates_fh = (
             open(coordinates_file, "w+") if coordinates_file is not None else None
         )
+        parameters = self._load_drawing_parameters()
+        drawer = drawer_class(self.args.entity, parameters)(
+            self.db,
+            self.args.name,
+            file,
+            image_format,
+            parameters,
+            coordinates_fh,
+            self.args.coordinates_format,
+        )
+        drawer.draw()
+        logger.info("Generated image file %s", file)
+        if self.args.coordinates:
+            logger.info("Generated coordinates file %s", coordinates_file)
+            coordinates_fh.close()
+
+    def _run_draw_batch(self):
+        """Draw all entities of the selected type in all selected formats and print
+        the summary of timings."""
+        parameters = self._load_drawing_parameters()
+        batch = DrawingsBatch(
+            self.db,
+            parameters,
+            self.args.output,
+            entities=[self.args.entity] if self.args.entity is not None else None,
+            formats=self.args.format,
+            coordinates_format=(
+                self.args.coordinates_format
+                if self.args.coordinates is not False
+                else None
+            ),
+        )
+        start = time.perf_counter()
+        drawings = batch.render(self.args.workers)
+        duration = time.perf_counter() - start
+        failed = 0
+        for drawing in drawings:
+            if drawing.error is None:
+                status = "ok"
+            else:
+                status = "failed"
+                failed += 1
+            print(
+                f"{drawing.entity} {drawing.name} {drawing.format}: "
+                f"{drawing.duration:.3f}s ({status})"
+            )
+        print(
+            f"Generated {len(drawings) - failed}/{len(drawings)} images in "
+            f"{self.args.output} in {duration:.3f}s"
+        )
+        if failed:
+            sys.exit(1)
+
+    def _load_drawing_parameters(self):
+        """Load drawing parameters provided in arguments, exit with error if
+        failed."""
         try:
             if self.args.parameters is None:
                 db_loader = DBDictsLoader()
@@ -275,39 +387,10 @@ class RacksDBExec:
                     db_loader = DBStdinLoader()
                 else:
                     db_loader = DBSplittedFilesLoader(Path(self.args.parameters))
-            parameters = DrawingParameters.load(db_loader, self.args.drawings_schema)
+            return DrawingParameters.load(db_loader, self.args.drawings_schema)
         except DBSchemaError as err:
             logger.critical("Unable to load drawing parameters schema: %s", str(err))
             sys.exit(1)
         except DBFormatError as err:
             logger.critical("Unable to load drawing parameters: %s", str(err))
             sys.exit(1)
-        if self.args.entity == "infrastructure":
-            if parameters.axonometric.enabled:
-                draw_infra_class = AxonometricInfrastructureDrawer
-            else:
-                draw_infra_class = InfrastructureDrawer
-            drawer = draw_infra_class(
-                self.db,
-                self.args.name,
-                file,
-                self.args.format,
-                parameters,
-                coordinates_fh,
-                self.args.coordinates_format,
-            )
-        elif self.args.entity == "room":
-            drawer = RoomDrawer(
-                self.db,
-                self.args.name,
-                file,
-                self.args.format,
-                parameters,
-                coordinates_fh,
-                self.args.coordinates_format,
-            )
-        drawer.draw()
-        logger.info("Generated image file %s", file)
-        if self.args.coordinates:
-            logger.info("Generated coordinates file %s", coordinates_file)
-            coordinates_fh.close()
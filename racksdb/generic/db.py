@@ -5,13 +5,30 @@
 # SPDX-License-Identifier: MIT
 
 import sys
+import re
 import copy
+import bisect
+import functools
 import logging
+import concurrent.futures
+
+try:
+    from functools import cached_property
+except ImportError:
+    # For Python 3.[6-7] compatibility. The dependency to cached_property
+    # external library is not declared in pyproject.toml, it is added
+    # explicitely in packages codes only for distributions stuck with these old
+    # versions of Python.
+    #
+    # This try/except block can be removed when support of Python < 3.8 is
+    # dropped in RacksDB.
+    from cached_property import cached_property
 
 import yaml
 from ClusterShell.NodeSet import NodeSet
 
 from .errors import DBFormatError
+from . import yamlbackend
 from .definedtype import SchemaDefinedType
 from .schema import (
     SchemaGenericValueType,
@@ -41,7 +58,26 @@ def deepmerge(a: dict, b: dict, path=[]) -> dict:
     return a
 
 
+@functools.lru_cache(maxsize=None)
+def _cached_properties(_class) -> frozenset:
+    """Return the names of instance dict entries holding the values of cached
+    properties of the given class and its bases."""
+    names = set()
+    for base in _class.__mro__:
+        for name, attribute in vars(base).items():
+            if isinstance(attribute, cached_property):
+                names.add(name)
+            if isinstance(attribute, expanded_cached_property):
+                names.add(expanded_cached_property.CACHE)
+    return frozenset(names)
+
+
 class DBObject:
+    # Empty slots to keep DBExpandedObject subclasses without instance dict. The
+    # classes of other objects are defined without slots, their instances have a
+    # dict to store their attributes.
+    __slots__ = ()
+
     LOADED_PREFIX = "__loaded_"
 
     def __init__(self, db, schema):
@@ -75,84 +111,253 @@ class DBExpandableObject(DBObject):
                 stable_attributes[attribute] = value
         return stable_attributes, range_attribute, rangeid_attributes
 
-    def _instanciate_obj(
-        self, index, value, range_attribute, rangeid_attributes, stable_attributes
-    ):
-        """Instanciate the object at the given index."""
+    def _range_attribute(self):
+        """Return the pair of range attribute name and value."""
+        return self._attributes()[1]
 
-        _attributes = stable_attributes.copy()
-        _attributes[range_attribute[0]] = value
-        for rangeid_name, rangeid_value in rangeid_attributes.items():
-            _attributes[rangeid_name] = rangeid_value.index(index)
+    def _count(self):
+        """Return the number of expanded objects, without instanciating them."""
+        return len(self._range_attribute()[1].rangeset)
 
-        bases = [DBObject]
-        # Add provided module base if defined
-        try:
-            # Insert bases module class in the beginning of the list to make
-            # sure methods from this classes are called over the methods from
-            # DBObject.
-            bases.insert(
-                0,
-                getattr(
-                    self._db._bases,
-                    f"{self._db._prefix}{self._schema.name}Base",
-                ),
-            )
-        except AttributeError:
-            pass
-        obj = type(f"{self._db._prefix}{self._schema.name}", tuple(bases), dict())(
-            self._db, self._schema
-        )
-        for attr_name, attr_value in _attributes.items():
-            setattr(obj, attr_name, attr_value)
-            # Set object _key attribute if property is a key
-            prop = self._schema.prop(attr_name)
-            if prop is not None and prop.key:
-                setattr(obj, "_key", attr_value)
-        return obj
+    def member(self, index):
+        """Return the expanded object at the given index in the range."""
+        return self._db.expanded_class(self._schema.name)(self, index)
+
+    def iterobjects(self):
+        """Iterate over all expanded objects, instanciated one by one."""
+        for index in range(self._count()):
+            yield self.member(index)
 
     def objects(self):
         """Return the list of all expanded objects."""
-        result = []
-        stable_attributes, range_attribute, rangeid_attributes = self._attributes()
-        first = None
-        for index, value in enumerate(range_attribute[1].expanded()):
-            obj = self._instanciate_obj(
-                index, value, range_attribute, rangeid_attributes, stable_attributes
+        return list(self.iterobjects())
+
+    def getobject(self, key, index=None):
+        """Return an instance of the object with provided key. When the index of the
+        key in the range is known by the caller, it can be provided to avoid its
+        computation."""
+        if index is None:
+            range_attribute = self._range_attribute()
+            try:
+                index = range_attribute[1].index(key)
+            except KeyError:
+                raise KeyError(f"key '{key}' not found in {str(range_attribute[1])}")
+        return self.member(index)
+
+
+class DBExpandedObject(DBObject):
+    """Lightweight member of a DBExpandableObject at a given index of its range. It
+    only references the expandable object and the index in slots, without instance
+    dict. The attributes are delegated to the expandable object, the values of range
+    and rangeid attributes are computed for the index on access.
+
+    The classes from bases module must declare empty slots to keep the classes of
+    expanded objects without instance dict, a warning is emitted when the class of
+    expanded objects is defined otherwise. As a consequence, cached_property cannot
+    be used in these classes, expanded_cached_property must be used instead."""
+
+    __slots__ = ("_expandable", "_index")
+
+    def __init__(self, expandable, index):
+        self._expandable = expandable
+        self._index = index
+
+    def __getattr__(self, name):
+        # This method is called only when the attribute is not found with the
+        # regular lookup in the object and its classes.
+        if name in ("_expandable", "_index"):
+            raise AttributeError(name)
+        if name == "_first":
+            if self._index == 0:
+                return self
+            return type(self)(self._expandable, 0)
+        try:
+            value = vars(self._expandable)[name]
+        except KeyError:
+            raise AttributeError(
+                f"'{type(self).__name__}' object has no attribute '{name}'"
             )
-            if first is None:
-                first = obj
-            setattr(obj, "_first", first)
-            result.append(obj)
-        return result
+        if isinstance(value, DBObjectRange):
+            return value.member(self._index)
+        if isinstance(value, DBObjectRangeId):
+            return value.index(self._index)
+        return value
+
+
+class expanded_cached_property(cached_property):
+    """Cached property which can also be defined in bases module classes of
+    expandable objects. As DBExpandedObjects have no instance dict, the values of
+    the property for the expanded objects are cached by index in a dict of the
+    expandable object. The values for other objects are cached in their instance
+    dict, as with cached_property."""
+
+    # Name of the instance dict entry of expandable objects with the values of
+    # expanded objects.
+    CACHE = "_expanded_cache"
+
+    def __get__(self, instance, owner=None):
+        if not isinstance(instance, DBExpandedObject):
+            return super().__get__(instance, owner)
+        cache = vars(instance._expandable).setdefault(self.CACHE, {})
+        key = (self.func.__name__, instance._index)
+        try:
+            return cache[key]
+        except KeyError:
+            value = cache[key] = self.func(instance)
+            return value
 
-    def getobject(self, key):
-        """Return an instance of the object with provided key. The first object is also
-        instanciated and linked in _first attribute."""
-        stable_attributes, range_attribute, rangeid_attributes = self._attributes()
-        first = None
-        for index, value in enumerate(range_attribute[1].expanded()):
-            if first and value != key:
-                continue
-            obj = self._instanciate_obj(
-                index, value, range_attribute, rangeid_attributes, stable_attributes
-            )
-            if first is None:
-                first = obj
-            setattr(obj, "_first", first)
-            if value == key:
-                return obj
 
-        raise KeyError(f"key '{key}' not found in {str(range_attribute[1])}")
+class DBObjectRangeSlice:
+    """Contiguous slice of members of a DBObjectRange with the same prefix, suffix and
+    padding around a numerical index, between start and end bounds (included). The
+    offset is the index of the first member of the slice in the whole range."""
+
+    def __init__(self, prefix, suffix, start, end, padding, offset):
+        self.prefix = prefix
+        self.suffix = suffix
+        self.start = start
+        self.end = end
+        self.padding = padding
+        self.offset = offset
+
+    def _digits(self, number):
+        return str(number).zfill(self.padding)
+
+    def member(self, index):
+        """Return the member at the given index in the range."""
+        number = self.start + index - self.offset
+        return f"{self.prefix}{self._digits(number)}{self.suffix}"
+
+    def index(self, digits):
+        """Return the index in the range of the member with the given numerical
+        index digits, or None if it is not a member of the slice."""
+        number = int(digits)
+        if number < self.start or number > self.end or digits != self._digits(number):
+            return None
+        return self.offset + number - self.start
 
 
 class DBObjectRange:
+    # Split names in prefix, numerical index and suffix
+    NAME_PATTERN = re.compile(r"^(.*?)(\d+)(\D*)$")
+
     def __init__(self, rangeset):
         self.rangeset = NodeSet(rangeset)
+        # Parts of the range with their offsets, computed lazily
+        self._parts = None
+        self._offsets = None
+        self._literals = None
+        self._expanded = None
 
     def expanded(self):
         return list(self.rangeset)
 
+    def _compile(self):
+        """Compute the parts of the range from its contiguous subsets, in the order of
+        rangeset iteration. The parts are either DBObjectRangeSlice or literal members
+        for subsets of one member. If the range contains subsets that cannot be
+        represented by slices (ex: multidimensional rangesets), the parts are set to
+        an empty list and the literals to None."""
+        parts = []
+        offsets = []
+        literals = {}
+        offset = 0
+        for subset in self.rangeset.contiguous():
+            size = len(subset)
+            first = subset[0]
+            if size == 1:
+                parts.append(first)
+                offsets.append(offset)
+                literals[first] = offset
+                offset += 1
+                continue
+            first_match = self.NAME_PATTERN.match(first)
+            last_match = self.NAME_PATTERN.match(subset[-1])
+            if (
+                first_match is None
+                or last_match is None
+                or first_match.group(1, 3) != last_match.group(1, 3)
+                or int(last_match.group(2)) - int(first_match.group(2)) + 1 != size
+            ):
+                self._parts = []
+                self._offsets = []
+                self._literals = None
+                # Keep the list of expanded members for direct access
+                self._expanded = self.expanded()
+                return
+            digits = first_match.group(2)
+            padding = len(digits) if len(digits) > 1 and digits[0] == "0" else 0
+            parts.append(
+                DBObjectRangeSlice(
+                    first_match.group(1),
+                    first_match.group(3),
+                    int(digits),
+                    int(last_match.group(2)),
+                    padding,
+                    offset,
+                )
+            )
+            offsets.append(offset)
+            offset += size
+        self._parts = parts
+        self._offsets = offsets
+        self._literals = literals
+
+    def slices(self):
+        """Return the list of DBObjectRangeSlice of the range."""
+        if self._parts is None:
+            self._compile()
+        return [part for part in self._parts if isinstance(part, DBObjectRangeSlice)]
+
+    def literals(self):
+        """Return the dict of members of the range outside of slices with their index in
+        the range, or None if the range cannot be represented by slices."""
+        if self._parts is None:
+            self._compile()
+        return self._literals
+
+    def first(self):
+        """Return the first member of the range."""
+        return self.member(0)
+
+    def member(self, index):
+        """Return the member at the given index in the range, without expanding the
+        range when possible."""
+        if self.literals() is None:
+            return self._expanded[index]
+        position = bisect.bisect_right(self._offsets, index) - 1
+        if position >= 0:
+            part = self._parts[position]
+            if isinstance(part, DBObjectRangeSlice):
+                if index <= part.offset + part.end - part.start:
+                    return part.member(index)
+            elif index == self._offsets[position]:
+                return part
+        raise IndexError(f"index {index} out of range {str(self.rangeset)}")
+
+    def index(self, member):
+        """Return the index of the given member in the range, without expanding the
+        range when possible. Raise KeyError if not found."""
+        if self.literals() is None:
+            try:
+                return self._expanded.index(member)
+            except ValueError:
+                raise KeyError(member)
+        if member in self._literals:
+            return self._literals[member]
+        match = self.NAME_PATTERN.match(member)
+        if match is not None:
+            for part in self._parts:
+                if (
+                    isinstance(part, DBObjectRangeSlice)
+                    and part.prefix == match.group(1)
+                    and part.suffix == match.group(3)
+                ):
+                    index = part.index(match.group(2))
+                    if index is not None:
+                        return index
+        raise KeyError(member)
+
     def __repr__(self):
         return str(self.rangeset)
 
@@ -169,14 +374,21 @@ class DBList(list):
     def __iter__(self):
         for item in super().__iter__():
             if isinstance(item, DBExpandableObject):
-                for expanded_item in item.objects():
-                    yield expanded_item
+                yield from item.iterobjects()
             else:
                 yield item
 
     def __len__(self):
-        """Return the number of values in the list."""
-        return len([value for value in self])
+        """Return the number of values in the list. It counts the number of values in
+        expandable objects by counting the number of values in their rangeset without
+        requiring instanciating of objects in memory."""
+        values = 0
+        for item in super().__iter__():
+            if isinstance(item, DBExpandableObject):
+                values += item._count()
+            else:
+                values += 1
+        return values
 
     def itervalues(self):
         """Additional iterators over the list values that does not trigger expansion of
@@ -184,53 +396,120 @@ class DBList(list):
         for item in super().__iter__():
             yield item
 
+    def first(self):
+        """Return the first expanded value of the list."""
+        for item in super().__iter__():
+            if isinstance(item, DBExpandableObject):
+                if not item._count():
+                    continue
+                return item.member(0)
+            return item
+        raise IndexError("list index out of range")
+
+    def iter_filter(self, **kwargs):
+        """Iterate over the values of the current DBList that match provided filter
+        criteria, expanded objects are instanciated one by one."""
+        for item in self:
+            if item._filter(**kwargs):
+                yield item
+
     def filter(self, **kwargs):
         """Return a copy of the current DBList without values that do not match provided
         filter criteria."""
-        result = DBList()
-        for item in self:
-            if item._filter(**kwargs):
-                result.append(item)
-        return result
+        return DBList(self.iter_filter(**kwargs))
+
+    def copy(self):
+        """Return a shallow copy of the current DBList, without triggering expansion
+        of DBExpandableObjects."""
+        return DBList(self.itervalues())
 
 
 class DBDict(dict):
+    # Index of DBObjectRange keys, built lazily on first lookup of an expanded key
+    # and invalidated when the dictionnary is modified.
+    _rangesindex = None
+
+    def _iter_items(self):
+        """Iterate over the pairs of key and value of the dictionnary, expanded objects
+        are instanciated one by one with their key in range."""
+        for key, value in self.items():
+            if isinstance(value, DBExpandableObject):
+                for index in range(value._count()):
+                    yield key.member(index), value.member(index)
+            else:
+                yield key, value
+
+    def iter_filter(self, **kwargs):
+        """Iterate over the values of the current DBDict that match provided filter
+        criteria, expanded objects are instanciated one by one."""
+        for _, value in self._iter_items():
+            if value._filter(**kwargs):
+                yield value
+
     def filter(self, **kwargs):
         """Return a copy of the current DBDict without key and values that do not match
         provided filter criteria."""
         result = DBDict()
-
-        def add_match(key, value):
+        for key, value in self._iter_items():
             if value._filter(**kwargs):
                 result[key] = value
-
-        for key, value in self.items():
-            if isinstance(value, DBExpandableObject):
-                for idx, _expanded_value in enumerate(value.objects()):
-                    add_match(key.rangeset[idx], _expanded_value)
-            else:
-                add_match(key, value)
         return result
 
     def __iter__(self):
         for item in self.values():
             if isinstance(item, DBExpandableObject):
-                for expanded_item in item.objects():
-                    yield expanded_item
+                yield from item.iterobjects()
             else:
                 yield item
 
+    def _ranges(self):
+        """Return the index of DBObjectRange keys, build it if not defined yet."""
+        if self._rangesindex is None:
+            self._rangesindex = DBRangesIndex()
+            for key in self.keys():
+                if isinstance(key, DBObjectRange):
+                    self._rangesindex.add(key, key)
+        return self._rangesindex
+
     def __getitem__(self, key):
         # Try to get the item from parent dict. If the key cannot be found in dict,
-        # search for the key in all DBObjectRange keys. If found, return an instance
-        # of this particular expanded object.
+        # search for the key in the index of DBObjectRange keys. If found, return an
+        # instance of this particular expanded object.
         try:
             return super().__getitem__(key)
         except KeyError:
-            for _key in self.keys():
-                if isinstance(_key, DBObjectRange) and key in _key.rangeset:
-                    return super().__getitem__(_key).getobject(key)
-            raise KeyError(key)
+            if not isinstance(key, str):
+                raise KeyError(key)
+            _key, index = self._ranges().find(key)
+            return super().__getitem__(_key).getobject(key, index)
+
+    def __setitem__(self, key, value):
+        self._rangesindex = None
+        super().__setitem__(key, value)
+
+    def __delitem__(self, key):
+        self._rangesindex = None
+        super().__delitem__(key)
+
+    def clear(self):
+        self._rangesindex = None
+        super().clear()
+
+    def pop(self, *args):
+        self._rangesindex = None
+        return super().pop(*args)
+
+    def popitem(self):
+        self._rangesindex = None
+        return super().popitem()
+
+    def setdefault(self, *args):
+        self._rangesindex = None
+        return super().setdefault(*args)
+
+    def update(self, *args, **kwargs):
+        self._rangesindex = None
+        super().update(*args, **kwargs)
 
     def __len__(self):
         """Return the number of values in the dictionnary. It counts the number of
@@ -244,9 +523,232 @@ class DBDict(dict):
                 values += 1
         return values
 
+    def copy(self):
+        """Return a shallow copy of the current DBDict. The index of DBObjectRange
+        keys is shared with the copy until one of them is modified."""
+        result = DBDict(self.items())
+        result._rangesindex = self._rangesindex
+        return result
+
     def first(self):
         """Return the first expanded object of the dictionnary."""
-        return list(self)[0]  # list() calls __iter__()
+        for item in self.values():
+            if isinstance(item, DBExpandableObject):
+                if not item._count():
+                    continue
+                return item.member(0)
+            return item
+        raise IndexError("list index out of range")
+
+
+class DBRangesIndex:
+    """Index of DBObjectRange with their owners, to find the range containing a given
+    member and its index in this range in logarithmic time, without expanding the
+    ranges. The slices of the ranges are grouped by prefix, suffix and padding, and
+    sorted by their numerical bounds. Ranges that cannot be represented by slices are
+    searched sequentially."""
+
+    def __init__(self):
+        # (prefix, suffix) -> padding -> [sorted starts, entries]
+        self.groups = {}
+        # member -> (owner, index)
+        self.literals = {}
+        # list of (range, owner) that cannot be represented by slices
+        self.others = []
+        self.sorted = True
+
+    def add(self, _range, owner):
+        """Add the given DBObjectRange with its owner in index."""
+        literals = _range.literals()
+        if literals is None:
+            self.others.append((_range, owner))
+            return
+        for member, index in literals.items():
+            self.literals.setdefault(member, (owner, index))
+        for _slice in _range.slices():
+            paddings = self.groups.setdefault((_slice.prefix, _slice.suffix), {})
+            starts, entries = paddings.setdefault(_slice.padding, ([], []))
+            starts.append(_slice.start)
+            entries.append((_slice, owner))
+        self.sorted = False
+
+    def _sort(self):
+        for paddings in self.groups.values():
+            for padding, (starts, entries) in paddings.items():
+                entries.sort(key=lambda entry: entry[0].start)
+                paddings[padding] = ([entry[0].start for entry in entries], entries)
+        self.sorted = True
+
+    def find(self, member):
+        """Return the tuple of owner and index in range of the given member. Raise
+        KeyError if the member is not found in index."""
+        if member in self.literals:
+            return self.literals[member]
+        match = DBObjectRange.NAME_PATTERN.match(member)
+        if match is not None:
+            if not self.sorted:
+                self._sort()
+            prefix, digits, suffix = match.groups()
+            for padding, (starts, entries) in self.groups.get(
+                (prefix, suffix), {}
+            ).items():
+                # Without leading zero, the member can only be in unpadded slices or
+                # in slices padded to its width or less. With a leading zero, it can
+                # only be in slices padded to its exact width.
+                if digits[0] == "0" and len(digits) > 1:
+                    if padding != len(digits):
+                        continue
+                elif padding > len(digits):
+                    continue
+                position = bisect.bisect_right(starts, int(digits)) - 1
+                if position < 0:
+                    continue
+                _slice, owner = entries[position]
+                index = _slice.index(digits)
+                if index is not None:
+                    return owner, index
+        for _range, owner in self.others:
+            if member in _range.rangeset:
+                return owner, _range.index(member)
+        raise KeyError(member)
+
+
+class DBKeysIndex:
+    """Index of key values of all loaded objects of a given type. Regular key values
+    are stored in a dict for constant time lookups. The rangesets of expandable key
+    values are also merged in a NodeSet to detect overlapping ranges, and indexed
+    lazily in a DBRangesIndex to find the members of expandable objects."""
+
+    def __init__(self):
+        self.values = {}
+        self.ranges = NodeSet()
+        self._rangesindex = None
+
+    def conflict(self, value):
+        """Return the part of the given key value already present in index, or None
+        if the key value is unique."""
+        if isinstance(value, DBObjectRange):
+            overlap = self.ranges.intersection(value.rangeset)
+            if len(overlap):
+                return overlap
+            return None
+        if value in self.values:
+            return value
+        return None
+
+    def add(self, value, obj):
+        """Add key value of the given object in index."""
+        if isinstance(value, DBObjectRange):
+            self.ranges.update(value.rangeset)
+            self._rangesindex = None
+        self.values[value] = obj
+
+    def remove(self, value):
+        """Remove key value from index."""
+        del self.values[value]
+        if isinstance(value, DBObjectRange):
+            self.ranges.difference_update(value.rangeset)
+            self._rangesindex = None
+
+    def copy(self):
+        """Return a copy of the index."""
+        result = DBKeysIndex()
+        result.values = self.values.copy()
+        result.ranges = self.ranges.copy()
+        return result
+
+    def _members(self):
+        """Return the index of expandable key values, build it if not defined
+        yet."""
+        if self._rangesindex is None:
+            self._rangesindex = DBRangesIndex()
+            for value, obj in self.values.items():
+                if isinstance(value, DBObjectRange):
+                    self._rangesindex.add(value, obj)
+        return self._rangesindex
+
+    def get(self, value):
+        """Return the object with the given key value. When the value is a member of
+        an expandable key value, return the expanded object of this member. Raise
+        KeyError if not found."""
+        try:
+            return self.values[value]
+        except KeyError:
+            if not isinstance(value, str):
+                raise KeyError(value)
+            obj, index = self._members().find(value)
+            return obj.getobject(value, index)
+
+
+class DBReferencesIndex:
+    """Lookup table of objects of a given type by the value of one of their property,
+    used to resolve references. It is populated lazily with the objects loaded since
+    its last update. For expandable objects, references are resolved by membership
+    in the range of the property values, without enumerating the members: range
+    values are indexed in a DBRangesIndex and the index of the member for rangeid
+    values is computed from the start of the range."""
+
+    def __init__(self, prop):
+        self.prop = prop
+        self.values = {}
+        self.ranges = DBRangesIndex()
+        # sorted starts and entries of (start, number of members, object) for rangeid
+        # values of expandable objects
+        self.rangeids_starts = []
+        self.rangeids = []
+        self.indexed = 0  # number of objects already indexed
+
+    def update(self, objects):
+        """Index the objects of the list that have been loaded since last update."""
+        for obj in objects[self.indexed :]:
+            self._add(obj)
+        self.indexed = len(objects)
+
+    def _add(self, obj):
+        try:
+            value = getattr(obj, self.prop)
+        except AttributeError:
+            return
+        if not isinstance(obj, DBExpandableObject):
+            self.values.setdefault(value, (obj, None))
+        elif isinstance(value, DBObjectRange):
+            self.ranges.add(value, obj)
+        elif isinstance(value, DBObjectRangeId):
+            count = obj._count()
+            if not count:
+                return
+            position = bisect.bisect_right(self.rangeids_starts, value.start)
+            self.rangeids_starts.insert(position, value.start)
+            self.rangeids.insert(position, (value.start, count, obj))
+        else:
+            # The value is the same for all members of the range, the first member is
+            # enough.
+            self.values.setdefault(value, (obj, 0))
+
+    def _find_rangeid(self, value):
+        """Return the tuple of object and index of the member in range of the
+        expandable object with the given rangeid value. Raise KeyError if not
+        found."""
+        position = bisect.bisect_right(self.rangeids_starts, value) - 1
+        # Walk backward in case of overlapping ranges.
+        while position >= 0:
+            start, count, obj = self.rangeids[position]
+            if value < start + count:
+                return obj, value - start
+            position -= 1
+        raise KeyError(value)
+
+    def get(self, value):
+        """Return the tuple of object and index of the member in range of the object
+        with the given property value. Index is None for objects that are not
+        expandable. Raise KeyError if not found."""
+        if value in self.values:
+            return self.values[value]
+        if isinstance(value, str):
+            return self.ranges.find(value)
+        if isinstance(value, int) and not isinstance(value, bool):
+            return self._find_rangeid(value)
+        raise KeyError(value)
 
 
 class DBLoader:
@@ -261,14 +763,98 @@ class DBFileLoader(DBLoader):
         self.path = path
         with open(path) as fh:
             try:
-                self.content = yaml.safe_load(fh)
-            except yaml.composer.ComposerError as err:
+                self.content = yamlbackend.load(fh)
+            except yaml.YAMLError as err:
                 raise DBFormatError(err)
 
 
+def _load_db_file(path):
+    """Return the content of the given DB file. Errors are converted to DBFormatError
+    with string message to be sent back safely from parallel loading workers."""
+    logger.debug("Loading DB file %s", path)
+    try:
+        return DBFileLoader(path).content
+    except DBFormatError as err:
+        raise DBFormatError(str(err)) from None
+
+
+class DBSplittedFileRef:
+    """Reference to a file in the list of files of a DBSplittedFilesLoader, replaced
+    by the file content when files are parsed."""
+
+    def __init__(self, index):
+        self.index = index
+
+
 class DBSplittedFilesLoader(DBLoader):
-    def __init__(self, path):
+    """Load YAML database split in a tree of files and directories. When workers is
+    greater than 1, the files are parsed concurrently by a pool of processes. The
+    files are walked in sorted order and the content is assembled in the same
+    structure and order in both cases, independently of the order of entries
+    returned by the filesystem.
+
+    When a previous loader of the same DB tree is provided, the content of the files
+    with the same modification times and sizes is reused, only the other files are
+    parsed."""
+
+    def __init__(self, path, workers=1, previous=None):
         self.path = path
+        # List of files, in the order of walk in DB tree.
+        self.files = []
+        tree = self._walk(path)
+        # Modification times and sizes of files, retrieved before parsing so that
+        # files modified during parsing are detected on subsequent loads.
+        self.stats = [self._stat(file) for file in self.files]
+        self.contents = [None] * len(self.files)
+        # Indexes of files to parse
+        parsed = list(range(len(self.files)))
+        if isinstance(previous, DBSplittedFilesLoader):
+            parsed = self._reuse(previous)
+            logger.debug(
+                "Reusing content of %d unmodified DB files, parsing %d files",
+                len(self.files) - len(parsed),
+                len(parsed),
+            )
+        files = [self.files[index] for index in parsed]
+        if workers > 1 and len(files) > 1:
+            contents = self._parse_parallel(files, workers)
+        else:
+            contents = [_load_db_file(file) for file in files]
+        for index, content in zip(parsed, contents):
+            self.contents[index] = content
+        self.content = self._assemble(tree, self.contents)
+
+    @staticmethod
+    def _stat(path):
+        """Return the modification time and size of the given file."""
+        stat = path.stat()
+        return (stat.st_mtime_ns, stat.st_size)
+
+    def _reuse(self, previous):
+        """Reuse content of files unmodified since previous loader. Return the list of
+        indexes of files that must be parsed."""
+        previous_files = {
+            file: (stat, content)
+            for file, stat, content in zip(
+                previous.files, previous.stats, previous.contents
+            )
+        }
+        result = []
+        for index, (file, stat) in enumerate(zip(self.files, self.stats)):
+            try:
+                previous_stat, content = previous_files[file]
+            except KeyError:
+                # new file
+                result.append(index)
+                continue
+            if previous_stat != stat:
+                result.append(index)
+                continue
+            self.contents[index] = content
+        return result
+
+    def _walk(self, path):
+        """Check the DB tree and return its structure with references to its files."""
         # try the parent folder
         if not path.exists():
             raise DBFormatError(f"DB path {path} does not exist")
@@ -281,18 +867,32 @@ class DBSplittedFilesLoader(DBLoader):
                     f"DB contains file {path} without valid extensions: "
                     f"{', '.join(valid_extensions)}"
                 )
-            logger.debug("Loading DB file %s", path)
-            self.content = DBFileLoader(path).content
+            self.files.append(path)
+            return DBSplittedFileRef(len(self.files) - 1)
         elif path.suffix == ".l":
-            self.content = []
-            for item in path.iterdir():
-                self.content.append(DBSplittedFilesLoader(item).content)
+            return [self._walk(item) for item in sorted(path.iterdir())]
         else:
             # if directory, load recursively
-            self.content = {}
-            for item in path.iterdir():
-                logger.debug("Loading DB directory %s", path)
-                self.content[item.stem] = DBSplittedFilesLoader(item).content
+            logger.debug("Loading DB directory %s", path)
+            return {item.stem: self._walk(item) for item in sorted(path.iterdir())}
+
+    def _parse_parallel(self, files, workers):
+        """Return the list of contents of the given DB files parsed by a pool of
+        processes."""
+        logger.debug("Loading %d DB files with %d workers", len(files), workers)
+        # Send files to workers in chunks to reduce the overhead of inter-process
+        # communications with many small files.
+        chunksize = max(1, len(files) // (workers * 4))
+        with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as executor:
+            return list(executor.map(_load_db_file, files, chunksize=chunksize))
+
+    def _assemble(self, tree, contents):
+        """Return the DB tree structure with references replaced by files contents."""
+        if isinstance(tree, DBSplittedFileRef):
+            return contents[tree.index]
+        elif isinstance(tree, list):
+            return [self._assemble(item, contents) for item in tree]
+        return {key: self._assemble(value, contents) for key, value in tree.items()}
 
 
 class DBDictsLoader(DBLoader):
@@ -313,8 +913,8 @@ class DBStdinLoader(DBLoader):
 
     def __init__(self):
         try:
-            self.content = yaml.safe_load(sys.stdin.read())
-        except yaml.composer.ComposerError as err:
+            self.content = yamlbackend.load(sys.stdin.read())
+        except yaml.YAMLError as err:
             raise DBFormatError(err)
 
 
@@ -323,8 +923,8 @@ class DBStringLoader(DBLoader):
 
     def __init__(self, content, initial={}):
         try:
-            self.content = deepmerge(initial, yaml.safe_load(content))
-        except yaml.composer.ComposerError as err:
+            self.content = deepmerge(initial, yamlbackend.load(content))
+        except yaml.YAMLError as err:
             raise DBFormatError(err)
 
 
@@ -335,9 +935,14 @@ class GenericDB(DBObject):
         # Module of base classes for instanciated DB objects
         self._bases = bases
         self._indexes = {}  # objects indexes
+        self._keys = {}  # objects key values indexes
+        self._references = {}  # objects lookup tables for references resolution
+        self._classes = {}  # dynamically defined classes of objects and values
         # Set of SchemaObjects for which objects have been already loaded,
         # including SchemaObjects of optional objects not present in database.
         self._loaded_classes = set()
+        self._root = None  # loaded root object
+        self._content = None  # loaded content
 
     def load(self, loader):
         obj = self.load_object("_root", loader.content, self._schema.content, None)
@@ -347,6 +952,306 @@ class GenericDB(DBObject):
             # SchemaObject.
             if key != "_schema":
                 setattr(self, key, value)
+        self._root = obj
+        self._content = loader.content
+        # Cached properties computed with previously loaded objects are now
+        # obsolete.
+        self.drop_caches()
+
+    def _content_units(self, content):
+        """Split DB content in units that can be loaded independently: the items of
+        top-level lists of objects with a key property, and the other top-level
+        properties as a whole. Return a dict of pairs of SchemaObject (None for values
+        that are not objects) and literal, indexed by tuples of property name and key
+        of list item (only property name for properties as a whole), or None if the
+        content cannot be split."""
+        if not isinstance(content, dict):
+            return None
+        units = {}
+        for token, literal in content.items():
+            token_property = self._schema.content.prop(token)
+            if token_property is None or token.endswith("[]"):
+                return None
+            subtype = token_property.type
+            if isinstance(subtype, SchemaContainerList):
+                subtype = subtype.content
+            if not isinstance(subtype, SchemaObject):
+                units[(token,)] = (None, literal)
+                continue
+            if not (
+                isinstance(token_property.type, SchemaContainerList)
+                and subtype.has_key()
+            ):
+                units[(token,)] = (subtype, literal)
+                continue
+            key_property = subtype.key_property()
+            # Transform dict into list of items augmented with key property, as in
+            # load_list().
+            if isinstance(literal, dict):
+                if not all(isinstance(value, dict) for value in literal.values()):
+                    return None
+                literal = [
+                    {**{key_property: key}, **value} for key, value in literal.items()
+                ]
+            if not isinstance(literal, list):
+                return None
+            for item in literal:
+                if not isinstance(item, dict) or key_property not in item:
+                    return None
+                try:
+                    unit = (token, item[key_property])
+                    if unit in units:
+                        # duplicate key
+                        return None
+                except TypeError:
+                    # unhashable key
+                    return None
+                units[unit] = (subtype, item)
+        return units
+
+    @staticmethod
+    def _root_attribute(root, token):
+        """Return the name of the attribute of the given root object for the given
+        token, considering the attributes renamed with LOADED_PREFIX."""
+        if token in vars(root):
+            return token
+        return root.LOADED_PREFIX + token
+
+    @staticmethod
+    def _top_objects(value):
+        """Return the set of identifiers of objects at the top of the tree of objects
+        of the given top-level value."""
+        if isinstance(value, DBObject):
+            return {id(value)}
+        elif isinstance(value, DBList):
+            return {id(item) for item in value.itervalues()}
+        elif isinstance(value, DBDict):
+            return {id(item) for item in value.values()}
+        return set()
+
+    def load_incremental(self, loader, previous):
+        """Load DB content provided by loader, reusing the objects of the previous
+        GenericDB loaded with the same schema for the unmodified parts of the content.
+        The items of top-level lists of objects with a key property and the other
+        top-level properties are compared with the previous content. Only the modified
+        items, and the items with references to objects of the modified items, are
+        loaded again. The objects of the other items are not loaded again but copied
+        and attached to this GenericDB, the previous GenericDB and its objects are left
+        unchanged.
+
+        When the content cannot be compared with the previous content, it is fully
+        loaded. Return True if the content is loaded incrementally, False otherwise.
+        """
+        units = self._content_units(loader.content)
+        previous_units = None
+        if previous._schema is self._schema and previous._root is not None:
+            previous_units = previous._content_units(previous._content)
+        if (
+            units is None
+            or previous_units is None
+            or list(loader.content) != list(previous._content)
+        ):
+            logger.debug("Unable to load DB content incrementally, full load")
+            self.load(loader)
+            return False
+
+        def schema_objects(schema):
+            if schema is None:
+                return set()
+            return schema.subobjs | {schema}
+
+        # Map units of previous content to their loaded values
+        root = previous._root
+        previous_values = {}
+        for token in previous._content:
+            value = getattr(previous, self._root_attribute(root, token))
+            if (token,) in previous_units:
+                previous_values[(token,)] = value
+                continue
+            keys = [unit for unit in previous_units if unit[0] == token]
+            if not isinstance(value, DBDict) or len(keys) != len(value.values()):
+                self.load(loader)
+                return False
+            previous_values.update(zip(keys, value.values()))
+
+        # Select units that must be loaded again, modified units and units with
+        # references to objects of stale units.
+        modified = {
+            unit
+            for unit, (_, literal) in units.items()
+            if unit not in previous_units or previous_units[unit][1] != literal
+        }
+        stale = modified | (previous_units.keys() - units.keys())
+        stale_objects = set()
+        for unit in stale:
+            stale_objects |= schema_objects(
+                (units.get(unit) or previous_units.get(unit))[0]
+            )
+        while True:
+            dependents = {
+                unit
+                for unit, (schema, _) in units.items()
+                if unit not in modified
+                and schema is not None
+                and schema.refs & stale_objects
+            }
+            if not dependents:
+                break
+            modified |= dependents
+            stale |= dependents
+            for unit in dependents:
+                stale_objects |= schema_objects(units[unit][0])
+
+        # Sort modified units to load referenced objects first.
+        pending = [unit for unit in units if unit in modified]
+        ordered = []
+        while pending:
+            pending_objects = set()
+            for unit in pending:
+                pending_objects |= schema_objects(units[unit][0])
+            loadable = [
+                unit
+                for unit in pending
+                if units[unit][0] is None
+                or not (
+                    (units[unit][0].refs - schema_objects(units[unit][0]))
+                    & pending_objects
+                )
+            ]
+            if not loadable:
+                logger.debug("Circular references between modified items, full load")
+                self.load(loader)
+                return False
+            ordered += loadable
+            pending = [unit for unit in pending if unit not in loadable]
+        logger.debug("Loading %d modified DB items out of %d", len(ordered), len(units))
+
+        # Remove objects of stale units from indexes
+        stale_tops = set()
+        for unit in stale & previous_values.keys():
+            stale_tops |= self._top_objects(previous_values[unit])
+
+        def is_stale(obj):
+            while obj._parent is not root and obj._parent is not None:
+                obj = obj._parent
+            return id(obj) in stale_tops
+
+        # Copy objects of unmodified units with a new root object attached to this
+        # GenericDB. The copies of objects are memorized by identifier of the
+        # previous objects to preserve references between objects.
+        new_root = object.__new__(type(root))
+        memo = {id(previous): self, id(root): new_root}
+        top_attributes = {self._root_attribute(root, token) for token in loader.content}
+        for key, value in list(vars(root).items()):
+            if key not in top_attributes:
+                setattr(new_root, key, self._clone(value, memo))
+        new_root._db = self
+
+        self._keys = {}
+        for name, index in previous._keys.items():
+            self._keys[name] = index.copy()
+        for name, objects in previous._indexes.items():
+            self._indexes[name] = []
+            for obj in objects:
+                if not is_stale(obj):
+                    self._indexes[name].append(self._clone(obj, memo))
+                elif "_key" in vars(obj):
+                    self._keys[name].remove(obj._key)
+        for index in self._keys.values():
+            index.values = {
+                value: self._clone(obj, memo) for value, obj in index.values.items()
+            }
+            index._rangesindex = None
+        self._classes = previous._classes
+        self._loaded_classes = set(previous._loaded_classes)
+
+        # Load modified units
+        values = {}
+        for unit in ordered:
+            schema, literal = units[unit]
+            if len(unit) == 1:
+                schema = self._schema.content.prop(unit[0]).type
+            values[unit] = self.load_type(unit[0], literal, schema, new_root)
+
+        for token in loader.content:
+            attribute = self._root_attribute(root, token)
+            if (token,) in units:
+                if (token,) in values:
+                    value = values[(token,)]
+                else:
+                    value = self._clone(previous_values[(token,)], memo)
+            else:
+                value = DBDict()
+                for unit in units:
+                    if unit[0] != token:
+                        continue
+                    if unit in values:
+                        obj = values[unit]
+                    else:
+                        obj = self._clone(previous_values[unit], memo)
+                    value[obj._key] = obj
+            setattr(new_root, attribute, value)
+        for key, value in vars(new_root).items():
+            if key != "_schema":
+                setattr(self, key, value)
+        self._root = new_root
+        self._content = loader.content
+        # Cached properties computed with previously loaded objects are now
+        # obsolete.
+        self.drop_caches()
+        return True
+
+    def drop_caches(self):
+        """Drop the values of all cached properties of the DB and its loaded objects,
+        so they are computed again on next access."""
+        for obj in [self] + [
+            obj for objects in self._indexes.values() for obj in objects
+        ]:
+            for name in _cached_properties(type(obj)):
+                obj.__dict__.pop(name, None)
+
+    def _clone(self, value, memo):
+        """Return a copy of the given value attached to this GenericDB, with copies of
+        the DBObjects it contains. The copies of DBObjects are memorized by identifier
+        of the copied objects, so they are copied once and references between objects
+        are preserved. The values of cached properties are not copied. Other values
+        are immutable and returned as is."""
+        if isinstance(value, DBObject):
+            try:
+                return memo[id(value)]
+            except KeyError:
+                pass
+            if isinstance(value, DBExpandedObject):
+                result = type(value)(self._clone(value._expandable, memo), value._index)
+                memo[id(value)] = result
+                return result
+            result = object.__new__(type(value))
+            memo[id(value)] = result
+            cached = _cached_properties(type(value))
+            # Iterate over a snapshot of the attributes, as the previous objects can
+            # still be used concurrently to serve requests that fill their cached
+            # properties.
+            for key, attribute in list(vars(value).items()):
+                if key in cached:
+                    continue
+                if key == "_db":
+                    attribute = self
+                elif key != "_schema":
+                    attribute = self._clone(attribute, memo)
+                setattr(result, key, attribute)
+            return result
+        if isinstance(value, DBDict):
+            result = DBDict()
+            for key, item in value.items():
+                result[key] = self._clone(item, memo)
+            return result
+        if isinstance(value, DBList):
+            return DBList(self._clone(item, memo) for item in value.itervalues())
+        if isinstance(value, list):
+            return [self._clone(item, memo) for item in value]
+        if isinstance(value, dict):
+            return {key: self._clone(item, memo) for key, item in value.items()}
+        return value
 
     def load_type(
         self,
@@ -396,28 +1301,73 @@ class GenericDB(DBObject):
     def load_defined_type(self, literal, schema_type: SchemaDefinedType):
         return schema_type.parse(literal)
 
-    def create_object(self, schema_object):
-        """Instanciate DBObject with dynamic instanciation with optional base class."""
-        # is it expandable?
-        if schema_object.expandable:
-            bases = [DBExpandableObject]
-            classname = f"{self._prefix}Expandable{schema_object.name}"
-        else:
-            bases = [DBObject]
-            classname = f"{self._prefix}{schema_object.name}"
+    def _define_class(self, classname, name, base):
+        """Return the dynamically defined class with the given base class and optional
+        base class from bases module for the given SchemaObject name. Classes are
+        defined once and saved in cache for subsequent objects."""
+        key = (self._prefix, name, base)
+        try:
+            return self._classes[key]
+        except KeyError:
+            pass
+        bases = [base]
         # Add provided module base if defined
         try:
             # Insert bases module class in the beginning of the list to make
             # sure methods from this classes are called over the methods from
             # DBObject.
-            bases.insert(
-                0,
-                getattr(self._bases, f"{self._prefix}{schema_object.name}Base"),
-            )
+            bases.insert(0, getattr(self._bases, f"{self._prefix}{name}Base"))
         except AttributeError:
             pass
-        # instanciate the object with its dynamically defined class
-        return type(classname, tuple(bases), dict())(self, schema_object)
+        namespace = dict()
+        if base is DBExpandedObject:
+            # Keep expanded objects without instance dict.
+            namespace["__slots__"] = ()
+        self._classes[key] = type(classname, tuple(bases), namespace)
+        if base is DBExpandedObject and self._classes[key].__dictoffset__:
+            # The classes of the bases module without slots add an instance dict.
+            logger.warning(
+                "Classes %s of bases module do not declare __slots__, expanded "
+                "objects %s have an instance dict",
+                [
+                    _class.__name__
+                    for _class in bases[0].__mro__
+                    if _class is not object and "__slots__" not in vars(_class)
+                ],
+                classname,
+            )
+        return self._classes[key]
+
+    def object_class(self, name, expandable=False):
+        """Return the dynamically defined class of DBObjects of the given SchemaObject
+        name."""
+        # is it expandable?
+        if expandable:
+            return self._define_class(
+                f"{self._prefix}Expandable{name}", name, DBExpandableObject
+            )
+        return self._define_class(f"{self._prefix}{name}", name, DBObject)
+
+    def expanded_class(self, name):
+        """Return the dynamically defined class of DBExpandedObjects of the given
+        SchemaObject name."""
+        return self._define_class(f"{self._prefix}{name}", name, DBExpandedObject)
+
+    def value_class(self, name, base):
+        """Return the dynamically defined class of values inheriting from the given
+        base class, saved in cache for subsequent values."""
+        key = (self._prefix, name, base)
+        try:
+            return self._classes[key]
+        except KeyError:
+            self._classes[key] = type(f"{self._prefix}{name}", (base,), dict())
+            return self._classes[key]
+
+    def create_object(self, schema_object):
+        """Instanciate DBObject with dynamic instanciation with optional base class."""
+        return self.object_class(schema_object.name, schema_object.expandable)(
+            self, schema_object
+        )
 
     def create_object_by_name(self, name):
         """Instanciate DBObject by its name."""
@@ -465,15 +1415,21 @@ class GenericDB(DBObject):
             # attribute.
             if prop.key:
                 value = getattr(obj, prop.name)
-                # If another object of the same type is already present in index
-                if schema_object.name in self._indexes:
-                    # Check over all previously loaded objects of the same type
-                    # if this key value has not been used yet.
-                    for _obj in self._indexes[schema_object.name]:
-                        if getattr(_obj, prop.name) == value:
-                            raise DBFormatError(
-                                f"Key value {value} of {schema_object} is not unique."
-                            )
+                if schema_object.name not in self._keys:
+                    self._keys[schema_object.name] = DBKeysIndex()
+                # Check in index of key values of the same type if this key value
+                # has not been used yet.
+                conflict = self._keys[schema_object.name].conflict(value)
+                if conflict is not None:
+                    if isinstance(value, DBObjectRange):
+                        raise DBFormatError(
+                            f"Key value {value} of {schema_object} is not unique, "
+                            f"{conflict} already defined."
+                        )
+                    raise DBFormatError(
+                        f"Key value {value} of {schema_object} is not unique."
+                    )
+                self._keys[schema_object.name].add(value, obj)
                 setattr(obj, "_key", value)
 
         # add object to db indexes
@@ -606,19 +1562,28 @@ class GenericDB(DBObject):
         return True
 
     def load_reference(self, token, literal, schema_type: SchemaReference):
-        all_objs = self.find_objects(schema_type.obj.name, expand=True)
-        if all_objs is None:
+        if schema_type.obj.name not in self._indexes:
             raise DBFormatError(
                 f"Unable to find {token} {literal} reference because objects "
                 f"{schema_type.obj.name} are missing in DB indexes"
             )
-
-        logger.debug("Found objects for type %s: %s", schema_type.obj.name, all_objs)
-        for _obj in all_objs:
-            property_value = getattr(_obj, schema_type.prop)
-            if property_value == literal:
-                return _obj
-        raise DBFormatError(f"Unable to find {token} reference with value {literal}")
+        # Get the lookup table of the referenced object property, and update it with
+        # the objects loaded since last reference resolution.
+        table = self._references.setdefault(
+            (schema_type.obj.name, schema_type.prop),
+            DBReferencesIndex(schema_type.prop),
+        )
+        table.update(self._indexes[schema_type.obj.name])
+        try:
+            obj, index = table.get(literal)
+        except (KeyError, TypeError):
+            raise DBFormatError(
+                f"Unable to find {token} reference with value {literal}"
+            )
+        if index is None:
+            return obj
+        logger.debug("Found %s reference %s in %s", token, literal, obj)
+        return obj.member(index)
 
     def load_back_reference(self, parent, schema_type: SchemaBackReference):
         logger.debug("Loading back reference of %s/%s", parent, schema_type)
@@ -676,10 +1641,18 @@ class GenericDB(DBObject):
             return result
 
     def load_expandable(self, literal):
-        return type(f"{self._prefix}ExpandableRange", (DBObjectRange,), dict())(literal)
+        return self.value_class("ExpandableRange", DBObjectRange)(literal)
 
     def load_rangeid(self, literal):
-        return type(f"{self._prefix}RangeId", (DBObjectRangeId,), dict())(literal)
+        return self.value_class("RangeId", DBObjectRangeId)(literal)
+
+    def find_object(self, object_type_name, key):
+        """Return the object of the given type with the provided key value, or the
+        expanded object when the key value is a member of the range of an expandable
+        object. Raise KeyError if not found."""
+        if object_type_name not in self._keys:
+            raise KeyError(key)
+        return self._keys[object_type_name].get(key)
 
     def find_objects(self, object_type_name, expand=False):
         if object_type_name not in self._indexes:
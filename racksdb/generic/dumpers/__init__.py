@@ -6,12 +6,18 @@
 
 from .yaml import DBDumperYAML, SchemaDumperYAML
 from .json import DBDumperJSON
+from .ndjson import DBDumperNDJSON
 from .console import DBDumperConsole
 from ..errors import DBDumperError
 
 
 class DBDumperFactory:
-    FORMATS = {"yaml": DBDumperYAML, "json": DBDumperJSON, "console": DBDumperConsole}
+    FORMATS = {
+        "yaml": DBDumperYAML,
+        "json": DBDumperJSON,
+        "ndjson": DBDumperNDJSON,
+        "console": DBDumperConsole,
+    }
 
     @staticmethod
     def get(_format):
@@ -4,7 +4,8 @@
 #
 # SPDX-License-Identifier: MIT
 
-from typing import Any
+from typing import Any, Iterator, Optional, Set
+import collections.abc
 import json
 import logging
 
@@ -66,6 +67,69 @@ class GenericJSONEncoder(json.JSONEncoder, MapperDumper):
         # Let the base class default method raise the TypeError
         return json.JSONEncoder.default(self, obj)
 
+    def iterencode_db(self, obj: Any, markers: Optional[Set[int]] = None):
+        """Encode the given object and yield its JSON representation by chunks. The
+        DBObjects, DBDict and DBList are walked lazily, without building intermediate
+        Python dictionnaries and lists, so that memory usage is bounded by the depth of
+        objects rather than the size of the result. The representation is identical
+        to encode(). Other objects are encoded with the base class."""
+        if markers is None:
+            markers = set()
+        if isinstance(obj, (DBObjectRange, DBObjectRangeId)):
+            yield from json.JSONEncoder.iterencode(self, self.default(obj))
+        elif isinstance(obj, DBDict):
+            if self.fold:
+                # Force iteration over the values of the dictionnary to avoid automatic
+                # expansion performed by DBDict iterator.
+                items = obj.values()
+            else:
+                # Use DBDict iterator to expand potential DBExpandableObject.
+                items = obj
+            yield from self._iterencode_db_items(obj, items, markers)
+        elif isinstance(obj, DBList):
+            if self.fold:
+                items = obj.itervalues()
+            else:
+                # Use DBList iterator to expand potential DBExpandableObject.
+                items = obj
+            yield from self._iterencode_db_items(obj, items, markers)
+        elif isinstance(obj, DBObject):
+            self._mark(obj, markers)
+            separator = "{"
+            for prop in obj._schema.properties:
+                try:
+                    value = self.map(obj, prop.name, getattr(obj, prop.name))
+                except AttributeError:
+                    continue
+                if value is None:
+                    continue
+                yield f"{separator}{json.JSONEncoder.encode(self, prop.name)}: "
+                yield from self.iterencode_db(value, markers)
+                separator = ", "
+            yield "{}" if separator == "{" else "}"
+            markers.remove(id(obj))
+        else:
+            yield from json.JSONEncoder.iterencode(self, obj)
+
+    def _iterencode_db_items(self, obj, items, markers: Set[int]):
+        """Yield JSON representation of the given items of DBDict or DBList by
+        chunks."""
+        self._mark(obj, markers)
+        separator = "["
+        for item in items:
+            yield separator
+            yield from self.iterencode_db(item, markers)
+            separator = ", "
+        yield "[]" if separator == "[" else "]"
+        markers.remove(id(obj))
+
+    def _mark(self, obj, markers: Set[int]):
+        """Mark the given object as being encoded, raise ValueError if it is already
+        being encoded."""
+        if id(obj) in markers:
+            raise ValueError("Circular reference detected")
+        markers.add(id(obj))
+
 
 class DBDumperJSON:
     def __init__(self, show_types=False, objects_map={}, fold=True):
@@ -89,6 +153,32 @@ class DBDumperJSON:
                 obj = [item for item in obj.values()]
             else:
                 obj = [item for item in obj]
+        elif isinstance(obj, collections.abc.Iterator):
+            obj = list(obj)
         return GenericJSONEncoder(objects_map=self.objects_map, fold=self.fold).encode(
             obj
         )
+
+    def stream(self, obj: Any, chunk_size: int = 65536) -> Iterator[str]:
+        """Yield the same JSON representation as dump() by chunks of approximately
+        the given size in characters, generated lazily while walking the objects.
+        Iterators, such as the generators returned by DBDict.iter_filter(), are
+        consumed while the representation is generated and represented as lists."""
+        buffer = []
+        size = 0
+        encoder = GenericJSONEncoder(objects_map=self.objects_map, fold=self.fold)
+        if isinstance(obj, (DBList, collections.abc.Iterator)):
+            # As in dump(), top-level DBList is iterated as a standard Python list,
+            # thus expanding potential expandable objects.
+            chunks = encoder._iterencode_db_items(obj, obj, set())
+        else:
+            chunks = encoder.iterencode_db(obj)
+        for chunk in chunks:
+            buffer.append(chunk)
+            size += len(chunk)
+            if size >= chunk_size:
+                yield "".join(buffer)
+                buffer = []
+                size = 0
+        if buffer:
+            yield "".join(buffer)
@@ -0,0 +1,55 @@
+# Copyright (c) 2026 Rackslab
+#
+# This file is part of RacksDB.
+#
+# SPDX-License-Identifier: MIT
+
+from typing import Any, Iterator
+import collections.abc
+import logging
+
+from .json import GenericJSONEncoder
+from ...generic.db import DBDict, DBList
+
+logger = logging.getLogger(__name__)
+
+
+class DBDumperNDJSON:
+    """Dump objects in newline delimited JSON format (aka. JSON Lines), with the JSON
+    representation of every item of the collection on a separate line. Objects which
+    are not collections are represented on a single line."""
+
+    def __init__(self, show_types=False, objects_map={}, fold=True):
+        self.objects_map = objects_map
+        self.fold = fold
+
+    def _items(self, obj: Any):
+        """Iterate lazily over the items of the given object, expanding potential
+        DBExpandableObject unless folded. Iterators, such as the generators returned
+        by DBDict.iter_filter(), are consumed item by item."""
+        if isinstance(obj, DBDict):
+            if self.fold:
+                # Force iteration over the values of the dictionnary to avoid automatic
+                # expansion performed by DBDict iterator.
+                yield from obj.values()
+            else:
+                yield from obj
+        elif isinstance(obj, DBList):
+            if self.fold:
+                yield from obj.itervalues()
+            else:
+                yield from obj
+        elif isinstance(obj, (list, tuple, collections.abc.Iterator)):
+            yield from obj
+        else:
+            yield obj
+
+    def stream(self, obj: Any) -> Iterator[str]:
+        """Yield the JSON representation of items one line at a time, generated
+        lazily while walking the objects."""
+        encoder = GenericJSONEncoder(objects_map=self.objects_map, fold=self.fold)
+        for item in self._items(obj):
+            yield "".join(encoder.iterencode_db(item)) + "\n"
+
+    def dump(self, obj: Any) -> str:
+        return "".join(self.stream(obj))
@@ -5,6 +5,7 @@
 # SPDX-License-Identifier: MIT
 
 import collections
+import functools
 import logging
 
 import yaml
@@ -12,16 +13,70 @@ import yaml
 from ._common import MapperDumper
 from ..db import DBObject, DBObjectRange, DBObjectRangeId, DBList, DBDict
 from ..definedtype import SchemaDefinedType
+from .. import yamlbackend
 
 logger = logging.getLogger(__name__)
 
 
+class OwnedDumper(yamlbackend.Dumper):
+    """YAML Dumper bound to the object which owns the methods to represent data,
+    without aliases in generated documents. Subclasses register their own
+    representers once, leaving the backend Dumper untouched. As an instance is
+    created for every dump, the representers can depend on the state of their owner
+    in concurrent threads."""
+
+    def __init__(self, stream, owner=None, **kwargs):
+        super().__init__(stream, **kwargs)
+        self.owner = owner
+
+    def ignore_aliases(self, data):
+        return True
+
+    @classmethod
+    def add_owner_representer(cls, data_type, method, multi=False):
+        """Register representer of the given data type which delegates the
+        representation to the owner method with the given name. When multi is True,
+        the representer is also used for subclasses of the data type."""
+
+        def representer(dumper, data):
+            return getattr(dumper.owner, method)(dumper, data)
+
+        if multi:
+            cls.add_multi_representer(data_type, representer)
+        else:
+            cls.add_representer(data_type, representer)
+
+
+class DBYAMLDumper(OwnedDumper):
+    """YAML Dumper with representers of database objects."""
+
+
+DBYAMLDumper.add_owner_representer(DBDict, "_represent_dict")
+DBYAMLDumper.add_owner_representer(DBList, "_represent_list")
+DBYAMLDumper.add_owner_representer(tuple, "_represent_tuple")
+DBYAMLDumper.add_owner_representer(DBObject, "_represent_dbobject", multi=True)
+DBYAMLDumper.add_owner_representer(
+    DBObjectRange, "_represent_dbobjectrange", multi=True
+)
+DBYAMLDumper.add_owner_representer(
+    DBObjectRangeId, "_represent_dbobjectrangeid", multi=True
+)
+
+
+class SchemaYAMLDumper(OwnedDumper):
+    """YAML Dumper with representers of schema objects."""
+
+
+SchemaYAMLDumper.add_owner_representer(
+    SchemaDefinedType, "_represent_schemadefinedtype", multi=True
+)
+
+
 class DBDumperYAML(MapperDumper):
     def __init__(self, show_types=False, objects_map={}, fold=True):
         super().__init__(objects_map)
         self.show_types = show_types
         self.fold = fold
-        self._setup()
         # refs to last represented objects, used to inform users in case of dump
         # recursion loops
         self._last_objs = collections.deque([], 8)
@@ -83,20 +138,12 @@ class DBDumperYAML(MapperDumper):
     def _represent_dbobjectrangeid(self, dumper, data):
         return dumper.represent_data(data.start)
 
-    def _setup(self):
-        yaml.add_representer(DBDict, self._represent_dict)
-        yaml.add_representer(DBList, self._represent_list)
-        yaml.add_representer(tuple, self._represent_tuple)
-        yaml.add_multi_representer(DBObject, self._represent_dbobject)
-        yaml.add_multi_representer(DBObjectRange, self._represent_dbobjectrange)
-        yaml.add_multi_representer(DBObjectRangeId, self._represent_dbobjectrangeid)
-
     def dump(self, data):
-        noalias_dumper = yaml.dumper.Dumper
-        noalias_dumper.ignore_aliases = lambda self, data: True
         try:
             # Remove last newline to avoid double newline when printed by CLI.
-            return yaml.dump(data, Dumper=noalias_dumper).rstrip()
+            return yamlbackend.dump(
+                data, dumper=functools.partial(DBYAMLDumper, owner=self)
+            ).rstrip()
         except RecursionError:
             logger.error(
                 "Recursion loop detected during dump, last represented objects:\n→ %s",
@@ -106,23 +153,15 @@ class DBDumperYAML(MapperDumper):
 
 
 class SchemaDumperYAML:
-    def __init__(self):
-        self._setup()
-
     def _represent_schemadefinedtype(self, dumper, data):
         tag = "tag:yaml.org,2002:str"  # YAML generic string type
         node = yaml.ScalarNode(tag, f"{data.pattern} [{data.native.__name__}]")
         return node
 
-    def _setup(self):
-        yaml.add_multi_representer(SchemaDefinedType, self._represent_schemadefinedtype)
-
     def dump(self, schema):
-        noalias_dumper = yaml.dumper.Dumper
-        noalias_dumper.ignore_aliases = lambda self, data: True
         # Dump all Schema object content except _schema attribute. Remove last newline
         # to avoid double newline when printed by CLI.
-        return yaml.dump(
+        return yamlbackend.dump(
             {**schema._schema, **{"_types": schema.types}},
-            Dumper=noalias_dumper,
+            dumper=functools.partial(SchemaYAMLDumper, owner=self),
         ).rstrip()
@@ -0,0 +1,115 @@
+# Copyright (c) 2026 Rackslab
+#
+# This file is part of RacksDB.
+#
+# SPDX-License-Identifier: MIT
+
+import hashlib
+import logging
+import typing as t
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+
+def file_digest(path: Path) -> str:
+    """Return the SHA256 hash of the content of the given file."""
+    with open(path, "rb") as fh:
+        return hashlib.sha256(fh.read()).hexdigest()
+
+
+class DBManifest:
+    """Manifest of the files under a set of paths, files or directories walked
+    recursively, with their sizes, modification times and hashes. The files are
+    sorted by path. The manifest can be compared with the current state of the files
+    to detect changes without parsing them. Paths that do not exist are ignored.
+
+    Entries are tuples of path, modification time in nanoseconds, size and SHA256
+    hash. When the entries are provided, the files are not scanned. This can be
+    used to restore a manifest previously saved."""
+
+    def __init__(
+        self,
+        paths: t.List[Path],
+        entries: t.Optional[t.List[t.Tuple[str, int, int, str]]] = None,
+    ):
+        self.paths = paths
+        if entries is None:
+            entries = []
+            for path, stat in self._stats():
+                entries.append(
+                    (path, stat.st_mtime_ns, stat.st_size, file_digest(Path(path)))
+                )
+        self.entries = entries
+
+    def _files(self) -> t.List[str]:
+        """Return the sorted list of files under the paths."""
+        result = []
+        for path in self.paths:
+            if path.is_dir():
+                result.extend(str(item) for item in path.rglob("*") if item.is_file())
+            elif path.exists():
+                result.append(str(path))
+        return sorted(result)
+
+    def _stats(self):
+        """Return the sorted list of files under the paths with their stats."""
+        result = []
+        for path in self._files():
+            try:
+                result.append((path, Path(path).stat()))
+            except FileNotFoundError:
+                # The file has been removed in the meantime.
+                continue
+        return result
+
+    @property
+    def files(self) -> t.List[str]:
+        """The list of files in the manifest."""
+        return [entry[0] for entry in self.entries]
+
+    @property
+    def digest(self) -> str:
+        """Hash of the paths and contents of all files in the manifest, independent
+        of files modification times."""
+        result = hashlib.sha256()
+        for path, _, _, digest in self.entries:
+            result.update(f"{path}\0{digest}\0".encode())
+        return result.hexdigest()
+
+    def changed(self) -> bool:
+        """Return True if files have been added, removed, or have different size or
+        modification time since the manifest was built. This only requires one stat
+        pass over the files."""
+        stats = self._stats()
+        if len(stats) != len(self.entries):
+            return True
+        for (path, stat), (_path, mtime, size, _) in zip(stats, self.entries):
+            if path != _path or stat.st_mtime_ns != mtime or stat.st_size != size:
+                return True
+        return False
+
+    def modified(self) -> t.List[str]:
+        """Return the sorted list of files added, removed or with modified content
+        since the manifest was built. The hashes of the files are compared only when
+        their modification times differ."""
+        entries = {entry[0]: entry for entry in self.entries}
+        result = []
+        for path, stat in self._stats():
+            try:
+                _, mtime, size, digest = entries.pop(path)
+            except KeyError:
+                # new file
+                result.append(path)
+                continue
+            if stat.st_size != size:
+                result.append(path)
+            elif stat.st_mtime_ns != mtime:
+                try:
+                    if file_digest(Path(path)) != digest:
+                        result.append(path)
+                except FileNotFoundError:
+                    result.append(path)
+        # Remaining entries are removed files
+        result.extend(entries.keys())
+        return sorted(result)
@@ -12,6 +12,7 @@ import copy
 import logging
 
 from .errors import DBSchemaError
+from . import yamlbackend
 
 logger = logging.getLogger(__name__)
 
@@ -53,8 +54,8 @@ class SchemaFileLoader:
             raise DBSchemaError(f"Schema path {self.path} does not exist")
         with open(self.path) as fh:
             try:
-                result = yaml.safe_load(fh)
-            except yaml.composer.ComposerError as err:
+                result = yamlbackend.load(fh)
+            except yaml.YAMLError as err:
                 raise DBSchemaError(err)
         # load schema extensions
         result = self.load_extensions(result)
@@ -71,8 +72,8 @@ class SchemaFileLoader:
         logger.debug("Loading schema extensions file %s", self.extensions)
         with open(self.extensions) as fh:
             try:
-                extensions = yaml.safe_load(fh)
-            except yaml.composer.ComposerError as err:
+                extensions = yamlbackend.load(fh)
+            except yaml.YAMLError as err:
                 raise DBSchemaError(err)
         if "_content" in extensions:
             logger.debug("Updating schema with additional content found in extension")
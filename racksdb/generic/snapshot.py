@@ -0,0 +1,199 @@
+# Copyright (c) 2026 Rackslab
+#
+# This file is part of RacksDB.
+#
+# SPDX-License-Identifier: MIT
+
+import os
+import stat
+import datetime
+import hashlib
+import pickle
+import tempfile
+import logging
+import typing as t
+from pathlib import Path
+
+from .db import DBLoader, DBSplittedFilesLoader
+from .schema import SchemaFileLoader
+from .manifest import DBManifest
+
+logger = logging.getLogger(__name__)
+
+
+class SchemaSnapshotLoader:
+    """Schema loader with content restored from a snapshot."""
+
+    def __init__(self, content):
+        self.content = content
+
+
+class DBSnapshotLoader(DBLoader):
+    """DB loader with content restored from a snapshot."""
+
+    def __init__(self, path, content):
+        self.path = path
+        self.content = content
+
+
+class SnapshotUnpickler(pickle.Unpickler):
+    """Unpickler restricted to the types of content parsed from YAML files. Other
+    classes and functions are refused, so that loading a snapshot cannot execute
+    arbitrary code."""
+
+    ALLOWED = {
+        ("datetime", "date"): datetime.date,
+        ("datetime", "datetime"): datetime.datetime,
+    }
+
+    def find_class(self, module, name):
+        try:
+            return self.ALLOWED[(module, name)]
+        except KeyError:
+            raise pickle.UnpicklingError(
+                f"Forbidden global {module}.{name} in snapshot"
+            )
+
+
+def _unsafe_reason(st) -> t.Optional[str]:
+    """Return the reason why a file with the given stat result must not be trusted,
+    or None if it is owned by the current user and not writable by group and
+    others."""
+    if st.st_uid != os.geteuid():
+        return "not owned by current user"
+    if st.st_mode & (stat.S_IWGRP | stat.S_IWOTH):
+        return "writable by group or others"
+    return None
+
+
+class DBSnapshot:
+    """On-disk snapshot of the content parsed from schema, schema extensions and
+    database files, saved in cache directory to avoid parsing the files again on
+    subsequent loads. The snapshot is identified by the paths of schema, extensions
+    and database. It is considered valid as long as the manifest of these files saved
+    in the snapshot reports no modified files.
+
+    The loaded objects graph is not saved in the snapshot as its classes are
+    dynamically defined, only the parsed content of the files is saved. Restoring a
+    snapshot skips YAML parsing only, the schema and the objects are still built
+    from the restored content.
+
+    Snapshots are restored only when the snapshot file and the cache directory are
+    owned by the current user and not writable by group and others, with an
+    unpickler restricted to the types of parsed content."""
+
+    VERSION = 1
+
+    def __init__(self, cache: Path, schema: Path, ext: Path, db: Path):
+        self.schema = schema
+        self.ext = ext
+        self.db = db
+        identifier = hashlib.sha256(
+            "\0".join([str(path.absolute()) for path in (schema, ext, db)]).encode()
+        ).hexdigest()
+        self.path = cache / f"{identifier}.snapshot"
+        self.schema_content = None
+        self.db_content = None
+        self.valid = False
+        self._load()
+        # When the snapshot is not valid, build the manifest of the files before
+        # they are parsed so that files modified in the meantime are detected on
+        # next load.
+        self._new_manifest = None
+        if not self.valid:
+            try:
+                self._new_manifest = DBManifest(self._paths())
+            except OSError as err:
+                logger.debug("Unable to build files manifest: %s", err)
+
+    def _paths(self):
+        """Return the list of schema, extensions and database paths."""
+        return [self.schema, self.ext, self.db]
+
+    def _load(self):
+        """Restore content from snapshot file if it exists and it is still valid."""
+        try:
+            with open(self.path, "rb") as fh:
+                # Check the opened file, not the path, to avoid races with
+                # replacement of the file.
+                for path, st in (
+                    (self.path.parent, os.stat(self.path.parent)),
+                    (self.path, os.fstat(fh.fileno())),
+                ):
+                    reason = _unsafe_reason(st)
+                    if reason is not None:
+                        logger.warning(
+                            "Ignoring snapshot %s, %s is %s", self.path, path, reason
+                        )
+                        return
+                snapshot = SnapshotUnpickler(fh).load()
+        except FileNotFoundError:
+            logger.debug("Snapshot %s not found", self.path)
+            return
+        except Exception as err:
+            logger.warning("Unable to read snapshot %s: %s", self.path, err)
+            return
+        if not isinstance(snapshot, dict) or snapshot.get("version") != self.VERSION:
+            logger.debug("Snapshot %s has unsupported format, ignoring", self.path)
+            return
+        try:
+            modified = DBManifest(self._paths(), snapshot["files"]).modified()
+        except OSError as err:
+            logger.debug("Unable to check files manifest: %s", err)
+            return
+        if modified:
+            logger.debug(
+                "Snapshot %s is obsolete due to modified files %s, ignoring",
+                self.path,
+                ", ".join(modified),
+            )
+            return
+        logger.debug("Loading content from snapshot %s", self.path)
+        self.schema_content = snapshot["schema"]
+        self.db_content = snapshot["db"]
+        self.valid = True
+
+    def schema_loader(self):
+        """Return schema loader with content restored from snapshot if valid, or
+        schema file loader otherwise."""
+        if self.valid:
+            return SchemaSnapshotLoader(self.schema_content)
+        return SchemaFileLoader(self.schema, self.ext)
+
+    def db_loader(self, workers=1, previous=None):
+        """Return DB loader with content restored from snapshot if valid, or DB files
+        loader with the given number of parallel workers and optional previous loader
+        otherwise."""
+        if self.valid:
+            return DBSnapshotLoader(self.db, self.db_content)
+        return DBSplittedFilesLoader(self.db, workers, previous)
+
+    def save(self, schema_content, db_content):
+        """Save content parsed from files in snapshot file. Errors are reported
+        without being fatal as the snapshot is just an optimization."""
+        if self._new_manifest is None:
+            return
+        try:
+            snapshot = {
+                "version": self.VERSION,
+                "files": self._new_manifest.entries,
+                "schema": schema_content,
+                "db": db_content,
+            }
+            # Cache directory is created private to the current user, as snapshots
+            # are restored only from directories not writable by others.
+            self.path.parent.mkdir(mode=0o700, parents=True, exist_ok=True)
+            # Write in temporary file renamed atomically to avoid concurrent
+            # processes reading partially written snapshot.
+            fd, tmp = tempfile.mkstemp(dir=self.path.parent, suffix=".tmp")
+            try:
+                with os.fdopen(fd, "wb") as fh:
+                    pickle.dump(snapshot, fh, protocol=pickle.HIGHEST_PROTOCOL)
+                os.replace(tmp, self.path)
+            except BaseException:
+                os.unlink(tmp)
+                raise
+        except (OSError, pickle.PicklingError) as err:
+            logger.warning("Unable to save snapshot %s: %s", self.path, err)
+            return
+        logger.debug("Saved snapshot %s", self.path)
@@ -175,7 +175,11 @@ class DBViewSet:
                 parameters = None
             # List of responses
             responses = []
-            for mimetype in ["application/json", "application/x-yaml"]:
+            for mimetype in [
+                "application/json",
+                "application/x-yaml",
+                "application/x-ndjson",
+            ]:
                 responses.append(
                     DBActionResponse(mimetype, object_name=view.objects_name)
                 )
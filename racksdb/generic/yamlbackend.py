@@ -0,0 +1,46 @@
+# Copyright (c) 2026 Rackslab
+#
+# This file is part of RacksDB.
+#
+# SPDX-License-Identifier: MIT
+
+"""YAML parsing and dumping backend, based on libyaml C bindings when available in
+PyYAML with transparent fallback on pure Python implementation."""
+
+import yaml
+
+try:
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:
+    from yaml import SafeLoader
+
+try:
+    from yaml import CDumper as Dumper
+except ImportError:
+    from yaml import Dumper
+
+# True if libyaml C bindings are used
+WITH_LIBYAML = SafeLoader is not yaml.SafeLoader
+
+
+def load(stream):
+    """Parse the given YAML stream or string and return the corresponding Python
+    object, with the same restrictions as yaml.safe_load()."""
+    try:
+        return yaml.load(stream, Loader=SafeLoader)
+    except yaml.YAMLError:
+        if not WITH_LIBYAML:
+            raise
+        # Errors reported by libyaml are less detailed than errors reported by the
+        # pure Python implementation (ex: names of undefined aliases are missing).
+        # Parse the content again with pure Python implementation to report the
+        # detailed error.
+        if hasattr(stream, "seek"):
+            stream.seek(0)
+        return yaml.load(stream, Loader=yaml.SafeLoader)
+
+
+def dump(data, dumper=Dumper, **kwargs):
+    """Serialize data in YAML with the given dumper class, or callable returning
+    dumper instance, and return the string."""
+    return yaml.dump(data, Dumper=dumper, **kwargs)
@@ -149,3 +149,54 @@ class TestDrawer(unittest.TestCase):
             self.drawer._find_rack_colorset(FakeRack("type2", None)).pane,
             defaults.pane,
         )
+
+    def test_default_colorsets_memoized(self):
+        # Default color sets must be loaded once per drawing parameters instance.
+        self.assertIs(
+            default_rack_colorset(self.parameters),
+            default_rack_colorset(self.parameters),
+        )
+        self.assertIs(
+            default_equipment_colorset(self.parameters),
+            default_equipment_colorset(self.parameters),
+        )
+        # Another drawing parameters instance has its own default color sets.
+        parameters = DrawingParameters.load(
+            DBDictsLoader({}), self.drawings_schema_path
+        )
+        self.assertIsNot(
+            default_rack_colorset(parameters),
+            default_rack_colorset(self.parameters),
+        )
+
+    def test_coloring_rules_order(self):
+        # Equipment with type type1 and all tags match both coloring rules, the first
+        # defined rule must be selected.
+        self.assertEqual(
+            self.drawer._find_equipment_colorset(
+                FakeEquipment("type1", ["tag1", "tag2", "tag3"])
+            ).background,
+            (17 / 255, 34 / 255, 51 / 255, 1.0),
+        )
+        # Result of lookup with the same type and tags is the same rule.
+        self.assertIs(
+            self.drawer._find_rack_colorset(FakeRack("type2", ["tag2", "tag1"])),
+            self.drawer._find_rack_colorset(FakeRack("type2", ["tag1", "tag2"])),
+        )
+
+    def test_print_text_measures(self):
+        drawer = Drawer({}, "output", "png", self.parameters, None, "yaml")
+        drawer.init_ctx(100, 100)
+        drawer._print_text("label", 50, 20)
+        layout = drawer._layout
+        self.assertEqual(len(drawer._text_measures), 1)
+        # Text label with the same text and maximum sizes must reuse measured font
+        # size and layout.
+        drawer._print_text("label", 50, 20)
+        self.assertEqual(len(drawer._text_measures), 1)
+        self.assertIs(drawer._layout, layout)
+        # Text label with other maximum sizes must be measured.
+        drawer._print_text("label", 10, 5)
+        self.assertEqual(len(drawer._text_measures), 2)
+        (small_size, _), (size, _) = sorted(drawer._text_measures.values())
+        self.assertLessEqual(small_size, size)
@@ -0,0 +1,123 @@
+# Copyright (c) 2026 Rackslab
+#
+# This file is part of RacksDB.
+#
+# SPDX-License-Identifier: MIT
+
+import unittest
+import tempfile
+from pathlib import Path
+
+from racksdb import RacksDB
+from racksdb.drawers import (
+    InfrastructureDrawer,
+    AxonometricInfrastructureDrawer,
+    RoomDrawer,
+)
+from racksdb.drawers.batch import DrawingsBatch, drawer_class
+from racksdb.drawers.parameters import DrawingParameters
+from racksdb.generic.db import DBDictsLoader
+from racksdb.errors import RacksDBError
+
+from ..lib.common import drawing_schema_path, schema_path, db_path
+from ..lib.reference import REFDB_INFRASTRUCTURES
+
+
+class TestDrawingsBatch(unittest.TestCase):
+    def setUp(self):
+        try:
+            self.drawings_schema_path = drawing_schema_path()
+            self.schema_path = schema_path()
+            self.db_path = db_path()
+        except FileNotFoundError as err:
+            self.skipTest(err)
+        self.parameters = DrawingParameters.load(
+            DBDictsLoader({}), self.drawings_schema_path
+        )
+        self.db = RacksDB.load(schema=self.schema_path, db=self.db_path)
+
+    def test_drawer_class(self):
+        self.assertIs(
+            drawer_class("infrastructure", self.parameters), InfrastructureDrawer
+        )
+        self.assertIs(drawer_class("room", self.parameters), RoomDrawer)
+        parameters = DrawingParameters.load(
+            DBDictsLoader({"axonometric": {"enabled": True}}),
+            self.drawings_schema_path,
+        )
+        self.assertIs(
+            drawer_class("infrastructure", parameters),
+            AxonometricInfrastructureDrawer,
+        )
+        with self.assertRaisesRegex(RacksDBError, "^Unsupported entity fail to draw$"):
+            drawer_class("fail", self.parameters)
+
+    def test_drawings(self):
+        output = Path("/tmp/output")
+        batch = DrawingsBatch(
+            self.db,
+            self.parameters,
+            output,
+            entities=["infrastructure"],
+            formats=["png", "svg"],
+            coordinates_format="json",
+        )
+        self.assertEqual(len(batch.drawings), 2 * len(REFDB_INFRASTRUCTURES))
+        self.assertCountEqual(
+            {drawing.name for drawing in batch.drawings}, REFDB_INFRASTRUCTURES
+        )
+        drawing = batch.drawings[0]
+        self.assertEqual(
+            drawing.path, output / "infrastructure" / f"{drawing.name}.png"
+        )
+        self.assertEqual(
+            drawing.coordinates_path,
+            output / "infrastructure" / f"{drawing.name}.json",
+        )
+        # Coordinates are dumped with the first format only.
+        self.assertIsNone(batch.drawings[1].coordinates_path)
+
+    def test_drawings_all_entities(self):
+        batch = DrawingsBatch(self.db, self.parameters, Path("/tmp/output"))
+        self.assertEqual(
+            {drawing.entity for drawing in batch.drawings}, {"infrastructure", "room"}
+        )
+        self.assertEqual({drawing.format for drawing in batch.drawings}, {"png"})
+        self.assertIsNone(batch.drawings[0].coordinates_path)
+
+    def test_render(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            batch = DrawingsBatch(self.db, self.parameters, Path(tmpdir))
+            for drawing in batch.render():
+                self.assertIsNone(drawing.error)
+                self.assertIsInstance(drawing.duration, float)
+                self.assertTrue(drawing.path.exists())
+
+    def test_render_workers(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            batch = DrawingsBatch(
+                self.db,
+                self.parameters,
+                Path(tmpdir),
+                formats=["png", "pdf"],
+                coordinates_format="yaml",
+            )
+            for drawing in batch.render(workers=2):
+                self.assertIsNone(drawing.error)
+                self.assertTrue(drawing.path.exists())
+                if drawing.coordinates_path is not None:
+                    self.assertTrue(drawing.coordinates_path.exists())
+
+    def test_render_error(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            self.parameters.infrastructure.equipment_tags = "fail"
+            batch = DrawingsBatch(
+                self.db, self.parameters, Path(tmpdir), entities=["infrastructure"]
+            )
+            for drawing in batch.render():
+                self.assertEqual(
+                    drawing.error,
+                    "Unable to find racks to draw with filters provided in drawing "
+                    "parameters",
+                )
+                self.assertFalse(drawing.path.exists())
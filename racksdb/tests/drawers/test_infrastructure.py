@@ -156,3 +156,35 @@ class TestInfrastructureDrawer(unittest.TestCase):
             ):
                 drawer.draw()
             self.assertFalse(filename.exists())
+
+    def test_layout(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            filename = Path(tmpdir) / "output.png"
+            drawer = InfrastructureDrawer(
+                self.db, "mercury", filename, "png", self.parameters, None, "yaml"
+            )
+            drawer.draw()
+            # Positions of all drawn racks and rows are computed once in layout.
+            self.assertCountEqual(
+                drawer.racks_dl.keys(), [rack.name for rack in drawer.racks]
+            )
+            self.assertCountEqual(drawer.rows_dl.keys(), drawer.rack_rows)
+            for row in drawer.rack_rows:
+                layout = drawer._rack_row_layout(row)
+                self.assertIs(layout, drawer._rack_row_layout(row))
+                # Racks in row are placed from left to right by slot, in reverse
+                # order for reversed rows.
+                racks = [rack for rack in drawer.racks if rack.row is row]
+                for rack in racks:
+                    for other in racks:
+                        if (other.slot < rack.slot) != row.reversed and (
+                            other.slot != rack.slot
+                        ):
+                            self.assertLess(
+                                drawer._rack_dl(other).x, drawer._rack_dl(rack).x
+                            )
+            # Returned positions are copies that can be modified by callers.
+            rack = drawer.racks[0]
+            dl = drawer._rack_dl(rack)
+            dl.x += 1000
+            self.assertNotEqual(drawer._rack_dl(rack).x, dl.x)
@@ -12,6 +12,7 @@ import tempfile
 from racksdb.generic.db import DBDictsLoader, DBSplittedFilesLoader
 from racksdb.drawers.parameters import DrawingParameters
 from racksdb.generic.errors import DBFormatError
+from racksdb.generic.schema import Schema
 from ..lib.common import drawing_schema_path
 
 
@@ -19,6 +20,19 @@ class TestRacksDBDrawingParameters(unittest.TestCase):
     def test_load(self):
         DrawingParameters.load(DBDictsLoader(), drawing_schema_path())
 
+    def test_load_schema(self):
+        schema = DrawingParameters.load_schema(drawing_schema_path())
+        self.assertIsInstance(schema, Schema)
+        # Multiple parameters can be loaded with the same schema.
+        parameters1 = DrawingParameters.load(DBDictsLoader(), schema)
+        parameters2 = DrawingParameters.load(
+            DBDictsLoader({"dimensions": {"width": 800}}), schema
+        )
+        self.assertIs(parameters1._schema, schema)
+        self.assertIs(parameters2._schema, schema)
+        self.assertEqual(parameters1.dimensions.width, 1200)
+        self.assertEqual(parameters2.dimensions.width, 800)
+
     def test_load_ext_yaml(self):
         with tempfile.TemporaryDirectory() as tmpdir:
             drawing_parameters_db_path = Path(tmpdir) / "params.yaml"
@@ -0,0 +1,77 @@
+# Copyright (c) 2026 Rackslab
+#
+# This file is part of RacksDB.
+#
+# SPDX-License-Identifier: MIT
+
+import unittest
+import tempfile
+from pathlib import Path
+
+from racksdb import RacksDB
+from racksdb.drawers.room import RoomDrawer
+from racksdb.drawers.parameters import DrawingParameters
+from racksdb.generic.db import DBDictsLoader
+from racksdb.errors import RacksDBDrawingError
+
+from ..lib.common import drawing_schema_path, schema_path, db_path
+
+
+class TestRoomDrawer(unittest.TestCase):
+    def setUp(self):
+        try:
+            self.drawings_schema_path = drawing_schema_path()
+            self.schema_path = schema_path()
+            self.db_path = db_path()
+        except FileNotFoundError as err:
+            self.skipTest(err)
+        self.parameters = DrawingParameters.load(
+            DBDictsLoader({}), self.drawings_schema_path
+        )
+        self.db = RacksDB.load(schema=self.schema_path, db=self.db_path)
+
+    def test_draw_png(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            filename = Path(tmpdir) / "output.png"
+            drawer = RoomDrawer(
+                self.db, "noisy", filename, "png", self.parameters, None, "yaml"
+            )
+            drawer.draw()
+            self.assertTrue(filename.exists())
+
+    def test_draw_not_existing_room(self):
+        with self.assertRaisesRegex(
+            RacksDBDrawingError, "^Unable to find room fail in database$"
+        ):
+            RoomDrawer(self.db, "fail", "output", "png", self.parameters, None, "yaml")
+
+    def test_rack_tl(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            filename = Path(tmpdir) / "output.png"
+            drawer = RoomDrawer(
+                self.db, "noisy", filename, "png", self.parameters, None, "yaml"
+            )
+            drawer.draw()
+        racks = {rack.name: rack for row in drawer.room.rows for rack in row.racks}
+
+        def width(rack_type):
+            return int(rack_type.width * drawer.ratio)
+
+        # Row R3 has racks R3-A[01-05] in slots 2-6 and R3-A[07-10] in slots 9-12.
+        # Empty slots 0 and 1 are filled with the width of the first rack type, empty
+        # slots 7 and 8 are filled with the width of the rack in slot 6.
+        default_width = width(self.db.types.racks.first())
+        self.assertEqual(drawer._rack_tl(racks["R3-A01"]).x, 2 * default_width)
+        self.assertEqual(
+            drawer._rack_tl(racks["R3-A02"]).x,
+            drawer._rack_tl(racks["R3-A01"]).x + width(racks["R3-A01"].type),
+        )
+        self.assertEqual(
+            drawer._rack_tl(racks["R3-A07"]).x,
+            drawer._rack_tl(racks["R3-A05"]).x + 3 * width(racks["R3-A05"].type),
+        )
+        # Offsets are computed once per row.
+        self.assertIs(
+            drawer._racks_row_offsets(racks["R3-A01"].row),
+            drawer._racks_row_offsets(racks["R3-A07"].row),
+        )
@@ -53,3 +53,43 @@ class TestDBDumperJSON(unittest.TestCase):
         result = dumper.dump(db.bananas)
         bananas = json.loads(result)
         self.assertNotIn("origin", bananas[0]["species"][0])
+
+    def test_stream(self):
+        db = valid_db()
+        for dumper, obj in [
+            (DBDumperJSON(), db.apples),
+            (DBDumperJSON(), db.stock),
+            (DBDumperJSON(fold=False), db.stock),
+            (DBDumperJSON(), db.stock.content),
+            (DBDumperJSON(fold=False), db.stock.content),
+            (DBDumperJSON(objects_map={"TestBananaOrigin": "origin"}), db.bananas),
+            (DBDumperJSON(objects_map={"TestBananaOrigin": None}), db.bananas),
+        ]:
+            self.assertEqual("".join(dumper.stream(obj)), dumper.dump(obj))
+
+    def test_stream_iterator(self):
+        db = valid_db()
+        for dumper in [DBDumperJSON(), DBDumperJSON(fold=False)]:
+            # Values of iterator are dumped as a list.
+            self.assertEqual(
+                "".join(dumper.stream(db.stock.content.iter_filter())),
+                dumper.dump(db.stock.content.filter()),
+            )
+            self.assertEqual(
+                dumper.dump(db.stock.content.iter_filter()),
+                dumper.dump(db.stock.content.filter()),
+            )
+
+    def test_stream_chunks(self):
+        db = valid_db()
+        dumper = DBDumperJSON(fold=False)
+        chunks = list(dumper.stream(db.stock, chunk_size=16))
+        self.assertGreater(len(chunks), 1)
+        self.assertEqual("".join(chunks), dumper.dump(db.stock))
+
+    def test_stream_recursion(self):
+        db = valid_db()
+        dumper = DBDumperJSON()
+        # Check recursion error is raised
+        with self.assertRaisesRegex(ValueError, "Circular reference detected"):
+            "".join(dumper.stream(db.bananas))
@@ -0,0 +1,78 @@
+# Copyright (c) 2026 Rackslab
+#
+# This file is part of RacksDB.
+#
+# SPDX-License-Identifier: MIT
+
+import unittest
+import json
+
+from racksdb.generic.dumpers.json import DBDumperJSON
+from racksdb.generic.dumpers.ndjson import DBDumperNDJSON
+
+from ..lib.common import valid_db
+
+
+class TestDBDumperNDJSON(unittest.TestCase):
+    def test_dump_list(self):
+        db = valid_db()
+        dumper = DBDumperNDJSON()
+        result = dumper.dump(db.apples)
+        self.assertTrue(result.endswith("\n"))
+        lines = result.splitlines()
+        self.assertEqual(len(lines), len(db.apples))
+        self.assertEqual(
+            [json.loads(line) for line in lines],
+            json.loads(DBDumperJSON().dump(db.apples)),
+        )
+
+    def test_dump_folded(self):
+        db = valid_db()
+        dumper = DBDumperNDJSON()
+        result = dumper.dump(db.stock.content)
+        # Expandable objects are not expanded
+        lines = result.splitlines()
+        self.assertEqual(len(lines), len(list(db.stock.content.itervalues())))
+        self.assertEqual(json.loads(lines[0])["name"], "crate[01-10]")
+
+    def test_dump_expanded(self):
+        db = valid_db()
+        dumper = DBDumperNDJSON(fold=False)
+        result = dumper.dump(db.stock.content)
+        self.assertEqual(
+            [json.loads(line) for line in result.splitlines()],
+            json.loads(DBDumperJSON(fold=False).dump(db.stock.content)),
+        )
+
+    def test_dump_names(self):
+        dumper = DBDumperNDJSON()
+        self.assertEqual(dumper.dump(["foo", "bar"]), '"foo"\n"bar"\n')
+
+    def test_dump_object(self):
+        db = valid_db()
+        dumper = DBDumperNDJSON()
+        result = dumper.dump(db.apples.first())
+        self.assertEqual(len(result.splitlines()), 1)
+
+    def test_stream(self):
+        db = valid_db()
+        dumper = DBDumperNDJSON(fold=False)
+        lines = list(dumper.stream(db.stock.content))
+        self.assertEqual(len(lines), len(db.stock.content))
+        self.assertEqual("".join(lines), dumper.dump(db.stock.content))
+
+    def test_stream_iterator(self):
+        db = valid_db()
+        dumper = DBDumperNDJSON(fold=False)
+        # Values of iterator are dumped one per line, as values of a list.
+        self.assertEqual(
+            "".join(dumper.stream(db.stock.content.iter_filter())),
+            dumper.dump(db.stock.content.filter()),
+        )
+
+    def test_dump_recursion(self):
+        db = valid_db()
+        dumper = DBDumperNDJSON()
+        # Check recursion error is raised
+        with self.assertRaisesRegex(ValueError, "Circular reference detected"):
+            dumper.dump(db.bananas)
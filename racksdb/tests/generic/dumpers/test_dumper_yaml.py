@@ -9,6 +9,9 @@ import unittest
 import yaml
 
 from racksdb.generic.dumpers.yaml import DBDumperYAML, SchemaDumperYAML
+from racksdb.generic import yamlbackend
+from racksdb.generic.db import DBObject, DBDict
+from racksdb.generic.definedtype import SchemaDefinedType
 
 from ..lib.common import valid_db, valid_schema
 
@@ -39,6 +42,26 @@ class TestDBDumperYAML(unittest.TestCase):
         stock = yaml.safe_load(result)
         self.assertEqual(len(stock["content"]), 20)
 
+    def test_dump_multiple_dumpers(self):
+        db = valid_db()
+        # Representations depend on the state of the dumper used for the dump,
+        # independently of other instanciated dumpers.
+        expanded_dumper = DBDumperYAML(fold=False)
+        folded_dumper = DBDumperYAML()
+        stock = yaml.safe_load(expanded_dumper.dump(db.stock))
+        self.assertEqual(len(stock["content"]), 20)
+        stock = yaml.safe_load(folded_dumper.dump(db.stock))
+        self.assertEqual(len(stock["content"]), 2)
+
+    def test_dump_backend_dumper_untouched(self):
+        db = valid_db()
+        DBDumperYAML().dump(db.stock)
+        # Representers must not be registered on backend Dumper shared with other
+        # dumpers.
+        self.assertNotIn(DBDict, yamlbackend.Dumper.yaml_representers)
+        self.assertNotIn(DBObject, yamlbackend.Dumper.yaml_multi_representers)
+        self.assertFalse(yamlbackend.Dumper(None).ignore_aliases([]))
+
     def test_dump_recursion(self):
         db = valid_db()
         dumper = DBDumperYAML()
@@ -72,3 +95,4 @@ class TestSchemaDumperYAML(unittest.TestCase):
     def test_dump(self):
         result = SchemaDumperYAML().dump(valid_schema())
         yaml.safe_load(result)
+        self.assertNotIn(SchemaDefinedType, yamlbackend.Dumper.yaml_multi_representers)
@@ -8,6 +8,7 @@ import unittest
 
 from racksdb.generic.dumpers import DBDumperFactory, SchemaDumperFactory
 from racksdb.generic.dumpers.json import DBDumperJSON
+from racksdb.generic.dumpers.ndjson import DBDumperNDJSON
 from racksdb.generic.dumpers.yaml import DBDumperYAML, SchemaDumperYAML
 from racksdb.generic.dumpers.console import DBDumperConsole
 from racksdb.generic.errors import DBDumperError
@@ -16,6 +17,7 @@ from racksdb.generic.errors import DBDumperError
 class TestDBDumperFactory(unittest.TestCase):
     def test_get(self):
         self.assertIs(DBDumperFactory.get("json"), DBDumperJSON)
+        self.assertIs(DBDumperFactory.get("ndjson"), DBDumperNDJSON)
         self.assertIs(DBDumperFactory.get("yaml"), DBDumperYAML)
         self.assertIs(DBDumperFactory.get("console"), DBDumperConsole)
 
@@ -6,6 +6,8 @@
 
 
 class TestAppleCrateBase:
+    __slots__ = ()
+
     def _filter(self, quantity_min=None):
         if quantity_min and quantity_min > self.quantity:
             return False
@@ -13,6 +15,8 @@ class TestAppleCrateBase:
 
 
 class TestAppleBase:
+    __slots__ = ()
+
     def _filter(self, color=None):
         if color and color != self.color:
             return False
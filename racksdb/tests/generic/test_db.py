@@ -6,8 +6,17 @@
 
 import unittest
 import copy
+import types
 
-from racksdb.generic.db import DBDictsLoader, GenericDB, DBDict
+from racksdb.generic.db import (
+    DBDictsLoader,
+    GenericDB,
+    DBDict,
+    DBExpandableObject,
+    DBExpandedObject,
+    DBReferencesIndex,
+    expanded_cached_property,
+)
 from racksdb.generic.errors import DBFormatError
 
 from .lib.common import valid_schema, VALID_DB
@@ -130,3 +139,153 @@ class TestGenericDB(unittest.TestCase):
         # FIXME: should raise DBFormatError instead of
         # ClusterShell.NodeSet.NodeSetParseRangeError
         # self.db.load(loader)
+
+    def test_not_unique_expandable_key(self):
+        schema = valid_schema()
+        schema.objects["AppleCrate"].prop("name").key = True
+        db = GenericDB("Test", schema, bases)
+        content = copy.deepcopy(VALID_DB)
+        content["stock"]["content"].append(
+            {"name": "crate[15-25]", "id": 121, "species": "golden", "quantity": 5},
+        )
+        loader = DBDictsLoader(content)
+        with self.assertRaisesRegex(
+            DBFormatError,
+            r"Key value crate\[15-25\] of SchemaAppleCrate\+ is not unique, "
+            r"crate\[15-20\] already defined.",
+        ):
+            db.load(loader)
+
+    def test_find_object(self):
+        self.db.load(DBDictsLoader(VALID_DB))
+        self.assertEqual(self.db.find_object("Apple", "golden").color, "yellow")
+        with self.assertRaises(KeyError):
+            self.db.find_object("Apple", "fail")
+        with self.assertRaises(KeyError):
+            self.db.find_object("Fail", "golden")
+
+    def test_find_object_expanded_member(self):
+        schema = valid_schema()
+        schema.objects["AppleCrate"].prop("name").key = True
+        db = GenericDB("Test", schema, bases)
+        db.load(DBDictsLoader(VALID_DB))
+        crate = db.find_object("AppleCrate", "crate17")
+        self.assertIsInstance(crate, DBExpandedObject)
+        self.assertEqual(crate.name, "crate17")
+        self.assertIsInstance(crate._expandable, DBExpandableObject)
+        self.assertEqual(str(crate._expandable.name), "crate[11-20]")
+        with self.assertRaises(KeyError):
+            db.find_object("AppleCrate", "crate21")
+
+    def test_references_index(self):
+        self.db.load(DBDictsLoader(VALID_DB))
+        crates = list(self.db.stock.content.itervalues())
+        # Expandable objects are indexed by their range value
+        index = DBReferencesIndex("name")
+        index.update(crates)
+        self.assertEqual(index.get("crate15"), (crates[1], 4))
+        self.assertEqual(index.get("crate01"), (crates[0], 0))
+        with self.assertRaises(KeyError):
+            index.get("crate21")
+        # Expandable objects are indexed by the start of their rangeid value
+        index = DBReferencesIndex("id")
+        index.update(crates)
+        self.assertEqual(index.get(115), (crates[1], 4))
+        self.assertEqual(index.get(110), (crates[0], 9))
+        for value in [100, 121]:
+            with self.assertRaises(KeyError):
+                index.get(value)
+        # Members of expandable objects are not enumerated
+        self.assertEqual(index.values, {})
+        # Non-expandable objects are indexed by their value
+        apples = list(self.db.apples.values())
+        index = DBReferencesIndex("name")
+        index.update(apples)
+        self.assertEqual(index.get("golden"), (self.db.apples["golden"], None))
+
+    def test_classes_cache(self):
+        self.db.load(DBDictsLoader(VALID_DB))
+        apples = list(self.db.apples.values())
+        self.assertIs(type(apples[0]), type(apples[1]))
+        self.assertEqual(type(apples[0]).__name__, "TestApple")
+        crates = list(self.db.stock.content.itervalues())
+        self.assertIs(type(crates[0]), type(crates[1]))
+        self.assertEqual(type(crates[0]).__name__, "TestExpandableAppleCrate")
+        self.assertIs(type(crates[0].name), type(crates[1].name))
+        self.assertEqual(type(crates[0].name).__name__, "TestExpandableRange")
+        # Expanded objects are instances of the class of non-expandable objects.
+        expanded = crates[0].objects()
+        self.assertIs(type(expanded[0]), type(expanded[1]))
+        self.assertIs(type(expanded[0]), self.db.expanded_class("AppleCrate"))
+        self.assertEqual(type(expanded[0]).__name__, "TestAppleCrate")
+
+    def test_expanded_objects_bases_without_slots(self):
+        class TestAppleCrateBase:
+            pass
+
+        db = GenericDB(
+            "Test",
+            valid_schema(),
+            types.SimpleNamespace(TestAppleCrateBase=TestAppleCrateBase),
+        )
+        with self.assertLogs("racksdb.generic.db", level="WARNING") as logs:
+            db.load(DBDictsLoader(VALID_DB))
+            crate = next(db.stock.content.itervalues()).member(4)
+        self.assertIn("do not declare __slots__", logs.output[0])
+        self.assertIn("TestAppleCrateBase", logs.output[0])
+        # Expanded objects still work, with an instance dict.
+        self.assertTrue(hasattr(crate, "__dict__"))
+        self.assertEqual(crate.name, "crate05")
+
+    def test_expanded_cached_property(self):
+        calls = []
+
+        class TestAppleCrateBase:
+            __slots__ = ()
+
+            @expanded_cached_property
+            def label(self):
+                calls.append(self.name)
+                return f"label-{self.name}"
+
+        db = GenericDB(
+            "Test",
+            valid_schema(),
+            types.SimpleNamespace(TestAppleCrateBase=TestAppleCrateBase),
+        )
+        db.load(DBDictsLoader(VALID_DB))
+        crates = next(db.stock.content.itervalues())
+        # Values are cached by index for all instances of expanded objects.
+        self.assertEqual(crates.member(4).label, "label-crate05")
+        self.assertEqual(crates.member(4).label, "label-crate05")
+        self.assertEqual(crates.member(5).label, "label-crate06")
+        self.assertEqual(calls, ["crate05", "crate06"])
+        # Values are computed again after caches are dropped.
+        db.drop_caches()
+        self.assertEqual(crates.member(4).label, "label-crate05")
+        self.assertEqual(calls, ["crate05", "crate06", "crate05"])
+
+    def test_expanded_objects(self):
+        self.db.load(DBDictsLoader(VALID_DB))
+        crates = self.db.stock.content.itervalues().__next__()
+        expanded = crates.objects()
+        self.assertEqual(len(expanded), 10)
+        crate = expanded[4]
+        # Expanded objects only reference their expandable object and their index in
+        # slots, without instance dict, the attributes are delegated to the
+        # expandable object.
+        self.assertFalse(hasattr(crate, "__dict__"))
+        with self.assertRaises(AttributeError):
+            crate.fail = True
+        self.assertIs(crate._expandable, crates)
+        self.assertEqual(crate._index, 4)
+        self.assertEqual(crate.name, "crate05")
+        self.assertEqual(crate.id, 105)
+        self.assertEqual(crate.quantity, 30)
+        self.assertIs(crate._db, self.db)
+        self.assertEqual(crate._first.name, "crate01")
+        self.assertIs(expanded[0]._first, expanded[0])
+        with self.assertRaisesRegex(
+            AttributeError, "'TestAppleCrate' object has no attribute 'fail'"
+        ):
+            crate.fail
@@ -51,6 +51,10 @@ class TestDBDict(unittest.TestCase):
         first = self.db.apples.first()
         self.assertEqual(first.__class__.__name__, "TestApple")
 
+    def test_first_empty(self):
+        with self.assertRaises(IndexError):
+            DBDict().first()
+
 
 class TestDBDictExpandable(unittest.TestCase):
     def setUp(self):
@@ -69,6 +73,20 @@ class TestDBDictExpandable(unittest.TestCase):
         selected = self.expandable_dict.filter(quantity_min=5)
         self.assertEqual(len(selected), 20)
 
+    def test_expandable_iter_filter(self):
+        selected = self.expandable_dict.iter_filter(quantity_min=15)
+        self.assertNotIsInstance(selected, DBDict)
+        self.assertEqual(
+            [crate.name for crate in selected],
+            [f"crate{index:02d}" for index in range(1, 11)],
+        )
+
+    def test_expandable_filter_keys(self):
+        selected = self.expandable_dict.filter(quantity_min=15)
+        self.assertCountEqual(
+            selected.keys(), [f"crate{index:02d}" for index in range(1, 11)]
+        )
+
     def test_expandable_iter(self):
         nb = 0
         for item in self.expandable_dict:
@@ -83,3 +101,48 @@ class TestDBDictExpandable(unittest.TestCase):
 
     def test_expandable_first(self):
         self.assertEqual(self.expandable_dict.first().name, "crate01")
+
+    def test_expandable_getitem_index(self):
+        crate = self.expandable_dict["crate15"]
+        self.assertEqual(crate.name, "crate15")
+        self.assertEqual(crate.id, 115)
+        self.assertEqual(crate._first.name, "crate11")
+
+    def test_expandable_getitem_not_found(self):
+        for key in ["crate2", "crate00", "crate21", "crate015", "fail"]:
+            with self.assertRaisesRegex(KeyError, key):
+                self.expandable_dict[key]
+
+    def test_expandable_getitem_updated(self):
+        self.assertEqual(self.expandable_dict["crate02"].name, "crate02")
+        key = list(self.expandable_dict.keys())[0]
+        crates = self.expandable_dict.pop(key)
+        with self.assertRaisesRegex(KeyError, "crate02"):
+            self.expandable_dict["crate02"]
+        self.expandable_dict[key] = crates
+        self.assertEqual(self.expandable_dict["crate02"].name, "crate02")
+
+
+class TestDBObjectRange(unittest.TestCase):
+    def test_member_index(self):
+        for rangeset in [
+            "cn[8-12,15],cn[01-03]",
+            "cn[098-101]",
+            "rack[1-2]-node[1-4]",
+            "sw[1-4]-ib",
+            "srv,cn[1-2]",
+        ]:
+            _range = DBObjectRange(rangeset)
+            for index, member in enumerate(_range.expanded()):
+                self.assertEqual(_range.member(index), member)
+                self.assertEqual(_range.index(member), index)
+
+    def test_index_not_found(self):
+        _range = DBObjectRange("cn[098-101],cn[1-2]")
+        for member in ["cn98", "cn0100", "cn3", "cn01", "srv"]:
+            with self.assertRaisesRegex(KeyError, member):
+                _range.index(member)
+
+    def test_member_out_of_range(self):
+        with self.assertRaises(IndexError):
+            DBObjectRange("cn[1-2]").member(2)
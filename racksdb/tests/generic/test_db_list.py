@@ -37,3 +37,17 @@ class TestDBList(unittest.TestCase):
         self.assertEqual(len(selected), 10)
         selected = self.db.stock.content.filter(quantity_min=5)
         self.assertEqual(len(selected), 20)
+
+    def test_iter_filter(self):
+        selected = self.db.stock.content.iter_filter(quantity_min=15)
+        self.assertNotIsInstance(selected, DBList)
+        self.assertEqual(
+            [crate.name for crate in selected],
+            [f"crate{index:02d}" for index in range(1, 11)],
+        )
+
+    def test_first(self):
+        self.assertEqual(self.db.stock.content.first().name, "crate01")
+        self.assertEqual(DBList(["a", "b"]).first(), "a")
+        with self.assertRaises(IndexError):
+            DBList().first()
@@ -18,6 +18,7 @@ from racksdb.generic.db import (
     DBStdinLoader,
     DBStringLoader,
     GenericDB,
+    _load_db_file,
 )
 from racksdb.generic.errors import DBFormatError
 
@@ -25,6 +26,7 @@ from .lib.common import VALID_DB, valid_schema
 from .lib import bases
 
 COMPOSER_ERROR_STR = "*fail:{:"
+SYNTAX_ERROR_STR = "- foo: [unclosed"
 
 
 class TestDBLoaderBase(unittest.TestCase):
@@ -65,36 +67,95 @@ class TestDBFileLoader(TestDBLoaderBase):
         with self.assertRaisesRegex(DBFormatError, "^found undefined alias .*"):
             DBFileLoader(Path(self.tmp.name))
 
+    def test_load_syntax_error(self):
+        self.write_db_file(SYNTAX_ERROR_STR)
+        with self.assertRaisesRegex(DBFormatError, "^while parsing a flow sequence"):
+            DBFileLoader(Path(self.tmp.name))
+
 
 class TestDBSplittedFilesLoader(TestDBLoaderBase):
+    def write_db_tree(self, tmpdir):
+        # Split VALID_DB in multiple files in the directory.
+        (tmpdir / "apples").mkdir()
+        for apple in VALID_DB["apples"]:
+            with open(tmpdir / "apples" / f"{apple['name']}.yaml", "w+") as fh:
+                fh.write(
+                    yaml.dump(
+                        {key: value for key, value in apple.items() if key != "name"}
+                    )
+                )
+        with open(tmpdir / "pear.yaml", "w+") as fh:
+            fh.write(yaml.dump(VALID_DB["pear"]))
+        (tmpdir / "bananas.l").mkdir()
+        for banana in VALID_DB["bananas"]:
+            with open(tmpdir / "bananas.l" / f"{banana['origin']}.yaml", "w+") as fh:
+                fh.write(yaml.dump(banana))
+        with open(tmpdir / "stock.yaml", "w+") as fh:
+            fh.write(yaml.dump(VALID_DB["stock"]))
+
     def test_load(self):
-        # Split VALID_DB in multiple files and load the directory.
         with tempfile.TemporaryDirectory() as _tmpdir:
             tmpdir = Path(_tmpdir)
-            (tmpdir / "apples").mkdir()
-            for apple in VALID_DB["apples"]:
-                with open(tmpdir / "apples" / f"{apple['name']}.yaml", "w+") as fh:
-                    fh.write(
-                        yaml.dump(
-                            {
-                                key: value
-                                for key, value in apple.items()
-                                if key != "name"
-                            }
-                        )
-                    )
-            with open(tmpdir / "pear.yaml", "w+") as fh:
-                fh.write(yaml.dump(VALID_DB["pear"]))
-            (tmpdir / "bananas.l").mkdir()
-            for banana in VALID_DB["bananas"]:
-                with open(
-                    tmpdir / "bananas.l" / f"{banana['origin']}.yaml", "w+"
-                ) as fh:
-                    fh.write(yaml.dump(banana))
-            with open(tmpdir / "stock.yaml", "w+") as fh:
-                fh.write(yaml.dump(VALID_DB["stock"]))
+            self.write_db_tree(tmpdir)
             self.assertLoaderContent(DBSplittedFilesLoader(tmpdir))
 
+    def test_load_parallel(self):
+        with tempfile.TemporaryDirectory() as _tmpdir:
+            tmpdir = Path(_tmpdir)
+            self.write_db_tree(tmpdir)
+            loader = DBSplittedFilesLoader(tmpdir, workers=2)
+            self.assertLoaderContent(loader)
+            self.assertEqual(loader.content, DBSplittedFilesLoader(tmpdir).content)
+
+    def test_load_sorted(self):
+        with tempfile.TemporaryDirectory() as _tmpdir:
+            tmpdir = Path(_tmpdir)
+            self.write_db_tree(tmpdir)
+            loader = DBSplittedFilesLoader(tmpdir)
+            self.assertEqual(loader.files, sorted(loader.files))
+            self.assertEqual(
+                [banana["origin"] for banana in loader.content["bananas"]],
+                sorted(banana["origin"] for banana in VALID_DB["bananas"]),
+            )
+
+    def test_load_previous(self):
+        with tempfile.TemporaryDirectory() as _tmpdir:
+            tmpdir = Path(_tmpdir)
+            self.write_db_tree(tmpdir)
+            previous = DBSplittedFilesLoader(tmpdir)
+            with open(tmpdir / "pear.yaml", "w+") as fh:
+                fh.write(yaml.dump({**VALID_DB["pear"], "variety": "conference"}))
+            with mock.patch(
+                "racksdb.generic.db._load_db_file", wraps=_load_db_file
+            ) as load_mock:
+                loader = DBSplittedFilesLoader(tmpdir, previous=previous)
+            # Only the modified file is parsed again, content of other files is
+            # reused.
+            load_mock.assert_called_once_with(tmpdir / "pear.yaml")
+            self.assertLoaderContent(loader)
+            self.assertEqual(loader.content["pear"]["variety"], "conference")
+            self.assertIs(loader.content["stock"], previous.content["stock"])
+
+    def test_load_parallel_composer_error(self):
+        with tempfile.TemporaryDirectory() as _tmpdir:
+            tmpdir = Path(_tmpdir)
+            self.write_db_tree(tmpdir)
+            with open(tmpdir / "pear.yaml", "w+") as fh:
+                fh.write(COMPOSER_ERROR_STR)
+            with self.assertRaisesRegex(DBFormatError, "^found undefined alias .*"):
+                DBSplittedFilesLoader(tmpdir, workers=2)
+
+    def test_load_parallel_syntax_error(self):
+        with tempfile.TemporaryDirectory() as _tmpdir:
+            tmpdir = Path(_tmpdir)
+            self.write_db_tree(tmpdir)
+            with open(tmpdir / "pear.yaml", "w+") as fh:
+                fh.write(SYNTAX_ERROR_STR)
+            with self.assertRaisesRegex(
+                DBFormatError, "^while parsing a flow sequence"
+            ):
+                DBSplittedFilesLoader(tmpdir, workers=2)
+
     def test_load_path_not_found(self):
         with self.assertRaisesRegex(DBFormatError, "DB path /dev/fail does not exist"):
             DBSplittedFilesLoader(Path("/dev/fail"))
@@ -121,6 +182,13 @@ class TestDBStdinLoader(TestDBLoaderBase):
             with self.assertRaisesRegex(DBFormatError, "^found undefined alias .*"):
                 DBStdinLoader()
 
+    def test_load_syntax_error(self):
+        with mock.patch("sys.stdin", new=io.StringIO(SYNTAX_ERROR_STR)):
+            with self.assertRaisesRegex(
+                DBFormatError, "^while parsing a flow sequence"
+            ):
+                DBStdinLoader()
+
 
 class TestDBStringLoader(TestDBLoaderBase):
     def test_load(self):
@@ -135,3 +203,7 @@ class TestDBStringLoader(TestDBLoaderBase):
     def test_load_composer_error(self):
         with self.assertRaisesRegex(DBFormatError, "^found undefined alias .*"):
             DBStringLoader(COMPOSER_ERROR_STR)
+
+    def test_load_syntax_error(self):
+        with self.assertRaisesRegex(DBFormatError, "^while parsing a flow sequence"):
+            DBStringLoader(SYNTAX_ERROR_STR)
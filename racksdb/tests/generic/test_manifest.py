@@ -0,0 +1,92 @@
+# Copyright (c) 2026 Rackslab
+#
+# This file is part of RacksDB.
+#
+# SPDX-License-Identifier: MIT
+
+import unittest
+import os
+import tempfile
+from pathlib import Path
+
+from racksdb.generic.manifest import DBManifest
+
+
+class TestDBManifest(unittest.TestCase):
+    def setUp(self):
+        self._tmpdir = tempfile.TemporaryDirectory()
+        self.tmpdir = Path(self._tmpdir.name)
+        self.db = self.tmpdir / "db"
+        (self.db / "fruits.l").mkdir(parents=True)
+        for name in ["pear", "apple", "banana"]:
+            with open(self.db / "fruits.l" / f"{name}.yml", "w+") as fh:
+                fh.write(f"name: {name}\n")
+        with open(self.db / "stock.yml", "w+") as fh:
+            fh.write("quantity: 1\n")
+        self.schema = self.tmpdir / "schema.yml"
+        with open(self.schema, "w+") as fh:
+            fh.write("_content: {}\n")
+
+    def tearDown(self):
+        self._tmpdir.cleanup()
+
+    def manifest(self):
+        return DBManifest([self.schema, self.tmpdir / "fail", self.db])
+
+    def touch(self, path):
+        stat = path.stat()
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+    def test_files(self):
+        manifest = self.manifest()
+        self.assertEqual(
+            manifest.files,
+            [
+                str(self.db / "fruits.l" / "apple.yml"),
+                str(self.db / "fruits.l" / "banana.yml"),
+                str(self.db / "fruits.l" / "pear.yml"),
+                str(self.db / "stock.yml"),
+                str(self.schema),
+            ],
+        )
+        self.assertFalse(manifest.changed())
+        self.assertEqual(manifest.modified(), [])
+
+    def test_touched(self):
+        manifest = self.manifest()
+        self.touch(self.db / "stock.yml")
+        self.assertTrue(manifest.changed())
+        # Same content, the file is not considered modified.
+        self.assertEqual(manifest.modified(), [])
+        self.assertEqual(manifest.digest, self.manifest().digest)
+
+    def test_modified(self):
+        manifest = self.manifest()
+        path = self.db / "fruits.l" / "pear.yml"
+        with open(path, "w+") as fh:
+            fh.write("name: peer\n")
+        self.touch(path)
+        self.assertTrue(manifest.changed())
+        self.assertEqual(manifest.modified(), [str(path)])
+        self.assertNotEqual(manifest.digest, self.manifest().digest)
+
+    def test_added_removed(self):
+        manifest = self.manifest()
+        added = self.db / "fruits.l" / "cherry.yml"
+        with open(added, "w+") as fh:
+            fh.write("name: cherry\n")
+        removed = self.db / "stock.yml"
+        removed.unlink()
+        self.assertTrue(manifest.changed())
+        self.assertEqual(manifest.modified(), [str(added), str(removed)])
+
+    def test_restore_entries(self):
+        manifest = self.manifest()
+        restored = DBManifest(manifest.paths, manifest.entries)
+        self.assertEqual(restored.files, manifest.files)
+        self.assertEqual(restored.digest, manifest.digest)
+        self.assertFalse(restored.changed())
+        with open(self.schema, "w+") as fh:
+            fh.write("_content: {properties: {}}\n")
+        self.assertTrue(restored.changed())
+        self.assertEqual(restored.modified(), [str(self.schema)])
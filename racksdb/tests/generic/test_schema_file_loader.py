@@ -24,6 +24,15 @@ class TestSchemaFileLoader(unittest.TestCase):
             loader = SchemaFileLoader(Path(tmpfile.name))
             self.assertIsInstance(loader.content, dict)
 
+    def test_syntax_error(self):
+        with tempfile.NamedTemporaryFile() as tmpfile:
+            with open(tmpfile.name, "w+") as fh:
+                fh.write("- foo: [unclosed")
+            with self.assertRaisesRegex(
+                DBSchemaError, "^while parsing a flow sequence"
+            ):
+                SchemaFileLoader(Path(tmpfile.name)).content
+
     def test_file_not_found(self):
         loader = SchemaFileLoader(Path("/dev/fail"))
         with self.assertRaisesRegex(
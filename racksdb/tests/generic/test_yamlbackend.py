@@ -0,0 +1,46 @@
+# Copyright (c) 2026 Rackslab
+#
+# This file is part of RacksDB.
+#
+# SPDX-License-Identifier: MIT
+
+import unittest
+import tempfile
+
+import yaml
+
+from racksdb.generic import yamlbackend
+
+from .lib.common import VALID_DB
+
+
+class TestYAMLBackend(unittest.TestCase):
+    def test_load_string(self):
+        self.assertEqual(yamlbackend.load(yaml.dump(VALID_DB)), VALID_DB)
+
+    def test_load_stream(self):
+        with tempfile.TemporaryFile("w+") as fh:
+            fh.write(yaml.dump(VALID_DB))
+            fh.seek(0)
+            self.assertEqual(yamlbackend.load(fh), VALID_DB)
+
+    def test_load_unsafe(self):
+        with self.assertRaises(yaml.constructor.ConstructorError):
+            yamlbackend.load("!!python/object/apply:os.system ['true']")
+
+    def test_load_error_detailed(self):
+        # Errors must be as detailed as errors reported by pure Python
+        # implementation.
+        with tempfile.NamedTemporaryFile("w+") as fh:
+            fh.write("*fail")
+            fh.seek(0)
+            with self.assertRaisesRegex(
+                yaml.composer.ComposerError,
+                f"^found undefined alias 'fail'\\n  in \"{fh.name}\"",
+            ):
+                yamlbackend.load(fh)
+
+    def test_dump(self):
+        self.assertEqual(
+            yamlbackend.dump(VALID_DB), yaml.dump(VALID_DB, Dumper=yaml.Dumper)
+        )
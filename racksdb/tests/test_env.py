@@ -37,3 +37,10 @@ class TestEnvOrDefault(unittest.TestCase):
         with mock.patch.dict(os.environ, {key: ""}, clear=False):
             p = env_or_default(key, fb)
         self.assertEqual(p, fb)
+
+    def test_none_fallback(self):
+        key = "RACKSDB_TEST_ENV_OR_DEFAULT_NONE_FALLBACK"
+        with mock.patch.dict(os.environ, {key: ""}, clear=False):
+            self.assertIsNone(env_or_default(key, None))
+        with mock.patch.dict(os.environ, {key: "/from/env"}, clear=False):
+            self.assertEqual(env_or_default(key, None), Path("/from/env"))
@@ -18,6 +18,7 @@ import yaml
 from racksdb import RacksDB
 from racksdb.env import RacksDBEnv
 from racksdb.exec import RacksDBExec
+from racksdb.generic.db import DBDict
 from racksdb.version import get_version
 
 from .lib.common import schema_path, db_path, drawing_schema_path
@@ -28,7 +29,6 @@ from .lib.reference import (
     REFDB_TOTAL_NODES,
 )
 
-
 CMD_BASE_ARGS = ["--schema", str(schema_path()), "--db", str(db_path())]
 CMD_DRAW_BASE_ARGS = ["draw", "--drawings-schema", str(drawing_schema_path())]
 
@@ -194,6 +194,20 @@ class TestRacksDBExec(TestRacksDBReferenceDB):
             )
             self.assertNodesResponse(json.loads(output.getvalue()))
 
+    def test_nodes_ndjson(self):
+        with mock.patch("sys.stdout", new=io.StringIO()) as output:
+            RacksDBExec(
+                CMD_BASE_ARGS
+                + [
+                    "nodes",
+                    "--format",
+                    "ndjson",
+                ]
+            )
+            self.assertNodesResponse(
+                [json.loads(line) for line in output.getvalue().splitlines()]
+            )
+
     def test_nodes_list(self):
         with mock.patch("sys.stdout", new=io.StringIO()) as output:
             RacksDBExec(
@@ -234,6 +248,32 @@ class TestRacksDBExec(TestRacksDBReferenceDB):
             )
             self.assertEqual(output.getvalue(), "[]\n")
 
+    def test_nodes_json_filtered(self):
+        with mock.patch("sys.stdout", new=io.StringIO()) as output:
+            with mock.patch.object(DBDict, "filter") as filter_mock:
+                RacksDBExec(
+                    CMD_BASE_ARGS + ["nodes", "--name", "mecn0005", "--format", "json"]
+                )
+            # Values are filtered lazily without building a filtered copy.
+            filter_mock.assert_not_called()
+            nodes = json.loads(output.getvalue())
+            self.assertEqual([node["name"] for node in nodes], ["mecn0005"])
+
+    def test_nodes_list_json(self):
+        with mock.patch("sys.stdout", new=io.StringIO()) as output:
+            RacksDBExec(
+                CMD_BASE_ARGS
+                + ["nodes", "--infrastructure", "jupiter", "--list", "--format", "json"]
+            )
+            names = json.loads(output.getvalue())
+        with mock.patch("sys.stdout", new=io.StringIO()) as output:
+            RacksDBExec(
+                CMD_BASE_ARGS
+                + ["nodes", "--infrastructure", "jupiter", "--list", "--format", "yaml"]
+            )
+            self.assertEqual(names, yaml.safe_load(output.getvalue()))
+        self.assertGreater(len(names), 0)
+
     def test_nodes_tags(self):
         with mock.patch("sys.stdout", new=io.StringIO()) as output:
             RacksDBExec(
@@ -671,6 +711,93 @@ class TestRacksDBExec(TestRacksDBReferenceDB):
         finally:
             os.chdir(cwd)
 
+    def test_draw_all(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            with mock.patch("sys.stdout", new=io.StringIO()) as output:
+                RacksDBExec(
+                    CMD_BASE_ARGS
+                    + CMD_DRAW_BASE_ARGS
+                    + ["--all", "--output", tmpdir, "--format", "png", "svg"]
+                )
+            for infrastructure in REFDB_INFRASTRUCTURES:
+                for img_format in ["png", "svg"]:
+                    self.assertTrue(
+                        (
+                            Path(tmpdir)
+                            / "infrastructure"
+                            / f"{infrastructure}.{img_format}"
+                        ).exists()
+                    )
+            self.assertTrue((Path(tmpdir) / "room" / "noisy.png").exists())
+            self.assertIn("room noisy svg: ", output.getvalue())
+            self.assertIn("Generated ", output.getvalue())
+
+    def test_draw_all_entity_workers(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            with mock.patch("sys.stdout", new=io.StringIO()):
+                RacksDBExec(
+                    CMD_BASE_ARGS
+                    + CMD_DRAW_BASE_ARGS
+                    + [
+                        "room",
+                        "--all",
+                        "--output",
+                        tmpdir,
+                        "--workers",
+                        "2",
+                        "--coordinates",
+                    ]
+                )
+            self.assertTrue((Path(tmpdir) / "room" / "noisy.png").exists())
+            self.assertTrue((Path(tmpdir) / "room" / "noisy.json").exists())
+            self.assertFalse((Path(tmpdir) / "infrastructure").exists())
+
+    def test_draw_all_global_workers(self):
+        # The global --workers option is used to draw when the draw command option
+        # is omitted, and the draw command option also applies to database parsing.
+        for args, draw_args in [
+            (["--workers", "2"], []),
+            ([], ["--workers", "2"]),
+        ]:
+            with tempfile.TemporaryDirectory() as tmpdir:
+                with mock.patch(
+                    "racksdb.exec.RacksDB.load", wraps=RacksDB.load
+                ) as load, mock.patch(
+                    "racksdb.exec.DrawingsBatch.render", return_value=[]
+                ) as render, mock.patch(
+                    "sys.stdout", new=io.StringIO()
+                ):
+                    RacksDBExec(
+                        CMD_BASE_ARGS
+                        + args
+                        + CMD_DRAW_BASE_ARGS
+                        + ["room", "--all", "--output", tmpdir]
+                        + draw_args
+                    )
+                self.assertEqual(load.call_args[0][4], 2)
+                render.assert_called_once_with(2)
+
+    def test_draw_missing_name(self):
+        with mock.patch("sys.stderr", new=io.StringIO()) as errors:
+            with self.assertRaisesRegex(SystemExit, "1"):
+                RacksDBExec(CMD_BASE_ARGS + CMD_DRAW_BASE_ARGS + ["room"])
+            self.assertIn(
+                "Entity type and --name are required unless --all is set",
+                errors.getvalue(),
+            )
+
+    def test_draw_multiple_formats(self):
+        with mock.patch("sys.stderr", new=io.StringIO()) as errors:
+            with self.assertRaisesRegex(SystemExit, "1"):
+                RacksDBExec(
+                    CMD_BASE_ARGS
+                    + CMD_DRAW_BASE_ARGS
+                    + ["room", "--name", "noisy", "--format", "png", "svg"]
+                )
+            self.assertIn(
+                "Multiple formats are supported only with --all", errors.getvalue()
+            )
+
     #
     # autopaging
     #
@@ -726,6 +853,8 @@ class TestRacksDBExecLoadArguments(unittest.TestCase):
             Path(RacksDB.DEFAULT_SCHEMA),
             Path(RacksDB.DEFAULT_EXT),
             Path(RacksDB.DEFAULT_DB),
+            None,
+            1,
         )
 
     def test_load_args_use_environment_when_set(self):
@@ -743,6 +872,8 @@ class TestRacksDBExecLoadArguments(unittest.TestCase):
             Path("/env/schema.yml"),
             Path("/env/extensions.yml"),
             Path("/env/db"),
+            None,
+            1,
         )
 
     def test_load_args_prefer_cli_over_environment(self):
@@ -771,4 +902,6 @@ class TestRacksDBExecLoadArguments(unittest.TestCase):
             Path("/cli/schema.yml"),
             Path(RacksDB.DEFAULT_EXT),
             Path("/cli/db"),
+            None,
+            1,
         )
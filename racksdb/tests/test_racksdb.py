@@ -4,12 +4,17 @@
 #
 # SPDX-License-Identifier: MIT
 
+import os
 import unittest
+from unittest import mock
 import tempfile
 import shutil
+import json
+import pickle
 from pathlib import Path
 
 from racksdb import RacksDB
+from racksdb.generic.snapshot import DBSnapshotLoader
 from racksdb.errors import RacksDBRequestError, RacksDBNotFoundError, RacksDBFormatError
 
 from .lib.common import schema_path, db_path, db_one_file_path
@@ -54,6 +59,19 @@ class TestRacksDB(unittest.TestCase):
         node = self.db.infrastructures["mercury"].nodes["mecn0001"]
         self.assertEqual(node, node._first)
 
+    def test_references(self):
+        part = self.db.infrastructures["mercury"].layout[2]
+        self.assertEqual(type(part.rack).__name__, "RacksDBRack")
+        self.assertEqual(part.rack.name, "R2-A02")
+        self.assertEqual(part.rack.slot, 1)
+        self.assertEqual(part.rack._first.name, "R2-A01")
+        self.assertEqual(part.rack.row.name, "R2")
+        self.assertEqual(part.network.first().type.id, "cisco3650")
+        # References to the same rack from multiple infrastructures are resolved.
+        self.assertEqual(
+            self.db.infrastructures["sharednet"].layout[0].rack.name, "R2-A02"
+        )
+
     def test_nodes(self):
         # Thanks to lazy loading, just a few expandable object are loaded, much
         # fewer than the number of nodes. The number of potentially expanded
@@ -74,6 +92,93 @@ class TestRacksDB(unittest.TestCase):
             .name,
         )
 
+    def test_racks_fillrate_nodes(self):
+        racks = {rack.name: rack for rack in self.db.racks}
+        self.assertAlmostEqual(racks["R1-A01"].fillrate, 41 / 42)
+        self.assertAlmostEqual(racks["R2-A02"].fillrate, 1 / 3)
+        self.assertEqual(len(racks["R1-A01"].nodes), 61)
+        self.assertEqual(len(racks["R2-A02"].nodes), 0)
+        self.assertEqual(racks["R1-A03"].fillrate, 0)
+        self.assertEqual(len(racks["R1-A03"].nodes), 0)
+
+    def test_racks_fillrate_expanded_sum(self):
+        # Fill rate is the same float as the sum of the areas of all expanded
+        # equipments.
+        for rack in self.db.racks:
+            occupied = 0.0
+            for infrastructure in self.db.infrastructures:
+                for part in infrastructure.layout:
+                    if part.rack.name != rack.name:
+                        continue
+                    for equipments in [
+                        part.nodes,
+                        part.storage,
+                        part.network,
+                        part.misc,
+                    ]:
+                        for equipment in equipments:
+                            occupied += equipment.type.height * equipment.type.width
+            self.assertEqual(rack.fillrate, occupied / rack.type.slots)
+
+    def test_cached_aggregates(self):
+        infrastructure = self.db.infrastructures["mercury"]
+        datacenter = self.db.datacenters.first()
+        nodes = self.db._nodes
+        racks = self.db._racks
+        infrastructure_nodes = infrastructure._nodes
+        datacenter_racks = datacenter._racks
+        # Aggregates are computed once and returned on subsequent accesses.
+        self.db.nodes
+        self.db.racks
+        infrastructure.nodes
+        datacenter.racks
+        self.assertIs(self.db._nodes, nodes)
+        self.assertIs(self.db._racks, racks)
+        self.assertIs(infrastructure._nodes, infrastructure_nodes)
+        self.assertIs(datacenter._racks, datacenter_racks)
+        # Aggregates are computed again after caches are dropped.
+        self.db.drop_caches()
+        self.assertIsNot(self.db._nodes, nodes)
+        self.assertIsNot(self.db._racks, racks)
+        self.assertIsNot(infrastructure._nodes, infrastructure_nodes)
+        self.assertIsNot(datacenter._racks, datacenter_racks)
+        self.assertEqual(len(self.db.nodes), len(nodes))
+        self.assertEqual(len(self.db.racks), len(racks))
+
+    def test_aggregates_copies(self):
+        # Modifications of returned aggregates do not alter the cached values.
+        infrastructure = self.db.infrastructures["mercury"]
+        datacenter = self.db.datacenters.first()
+        nodes_count = len(self.db.nodes)
+        racks_count = len(self.db.racks)
+        infrastructure_nodes_count = len(infrastructure.nodes)
+        datacenter_racks_count = len(datacenter.racks)
+        self.db.nodes.clear()
+        self.db.racks.clear()
+        infrastructure.nodes.clear()
+        datacenter.racks.clear()
+        self.assertEqual(len(self.db.nodes), nodes_count)
+        self.assertEqual(len(self.db.racks), racks_count)
+        self.assertEqual(len(infrastructure.nodes), infrastructure_nodes_count)
+        self.assertEqual(len(datacenter.racks), datacenter_racks_count)
+        # Copies keep lookups of expanded keys.
+        self.assertEqual(self.db.nodes["mecn0005"].name, "mecn0005")
+
+    def test_position_cached(self):
+        # Positions of equipments expanded from expandable objects are computed once
+        # per index, for all instances of expanded objects.
+        node = self.db.nodes["mecn0005"]
+        position = node.position
+        self.assertIs(self.db.nodes["mecn0005"].position, position)
+        self.assertIsNot(self.db.nodes["mecn0006"].position, position)
+        self.assertEqual(
+            (position.height, position.width),
+            (node.position.height, node.position.width),
+        )
+        # Positions are computed again after caches are dropped.
+        self.db.drop_caches()
+        self.assertIsNot(self.db.nodes["mecn0005"].position, position)
+
     def test_tags_missing_param(self):
         msg = (
             "^Either node, infrastructure or datacenter parameter must be defined to "
@@ -150,6 +255,11 @@ class TestRacksDBAlternatePaths(unittest.TestCase):
             shutil.copyfile(db_one_file_path(), new_db_path)
             self.db = RacksDB.load(schema=schema_path(), db=new_db_path)
 
+    def test_db_workers(self):
+        db = RacksDB.load(schema=schema_path(), db=db_path(), workers=2)
+        self.assertEqual(len(db.nodes), 130)
+        self.assertEqual(len(db.racks), 101)
+
     def test_db_ext_fail(self):
         with tempfile.TemporaryDirectory() as tmpdir:
             new_db_path = Path(tmpdir) / "db.fail"
@@ -159,3 +269,283 @@ class TestRacksDBAlternatePaths(unittest.TestCase):
                 r"^DB contains file \/.*\/db\.fail without valid extensions: .*$",
             ):
                 RacksDB.load(schema=schema_path(), db=new_db_path)
+
+
+class TestRacksDBSnapshot(unittest.TestCase):
+    def setUp(self):
+        try:
+            self.schema_path = schema_path()
+            self.db_path = db_path()
+        except FileNotFoundError as err:
+            self.skipTest(err)
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.cache = Path(self.tmpdir.name) / "cache"
+        self.db_copy = Path(self.tmpdir.name) / "db"
+        shutil.copytree(self.db_path, self.db_copy)
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def load(self):
+        return RacksDB.load(schema=self.schema_path, db=self.db_copy, cache=self.cache)
+
+    def test_snapshot(self):
+        db = self.load()
+        self.assertNotIsInstance(db._loader, DBSnapshotLoader)
+        self.assertEqual(len(list(self.cache.iterdir())), 1)
+        # Content is restored from snapshot on subsequent loads.
+        db = self.load()
+        self.assertIsInstance(db._loader, DBSnapshotLoader)
+        self.assertEqual(len(db.nodes), 130)
+        self.assertEqual(len(db.racks), 101)
+
+    def test_snapshot_modified_file(self):
+        self.load()
+        infrastructure = self.db_copy / "infrastructures" / "mercury.yml"
+        infrastructure.write_text(
+            infrastructure.read_text().replace("mecn0200", "mecn0300")
+        )
+        db = self.load()
+        self.assertNotIsInstance(db._loader, DBSnapshotLoader)
+        self.assertEqual(db.nodes["mecn0300"].name, "mecn0300")
+        db = self.load()
+        self.assertIsInstance(db._loader, DBSnapshotLoader)
+        self.assertEqual(db.nodes["mecn0300"].name, "mecn0300")
+
+    def test_snapshot_new_file(self):
+        self.load()
+        shutil.copyfile(
+            self.db_copy / "infrastructures" / "mercury.yml",
+            self.db_copy / "infrastructures" / "venus.yml",
+        )
+        with self.assertRaisesRegex(RacksDBFormatError, "is not unique"):
+            self.load()
+
+    def test_snapshot_touched_file(self):
+        self.load()
+        os.utime(self.db_copy / "infrastructures" / "mercury.yml")
+        db = self.load()
+        # The content of the file is unmodified, the snapshot is still valid.
+        self.assertIsInstance(db._loader, DBSnapshotLoader)
+
+    def test_snapshot_corrupted(self):
+        self.load()
+        for path in self.cache.iterdir():
+            path.write_bytes(b"fail")
+        db = self.load()
+        self.assertNotIsInstance(db._loader, DBSnapshotLoader)
+        self.assertEqual(len(db.nodes), 130)
+
+    def test_snapshot_private_directory(self):
+        self.load()
+        self.assertEqual(self.cache.stat().st_mode & 0o777, 0o700)
+
+    def test_snapshot_unsafe_permissions(self):
+        self.load()
+        (snapshot,) = self.cache.iterdir()
+        # Snapshot is not restored when writable by others.
+        snapshot.chmod(0o666)
+        db = self.load()
+        self.assertNotIsInstance(db._loader, DBSnapshotLoader)
+        self.assertEqual(len(db.nodes), 130)
+        # Snapshot is not restored when directory is writable by others.
+        snapshot.chmod(0o600)
+        self.cache.chmod(0o777)
+        db = self.load()
+        self.assertNotIsInstance(db._loader, DBSnapshotLoader)
+        self.cache.chmod(0o700)
+        db = self.load()
+        self.assertIsInstance(db._loader, DBSnapshotLoader)
+
+    def test_snapshot_forbidden_global(self):
+        self.load()
+        (snapshot,) = self.cache.iterdir()
+        marker = Path(self.tmpdir.name) / "marker"
+
+        class Payload:
+            def __reduce__(self):
+                return (os.mkdir, (str(marker),))
+
+        snapshot.write_bytes(pickle.dumps({"version": 1, "files": Payload()}))
+        db = self.load()
+        # Snapshot with other globals than parsed content types is refused
+        # without executing code.
+        self.assertNotIsInstance(db._loader, DBSnapshotLoader)
+        self.assertFalse(marker.exists())
+        self.assertEqual(len(db.nodes), 130)
+
+
+class TestRacksDBIncremental(unittest.TestCase):
+    def setUp(self):
+        try:
+            self.schema_path = schema_path()
+            self.db_path = db_path()
+        except FileNotFoundError as err:
+            self.skipTest(err)
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.db_copy = Path(self.tmpdir.name) / "db"
+        shutil.copytree(self.db_path, self.db_copy)
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def load(self, previous=None):
+        return RacksDB.load(schema=self.schema_path, db=self.db_copy, previous=previous)
+
+    def load_incremental(self, previous):
+        """Load DB incrementally, return the DB and the set of names of top-level
+        items loaded again."""
+        load_type = RacksDB.load_type
+        with mock.patch.object(
+            RacksDB, "load_type", autospec=True, side_effect=load_type
+        ) as mocked:
+            db = self.load(previous)
+        reloaded = set()
+        for args, _ in mocked.call_args_list:
+            if args[4] is db._root and isinstance(args[2], dict):
+                reloaded.add(args[2].get("name"))
+        return db, reloaded
+
+    def assertCopied(self, obj, previous, db):
+        self.assertIsNot(obj, previous)
+        self.assertIs(obj._db, db)
+        self.assertEqual(obj.name, previous.name)
+
+    def modify(self, path, old, new):
+        path.write_text(path.read_text().replace(old, new))
+        # Ensure modification time is updated despite filesystem timestamps
+        # granularity.
+        stat = path.stat()
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+    def assertSameContent(self, db, reference):
+        self.assertEqual(
+            [(node.name, node.rack.name, node.type.id) for node in db.nodes],
+            [(node.name, node.rack.name, node.type.id) for node in reference.nodes],
+        )
+        self.assertEqual(
+            [(rack.name, rack.fillrate, len(rack.nodes)) for rack in db.racks],
+            [(rack.name, rack.fillrate, len(rack.nodes)) for rack in reference.racks],
+        )
+
+    def test_modified_infrastructure(self):
+        previous = self.load()
+        self.modify(
+            self.db_copy / "infrastructures" / "mercury.yml", "mecn0200", "mecn0300"
+        )
+        db, reloaded = self.load_incremental(previous)
+        self.assertSameContent(db, self.load())
+        self.assertEqual(db.nodes["mecn0300"].name, "mecn0300")
+        self.assertNotIn("mecn0200", db.nodes.filter(name="mecn0200"))
+        # Only the modified infrastructure is loaded again, the other objects are
+        # copied.
+        self.assertEqual(reloaded, {"mercury"})
+        self.assertCopied(
+            db.infrastructures["jupiter"], previous.infrastructures["jupiter"], db
+        )
+        self.assertCopied(db.datacenters["paris"], previous.datacenters["paris"], db)
+        # Racks nodes are updated with nodes of modified infrastructure.
+        rack = db.nodes["mecn0300"].rack
+        self.assertIn("mecn0300", [node.name for node in rack.nodes])
+
+    def test_modified_datacenter(self):
+        previous = self.load()
+        self.modify(self.db_copy / "datacenters" / "paris.yml", "tier2", "tier3")
+        db, reloaded = self.load_incremental(previous)
+        self.assertSameContent(db, self.load())
+        self.assertIn("tier3", db.datacenters["paris"].tags)
+        self.assertIn("paris", reloaded)
+        self.assertNotIn("london", reloaded)
+        self.assertCopied(db.datacenters["london"], previous.datacenters["london"], db)
+        # Infrastructures references racks of datacenters, they are loaded again to
+        # reference the new racks.
+        self.assertTrue({"mercury", "jupiter"} <= reloaded)
+        rack = db.nodes["mecn0001"].rack
+        self.assertIs(rack.datacenter, db.datacenters[rack.datacenter.name])
+
+    def test_added_removed_infrastructure(self):
+        previous = self.load()
+        infrastructure = self.db_copy / "infrastructures" / "jupiter.yml"
+        shutil.move(infrastructure, self.db_copy / "infrastructures" / "saturn.yml")
+        db, reloaded = self.load_incremental(previous)
+        self.assertSameContent(db, self.load())
+        self.assertCountEqual(
+            [infrastructure.name for infrastructure in db.infrastructures],
+            ["mercury", "saturn", "sharednet"],
+        )
+        self.assertNotIn("mercury", reloaded)
+        self.assertCopied(
+            db.infrastructures["mercury"], previous.infrastructures["mercury"], db
+        )
+
+    def test_previous_used_concurrently(self):
+        previous = self.load()
+        jupiter = previous.infrastructures["jupiter"]
+        clone = RacksDB._clone
+
+        def _clone(db, value, memo):
+            # Simulate requests filling and dropping cached properties of previous
+            # objects while they are copied.
+            if "_nodes" in vars(jupiter):
+                del jupiter._nodes
+            else:
+                jupiter._nodes
+            return clone(db, value, memo)
+
+        self.modify(
+            self.db_copy / "infrastructures" / "mercury.yml", "mecn0200", "mecn0300"
+        )
+        with mock.patch.object(RacksDB, "_clone", autospec=True, side_effect=_clone):
+            db = self.load(previous)
+        # Values of cached properties computed with previous objects are not copied.
+        self.assertNotIn("_nodes", vars(db.infrastructures["jupiter"]))
+        self.assertSameContent(db, self.load())
+
+    def test_previous_unchanged(self):
+        previous = self.load()
+
+        def dump(db):
+            return json.dumps(
+                [
+                    [(rack.name, rack.fillrate, len(rack.nodes)) for rack in db.racks],
+                    [
+                        (node.name, node.rack.name, node.type.id, node.tags)
+                        for node in db.nodes
+                    ],
+                ]
+            )
+
+        reference = dump(previous)
+        self.modify(
+            self.db_copy / "infrastructures" / "mercury.yml",
+            "mecn[0001-0040]",
+            "mecn[0001-0010]",
+        )
+        db = self.load(previous)
+        self.assertEqual(len(db.nodes), len(previous.nodes) - 30)
+        # The objects of the previous DB, including the objects of the unmodified
+        # infrastructures, are left unchanged by the incremental load.
+        self.assertEqual(dump(previous), reference)
+        for node in previous.nodes:
+            self.assertIs(node._db, previous)
+        for rack in db.racks:
+            self.assertIs(rack._db, db)
+
+    def test_key_conflict(self):
+        previous = self.load()
+        # Add node already defined in another infrastructure
+        self.modify(
+            self.db_copy / "infrastructures" / "mercury.yml", "mecn0200", "jusrv1"
+        )
+        with self.assertRaisesRegex(RacksDBFormatError, "is not unique"):
+            self.load(previous)
+
+    def test_modified_schema(self):
+        previous = self.load()
+        schema = Path(self.tmpdir.name) / "schema.yml"
+        shutil.copy(self.schema_path, schema)
+        self.modify(schema, "Datacenter equipments", "Equipments")
+        db = RacksDB.load(schema=schema, db=self.db_copy, previous=previous)
+        # With modified schema, objects are all loaded again.
+        self.assertIsNot(db.datacenters["paris"], previous.datacenters["paris"])
+        self.assertSameContent(db, self.load())
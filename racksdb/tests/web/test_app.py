@@ -183,6 +183,8 @@ class TestRacksDBWebAppLoadArguments(unittest.TestCase):
             schema=Path(RacksDB.DEFAULT_SCHEMA),
             ext=Path(RacksDB.DEFAULT_EXT),
             db=Path(RacksDB.DEFAULT_DB),
+            cache=None,
+            workers=1,
         )
 
     def test_load_args_use_environment_when_set(self):
@@ -199,6 +201,8 @@ class TestRacksDBWebAppLoadArguments(unittest.TestCase):
             schema=Path("/env/schema.yml"),
             ext=Path("/env/extensions.yml"),
             db=Path("/env/db"),
+            cache=None,
+            workers=1,
         )
 
     def test_load_args_prefer_cli_over_environment(self):
@@ -225,4 +229,6 @@ class TestRacksDBWebAppLoadArguments(unittest.TestCase):
             schema=Path("/cli/schema.yml"),
             ext=Path(RacksDB.DEFAULT_EXT),
             db=Path("/cli/db"),
+            cache=None,
+            workers=1,
         )
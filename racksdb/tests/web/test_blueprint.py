@@ -4,15 +4,25 @@
 #
 # SPDX-License-Identifier: MIT
 
+import unittest
+from unittest import mock
 import tempfile
 import json
+import os
+import shutil
+import time
+from pathlib import Path
 import flask
 import werkzeug
 import yaml
 from requests_toolbelt import MultipartDecoder
 
 from racksdb.web.app import RacksDBWebBlueprint
+from racksdb.web.cache import CachedDrawing
+from racksdb.drawers.parameters import DrawingParameters
 from racksdb import RacksDB
+from racksdb.generic.db import DBDict
+from racksdb.generic.errors import DBFormatError
 from racksdb.version import get_version
 
 from ..lib.web import RacksDBCustomTestResponse
@@ -122,6 +132,129 @@ class TestRacksDBWebBlueprint(TestRacksDBReferenceDB):
             tmp.flush()  # Make sure file is written to disk
             RacksDB.load(schema=tmp.name, db=self.db_path)
 
+    #
+    # responses cache
+    #
+
+    def test_response_etag(self):
+        # First response is streamed and saved in cache, the following responses
+        # are served from cache with entity tag.
+        self.client.get(f"/v{get_version()}/datacenters").data
+        response = self.client.get(f"/v{get_version()}/datacenters")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.headers["Cache-Control"], "no-cache")
+        etag = response.headers["ETag"]
+        # Conditional request with the same entity tag
+        response = self.client.get(
+            f"/v{get_version()}/datacenters", headers={"If-None-Match": etag}
+        )
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.data, b"")
+        # Conditional request with another entity tag
+        response = self.client.get(
+            f"/v{get_version()}/datacenters", headers={"If-None-Match": '"fail"'}
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.headers["ETag"], etag)
+        self.assertDatacentersResponse(response.json)
+
+    def test_response_cache_args(self):
+        cache = self.app.blueprint.responses_cache
+        cache.clear()
+        response1 = self.client.get(f"/v{get_version()}/datacenters?list&fold")
+        # Streamed response is saved in cache once completely sent.
+        self.assertEqual(len(cache), 0)
+        response1.data
+        self.assertEqual(len(cache), 1)
+        # Same arguments in another order are served from the same cache entry.
+        response2 = self.client.get(f"/v{get_version()}/datacenters?fold&list")
+        self.assertEqual(len(cache), 1)
+        self.assertEqual(response1.data, response2.data)
+        self.assertIn("ETag", response2.headers)
+        self.client.get(f"/v{get_version()}/datacenters?list").data
+        self.assertEqual(len(cache), 2)
+
+    def test_response_cache_errors(self):
+        cache = self.app.blueprint.responses_cache
+        cache.clear()
+        response = self.client.get(f"/v{get_version()}/tags?datacenter=fail")
+        self.assertEqual(response.status_code, 404)
+        # Errors are not saved in cache
+        self.assertEqual(len(cache), 0)
+
+    def test_response_streamed(self):
+        # Blueprint with default arguments
+        self.app.blueprint.responses_cache.clear()
+        response = self.client.get(f"/v{get_version()}/datacenters")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.mimetype, "application/json")
+        # Streamed responses do not have length nor entity tag
+        self.assertNotIn("Content-Length", response.headers)
+        self.assertNotIn("ETag", response.headers)
+        self.assertDatacentersResponse(response.json)
+        response = self.client.get(f"/v{get_version()}/datacenters?format=ndjson")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.mimetype, "application/x-ndjson")
+        self.assertNotIn("Content-Length", response.headers)
+        self.assertNotIn("ETag", response.headers)
+        self.assertDatacentersResponse(
+            [json.loads(line) for line in response.text.splitlines()]
+        )
+        # Other formats are not streamed
+        response = self.client.get(f"/v{get_version()}/datacenters?format=yaml")
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("Content-Length", response.headers)
+        self.assertIn("ETag", response.headers)
+
+    def test_response_streamed_cache(self):
+        blueprint = self.app.blueprint
+        blueprint.responses_cache.clear()
+        url = f"/v{get_version()}/datacenters"
+        streamed = self.client.get(url)
+        # Complete streamed response is saved in cache.
+        streamed.data
+        self.assertEqual(len(blueprint.responses_cache), 1)
+        response = self.client.get(url)
+        self.assertIn("Content-Length", response.headers)
+        self.assertIn("ETag", response.headers)
+        self.assertEqual(response.data, streamed.data)
+        # Responses larger than maximum size of cached bodies are not saved in
+        # cache.
+        blueprint.responses_cache.clear()
+        blueprint.response_cache_body_size = len(streamed.data) - 1
+        self.client.get(url).data
+        self.client.get(f"{url}?format=yaml")
+        self.assertEqual(len(blueprint.responses_cache), 0)
+
+    def test_response_streamed_cache_disabled(self):
+        self.app.blueprint.responses_cache.size = 0
+        self.client.get(f"/v{get_version()}/datacenters").data
+        response = self.client.get(f"/v{get_version()}/datacenters")
+        self.assertNotIn("Content-Length", response.headers)
+        self.assertNotIn("ETag", response.headers)
+        self.assertEqual(len(self.app.blueprint.responses_cache), 0)
+        self.assertDatacentersResponse(response.json)
+
+    def test_response_streamed_filtered(self):
+        self.app.blueprint.responses_cache.clear()
+        url = f"/v{get_version()}/nodes?infrastructure=jupiter"
+        with mock.patch.object(DBDict, "filter") as filter_mock:
+            response = self.client.get(url)
+            names = self.client.get(f"{url}&list&format=ndjson").text.splitlines()
+            # Values are filtered lazily without building a filtered copy.
+            filter_mock.assert_not_called()
+        self.assertNotIn("ETag", response.headers)
+        nodes = response.json
+        self.assertGreater(len(nodes), 0)
+        self.assertEqual(
+            [json.loads(name) for name in names], [node["name"] for node in nodes]
+        )
+        # Same responses are served from cache
+        self.assertEqual(self.client.get(url).json, nodes)
+        self.assertEqual(
+            self.client.get(f"{url}&list&format=ndjson").text.splitlines(), names
+        )
+
     #
     # datacenters
     #
@@ -304,6 +437,14 @@ class TestRacksDBWebBlueprint(TestRacksDBReferenceDB):
         self.assertEqual(response.mimetype, "application/x-yaml")
         self.assertNodesResponse(yaml.safe_load(response.text))
 
+    def test_nodes_ndjson(self):
+        response = self.client.get(f"/v{get_version()}/nodes?format=ndjson")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.mimetype, "application/x-ndjson")
+        self.assertNodesResponse(
+            [json.loads(line) for line in response.text.splitlines()]
+        )
+
     def test_nodes_list(self):
         response = self.client.get(f"/v{get_version()}/nodes?list")
         self.assertEqual(response.status_code, 200)
@@ -483,6 +624,79 @@ class TestRacksDBWebBlueprint(TestRacksDBReferenceDB):
         self.assertEqual(response.status_code, 200)
         self.assertEqual(response.mimetype, "application/pdf")
 
+    def test_draw_cache(self):
+        blueprint = self.app.blueprint
+        url = f"/v{get_version()}/draw/room/noisy.png"
+        with mock.patch.object(
+            blueprint, "_render", wraps=blueprint._render
+        ) as render_mock:
+            response1 = self.client.get(url)
+            response2 = self.client.get(url)
+            # Drawing is rendered once, then served from cache
+            render_mock.assert_called_once()
+            self.assertEqual(response1.data, response2.data)
+            # Different parameters are rendered again
+            self.client.get(f"{url}?parameters.dimensions.width=800")
+            self.assertEqual(render_mock.call_count, 2)
+            # Same parameters with POST request body are served from cache
+            self.client.post(url, json={"dimensions": {"width": 800}})
+            self.assertEqual(render_mock.call_count, 2)
+            # Coordinates are rendered again
+            response = self.client.get(f"{url}?coordinates")
+            self.assertEqual(render_mock.call_count, 3)
+            self.assertEqual(response.mimetype, "multipart/form-data")
+
+    def test_draw_cache_key(self):
+        blueprint = self.app.blueprint
+        url = f"/v{get_version()}/draw/room/noisy.png"
+        with mock.patch.object(
+            blueprint, "_render", return_value=CachedDrawing(b"image", None)
+        ) as render_mock:
+            self.client.get(url)
+            self.client.get(url)
+            render_mock.assert_called_once()
+            # Drawing is rendered again with another version of RacksDB.
+            with mock.patch("racksdb.web.app.get_version", return_value="0.0.0"):
+                self.client.get(url)
+            self.assertEqual(render_mock.call_count, 2)
+            # Drawing is rendered again with another drawing parameters schema.
+            blueprint._drawings_schema_digest = "other"
+            with mock.patch.object(blueprint, "_drawings_schema_object"):
+                self.client.get(url)
+            self.assertEqual(render_mock.call_count, 3)
+
+    def test_draw_cache_db_digest(self):
+        blueprint = self.app.blueprint
+        db = blueprint.db
+        other = RacksDB.load(schema=self.schema_path, db=self.db_path)
+        # Same content gives the same digest.
+        self.assertEqual(blueprint._db_digest(other), blueprint._db_digest(db))
+        # Digest is computed with the given database instance, not with the
+        # instance currently served by the blueprint.
+        other._loader.content = {}
+        digest = blueprint._db_digest(other)
+        self.assertNotEqual(blueprint._db_digest(db), digest)
+        self.assertEqual(blueprint._db_digest(other), digest)
+
+    def test_draw_parameters_schema(self):
+        blueprint = self.app.blueprint
+        blueprint.drawings_cache.memory.clear()
+        url = f"/v{get_version()}/draw/room/noisy.svg"
+        with mock.patch.object(
+            DrawingParameters, "load_schema", wraps=DrawingParameters.load_schema
+        ) as load_schema_mock:
+            self.client.get(url)
+            self.client.get(f"{url}?parameters.dimensions.width=800")
+            self.client.get("/openapi.yaml")
+            # Schema is loaded once and kept for subsequent requests
+            load_schema_mock.assert_called_once()
+        # Default parameters object is reused for requests without overrides.
+        default_parameters = blueprint._default_parameters
+        self.assertIsNotNone(default_parameters)
+        blueprint.drawings_cache.memory.clear()
+        self.client.post(url)
+        self.assertIs(blueprint._default_parameters, default_parameters)
+
     @expand_params(["get", "post"])
     def test_draw_room_invalid(self, verb):
         response = self.client_method(verb)(f"/v{get_version()}/draw/room/fail.png")
@@ -557,6 +771,20 @@ class TestRacksDBWebBlueprint(TestRacksDBReferenceDB):
         self.assertEqual(response.status_code, 200)
         self.assertEqual(response.mimetype, "image/png")
 
+    def test_draw_post_room_parameters_yaml_syntax_error(self):
+        response = self.client.post(
+            f"/v{get_version()}/draw/room/noisy.png",
+            data="margin: [unclosed",
+            content_type="application/x-yaml",
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.mimetype, "application/json")
+        self.assertTrue(
+            response.json["description"].startswith(
+                "Unable to load drawing parameters: "
+            )
+        )
+
     def test_draw_get_room_invalid_parameters(self):
         response = self.client.get(
             f"/v{get_version()}/draw/room/noisy.png?parameters.fail=true"
@@ -940,3 +1168,149 @@ class TestRacksDBWebBlueprint(TestRacksDBReferenceDB):
                 "name": "Bad Request",
             },
         )
+
+
+class TestRacksDBWebBlueprintReload(unittest.TestCase):
+    def setUp(self):
+        try:
+            self.schema_path = schema_path()
+            db = db_path()
+            self.drawing_schema_path = drawing_schema_path()
+        except FileNotFoundError as err:
+            self.skipTest(err)
+        # Copy reference database in temporary directory to modify its files
+        self._tmpdir = tempfile.TemporaryDirectory()
+        self.db_path = Path(self._tmpdir.name) / "db"
+        shutil.copytree(db, self.db_path)
+        self.datacenter_path = self.db_path / "datacenters" / "paris.yml"
+
+    def tearDown(self):
+        self._tmpdir.cleanup()
+
+    def blueprint(self, **kwargs):
+        return RacksDBWebBlueprint(
+            schema=self.schema_path,
+            db=self.db_path,
+            drawings_schema=self.drawing_schema_path,
+            **kwargs,
+        )
+
+    def modify_datacenter(self, old, new):
+        with open(self.datacenter_path) as fh:
+            content = fh.read()
+        with open(self.datacenter_path, "w") as fh:
+            fh.write(content.replace(old, new))
+        # Ensure modification time is updated despite filesystem timestamps
+        # granularity.
+        stat = self.datacenter_path.stat()
+        os.utime(self.datacenter_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+    def test_reload(self):
+        blueprint = self.blueprint()
+        db = blueprint.db
+        self.modify_datacenter("- tier2", "- tier3")
+        self.assertTrue(blueprint.reload())
+        self.assertIsNot(blueprint.db, db)
+        self.assertIsNone(blueprint.reload_error)
+        self.assertIn("tier3", blueprint.db.datacenters["paris"].tags)
+        # Previous instance is left untouched
+        self.assertIn("tier2", db.datacenters["paris"].tags)
+
+    def test_reload_responses_cache(self):
+        blueprint = self.blueprint()
+        app = flask.Flask("Fake RacksDB web application")
+        app.register_blueprint(blueprint)
+        client = app.test_client()
+        url = f"/v{get_version()}/tags?datacenter=paris"
+        response = client.get(url)
+        self.assertIn("tier2", json.loads(response.data))
+        etag = response.headers["ETag"]
+        self.modify_datacenter("- tier2", "- tier3")
+        self.assertTrue(blueprint.reload())
+        self.assertEqual(blueprint.generation, 1)
+        # Cached response is obsolete after reload
+        response = client.get(url, headers={"If-None-Match": etag})
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response.headers["ETag"], etag)
+        self.assertIn("tier3", json.loads(response.data))
+
+    def test_reload_error(self):
+        blueprint = self.blueprint()
+        db = blueprint.db
+        self.modify_datacenter("tags:", "*fail:{:")
+        self.assertFalse(blueprint.reload())
+        self.assertIs(blueprint.db, db)
+        self.assertIsNotNone(blueprint.reload_error)
+
+    def test_reload_syntax_error(self):
+        blueprint = self.blueprint()
+        db = blueprint.db
+        self.modify_datacenter("- tier2", "- tier2\n- foo: [unclosed")
+        self.assertFalse(blueprint.reload())
+        self.assertIs(blueprint.db, db)
+        self.assertIsNotNone(blueprint.reload_error)
+
+    def test_watcher(self):
+        blueprint = self.blueprint(reload_interval=0.05)
+        db = blueprint.db
+        try:
+            self.modify_datacenter("- tier2", "- tier3")
+            deadline = time.monotonic() + 10
+            while blueprint.db is db and time.monotonic() < deadline:
+                time.sleep(0.05)
+        finally:
+            blueprint.stop_watcher()
+        self.assertIsNot(blueprint.db, db)
+        self.assertIn("tier3", blueprint.db.datacenters["paris"].tags)
+
+    def test_watcher_error(self):
+        blueprint = self.blueprint(reload_interval=0.05)
+        db = blueprint.db
+        try:
+            # The watcher keeps running after invalid modification.
+            self.modify_datacenter("- tier2", "- tier2\n- foo: [unclosed")
+            deadline = time.monotonic() + 10
+            while blueprint.reload_error is None and time.monotonic() < deadline:
+                time.sleep(0.05)
+            self.assertIsNotNone(blueprint.reload_error)
+            self.assertIs(blueprint.db, db)
+            # Database is reloaded when the modification is fixed.
+            self.modify_datacenter("- tier2\n- foo: [unclosed", "- tier3")
+            deadline = time.monotonic() + 10
+            while blueprint.db is db and time.monotonic() < deadline:
+                time.sleep(0.05)
+        finally:
+            blueprint.stop_watcher()
+        self.assertIsNot(blueprint.db, db)
+        self.assertIsNone(blueprint.reload_error)
+        self.assertIn("tier3", blueprint.db.datacenters["paris"].tags)
+
+    def test_watcher_retry(self):
+        blueprint = self.blueprint(reload_interval=0.05)
+        db = blueprint.db
+        load = RacksDB.load
+        errors = [DBFormatError("partially written file"), RuntimeError("fail")]
+
+        def fail_then_load(**kwargs):
+            if errors:
+                raise errors.pop(0)
+            return load(**kwargs)
+
+        try:
+            with mock.patch.object(RacksDB, "load", side_effect=fail_then_load):
+                self.modify_datacenter("- tier2", "- tier3")
+                # Reload is retried after errors without further modifications.
+                deadline = time.monotonic() + 10
+                while blueprint.db is db and time.monotonic() < deadline:
+                    time.sleep(0.05)
+        finally:
+            blueprint.stop_watcher()
+        self.assertEqual(errors, [])
+        self.assertIsNot(blueprint.db, db)
+        self.assertIsNone(blueprint.reload_error)
+        self.assertIn("tier3", blueprint.db.datacenters["paris"].tags)
+
+    def test_watcher_disabled(self):
+        blueprint = self.blueprint()
+        self.assertIsNone(blueprint.manifest)
+        self.assertIsNone(blueprint._watcher)
@@ -0,0 +1,117 @@
+# Copyright (c) 2026 Rackslab
+#
+# This file is part of RacksDB.
+#
+# SPDX-License-Identifier: MIT
+
+import os
+import unittest
+import tempfile
+from pathlib import Path
+
+from racksdb.web.cache import CachedResponse, LRUCache, CachedDrawing, DrawingsCache
+
+
+class TestCachedResponse(unittest.TestCase):
+    def test_etag(self):
+        entry = CachedResponse("content", "application/json")
+        self.assertEqual(entry.body, b"content")
+        self.assertEqual(entry.mimetype, "application/json")
+        self.assertEqual(entry.etag, CachedResponse(b"content", "text/plain").etag)
+        self.assertNotEqual(entry.etag, CachedResponse("other", "text/plain").etag)
+
+
+class TestLRUCache(unittest.TestCase):
+    def test_get_add(self):
+        cache = LRUCache(2)
+        self.assertIsNone(cache.get("a"))
+        entry = CachedResponse("a", "text/plain")
+        self.assertIs(cache.add("a", entry), entry)
+        self.assertIs(cache.get("a"), entry)
+
+    def test_lru(self):
+        cache = LRUCache(2)
+        cache.add("a", CachedResponse("a", "text/plain"))
+        cache.add("b", CachedResponse("b", "text/plain"))
+        # Access a to make b the least recently used entry
+        cache.get("a")
+        cache.add("c", CachedResponse("c", "text/plain"))
+        self.assertEqual(len(cache), 2)
+        self.assertIsNone(cache.get("b"))
+        self.assertIsNotNone(cache.get("a"))
+        self.assertIsNotNone(cache.get("c"))
+
+    def test_clear(self):
+        cache = LRUCache(2)
+        cache.add("a", CachedResponse("a", "text/plain"))
+        cache.clear()
+        self.assertEqual(len(cache), 0)
+        self.assertIsNone(cache.get("a"))
+
+    def test_disabled(self):
+        cache = LRUCache(0)
+        entry = cache.add("a", CachedResponse("a", "text/plain"))
+        self.assertEqual(entry.body, b"a")
+        self.assertIsNone(cache.get("a"))
+
+
+class TestDrawingsCache(unittest.TestCase):
+    def test_key(self):
+        key = DrawingsCache.key(entity="room", parameters={"a": 1, "b": {"c": 2}})
+        # Key does not depend on order of inputs and parameters.
+        self.assertEqual(
+            key, DrawingsCache.key(parameters={"b": {"c": 2}, "a": 1}, entity="room")
+        )
+        self.assertNotEqual(
+            key, DrawingsCache.key(entity="room", parameters={"a": 1, "b": {"c": 3}})
+        )
+
+    def test_memory(self):
+        cache = DrawingsCache(2)
+        self.assertTrue(cache.enabled)
+        self.assertIsNone(cache.get("key", False))
+        drawing = CachedDrawing(b"image", None)
+        cache.add("key", drawing)
+        self.assertIs(cache.get("key", False), drawing)
+
+    def test_disabled(self):
+        cache = DrawingsCache(0)
+        self.assertFalse(cache.enabled)
+
+    def test_directory(self):
+        with tempfile.TemporaryDirectory() as _tmpdir:
+            directory = Path(_tmpdir) / "drawings"
+            cache = DrawingsCache(0, directory)
+            self.assertTrue(cache.enabled)
+            cache.add("key", CachedDrawing(b"image", "coordinates"))
+            # Drawing is restored from directory by another cache instance.
+            drawing = DrawingsCache(2, directory).get("key", True)
+            self.assertEqual(drawing.image, b"image")
+            self.assertEqual(drawing.coordinates, "coordinates")
+            self.assertIsNone(DrawingsCache(2, directory).get("other", False))
+
+    def test_directory_eviction(self):
+        with tempfile.TemporaryDirectory() as _tmpdir:
+            directory = Path(_tmpdir)
+            cache = DrawingsCache(0, directory, 2)
+            for index, key in enumerate(["a", "b"]):
+                cache.add(key, CachedDrawing(b"image", "coordinates"))
+                # Set distinct modification times despite filesystem timestamps
+                # granularity.
+                os.utime(directory / f"{key}.image", (index, index))
+            # Access a to make b the least recently used drawing
+            self.assertIsNotNone(cache.get("a", False))
+            cache.add("c", CachedDrawing(b"image", "coordinates"))
+            self.assertCountEqual(
+                [path.name for path in directory.iterdir()],
+                ["a.image", "a.coordinates", "c.image", "c.coordinates"],
+            )
+            self.assertIsNone(cache.get("b", True))
+
+    def test_directory_unbounded(self):
+        with tempfile.TemporaryDirectory() as _tmpdir:
+            directory = Path(_tmpdir)
+            cache = DrawingsCache(0, directory, 0)
+            for key in ["a", "b", "c"]:
+                cache.add(key, CachedDrawing(b"image", None))
+            self.assertEqual(len(list(directory.glob("*.image"))), 3)
@@ -109,7 +109,7 @@ class RacksDBViews(DBViewSet):
         DBViewParameter(
             "format",
             "Select output format",
-            choices=["yaml", "json"],
+            choices=["yaml", "json", "ndjson"],
         ),
     ]
     ACTIONS = [
@@ -124,13 +124,73 @@ class RacksDBViews(DBViewSet):
                     description="Type of entity to draw",
                     choices=["infrastructure", "room"],
                     positional=True,
+                    specific="web",
+                ),
+                DBActionParameter(
+                    "entity",
+                    description=(
+                        "Type of entity to draw, all types of entities with --all when "
+                        "unset"
+                    ),
+                    choices=["infrastructure", "room"],
+                    nargs="?",
+                    positional=True,
+                    specific="cli",
+                ),
+                DBActionParameter(
+                    "name",
+                    description="Name of entity",
+                    required=True,
+                    specific="web",
+                ),
+                DBActionParameter(
+                    "name",
+                    description="Name of entity, required unless --all is set",
+                    specific="cli",
                 ),
-                DBActionParameter("name", description="Name of entity", required=True),
                 DBActionParameter(
                     "format",
                     description="Format of the generated image",
                     choices=["png", "svg", "pdf"],
                     default="png",
+                    specific="web",
+                ),
+                DBActionParameter(
+                    "format",
+                    description=(
+                        "Formats of the generated images, multiple formats are "
+                        "accepted with --all"
+                    ),
+                    choices=["png", "svg", "pdf"],
+                    nargs="+",
+                    default=["png"],
+                    specific="cli",
+                ),
+                DBActionParameter(
+                    "all",
+                    description=(
+                        "Draw all entities of the given type, or all infrastructures "
+                        "and rooms when type is unset, in batch mode"
+                    ),
+                    nargs=0,
+                    specific="cli",
+                ),
+                DBActionParameter(
+                    "output",
+                    description="Directory of generated images with --all",
+                    short="o",
+                    _type=Path,
+                    default=Path("."),
+                    specific="cli",
+                ),
+                DBActionParameter(
+                    "workers",
+                    description=(
+                        "Number of parallel processes to parse database files and "
+                        "draw with --all"
+                    ),
+                    _type=int,
+                    specific="cli",
                 ),
                 DBActionParameter(
                     "parameters",
@@ -10,7 +10,11 @@ import io
 import sys
 import typing as t
 import copy
+import hashlib
+import pickle
 import logging
+import threading
+import weakref
 
 from flask import Flask, Blueprint, Response, request, send_file, abort, jsonify
 from requests_toolbelt import MultipartEncoder
@@ -24,8 +28,10 @@ from ..views import RacksDBViews
 from ..generic.db import DBDictsLoader, DBStringLoader
 from ..generic.openapi import OpenAPIGenerator
 from ..generic.dumpers import DBDumperFactory, SchemaDumperFactory
-from ..generic.schema import Schema, SchemaFileLoader, SchemaDefinedTypeLoader
+from ..generic.schema import Schema
 from ..generic.errors import DBSchemaError, DBFormatError
+from ..generic.manifest import DBManifest
+from .cache import CachedResponse, LRUCache, CachedDrawing, DrawingsCache
 from ..drawers import InfrastructureDrawer, AxonometricInfrastructureDrawer, RoomDrawer
 from ..drawers.parameters import DrawingParameters
 
@@ -93,14 +99,24 @@ def merge_args_parameters(content: t.Dict[str, t.Any], args: t.Dict[str, str]):
                 current[key] = value
 
 
+def content_digest(content: t.Any) -> str:
+    """Return the hash of the pickled representation of the given content."""
+    return hashlib.sha256(
+        pickle.dumps(content, protocol=pickle.HIGHEST_PROTOCOL)
+    ).hexdigest()
+
+
 class RacksDBWebBlueprint(Blueprint):
     MIMETYPES = {
         "json": "application/json",
         "yaml": "application/x-yaml",
+        "ndjson": "application/x-ndjson",
         "png": "image/png",
         "svg": "image/svg+xml",
         "pdf": "application/pdf",
     }
+    # Formats of views dumps that can be streamed
+    STREAMED_FORMATS = ["json", "ndjson"]
 
     def __init__(
         self,
@@ -110,12 +126,44 @@ class RacksDBWebBlueprint(Blueprint):
         drawings_schema=Path(DrawingParameters.DEFAULT_SCHEMA),
         default_drawing_parameters={},
         openapi=False,
+        cache=None,
+        workers=1,
+        reload_interval=0,
+        response_cache_size=128,
+        response_cache_body_size=1048576,
+        drawings_cache_size=32,
+        drawings_cache_dir=None,
+        drawings_cache_dir_size=1024,
     ):
         super().__init__("RacksDB web blueprint", __name__)
-        self.db = RacksDB.load(schema=schema, ext=ext, db=db)
+        self.paths = [schema, ext, db]
+        self.load_args = dict(
+            schema=schema, ext=ext, db=db, cache=cache, workers=workers
+        )
+        # Build manifest of files before loading the database so that files
+        # modified during initial load are detected by the watcher.
+        self.manifest = DBManifest(self.paths) if reload_interval > 0 else None
+        self.db = RacksDB.load(**self.load_args)
+        # Generation of the database, incremented after every successful reload.
+        self.generation = 0
+        # Error of last failed reload, None if the last reload succeeded.
+        self.reload_error = None
+        self.responses_cache = LRUCache(response_cache_size)
+        # Maximum size in bytes of response bodies saved in cache
+        self.response_cache_body_size = response_cache_body_size
+        self.drawings_cache = DrawingsCache(
+            drawings_cache_size, drawings_cache_dir, drawings_cache_dir_size
+        )
+        # Pair of weak reference to database instance and digest of its content
+        self._digest = (None, None)
         self.views = RacksDBViews()
         self.drawings_schema = drawings_schema
         self.default_drawing_parameters = default_drawing_parameters
+        # Drawing parameters Schema and default drawing parameters, loaded on first
+        # use and kept for subsequent requests.
+        self._drawings_schema = None
+        self._drawings_schema_digest = None
+        self._default_parameters = None
         if openapi:
             self.add_url_rule("/openapi.yaml", view_func=self._openapi, methods=["GET"])
         self.add_url_rule(
@@ -138,45 +186,237 @@ class RacksDBWebBlueprint(Blueprint):
         for error in [400, 404, 415, 500]:
             self.register_error_handler(error, self._handle_bad_request)
 
+        self._watcher_stop = threading.Event()
+        self._watcher = None
+        if reload_interval > 0:
+            self._watcher = threading.Thread(
+                target=self._watch,
+                args=(reload_interval,),
+                name="racksdb-watcher",
+                daemon=True,
+            )
+            self._watcher.start()
+
+    def _watch(self, interval):
+        """Check database files for modifications at every interval and reload
+        database when files are modified, until the watcher is stopped."""
+        logger.info(
+            "Watching database files for modifications every %s seconds", interval
+        )
+        while not self._watcher_stop.wait(interval):
+            try:
+                changed = self.manifest.changed()
+            except OSError as err:
+                logger.warning("Unable to check database files: %s", err)
+                continue
+            if changed:
+                logger.info("Database files modifications detected, reloading")
+                try:
+                    self.reload()
+                except Exception as err:
+                    # Unexpected errors must not stop the watcher, the previous
+                    # instance keeps being served.
+                    logger.exception("Unexpected error while reloading database")
+                    self.reload_error = str(err)
+
+    def stop_watcher(self):
+        """Stop database files watcher thread, if running."""
+        if self._watcher is None:
+            return
+        self._watcher_stop.set()
+        self._watcher.join()
+        self._watcher = None
+
+    def reload(self) -> bool:
+        """Load the database again incrementally in a new RacksDB instance and
+        atomically swap the current instance with the new one. Requests being
+        processed keep using the previous instance. If the database cannot be loaded,
+        the previous instance keeps being served and the error is reported in logs
+        and in reload_error attribute. Return True if the database has been
+        reloaded, False otherwise."""
+        # Build manifest before loading the files so that files modified during
+        # reload are detected on next check. It is saved only when the database is
+        # successfully loaded, so that the reload is retried on next check in case
+        # of errors, for example with partially written files.
+        manifest = DBManifest(self.paths)
+        try:
+            # Only modified files are parsed and only modified objects are loaded
+            # again, unmodified objects are reused from the current instance.
+            db = RacksDB.load(**self.load_args, previous=self.db)
+        except (DBSchemaError, DBFormatError) as err:
+            logger.error("Unable to reload database, keeping previous version: %s", err)
+            self.reload_error = str(err)
+            return False
+        self.manifest = manifest
+        # The instance is swapped before the generation is incremented, see
+        # _cached_response().
+        self.db = db
+        self.generation += 1
+        self.responses_cache.clear()
+        self.drawings_cache.memory.clear()
+        self.reload_error = None
+        logger.info("Database reloaded successfully")
+        return True
+
     def _handle_bad_request(self, error):
         return (
             jsonify(code=error.code, name=error.name, description=error.description),
             error.code,
         )
 
-    def _schema(self):
-        return Response(
-            response=SchemaDumperFactory.get("yaml")().dump(self.db._schema),
-            mimetype=self.MIMETYPES["yaml"],
+    def _cache_key(self):
+        """Return the current database instance and the key of the response of the
+        current request in cache, with the request path, the sorted query arguments
+        and the generation of the database."""
+        # Read generation before the database instance, as reload swaps the
+        # instance before incrementing the generation. This way, a response built
+        # with a previous instance is never saved with a new generation.
+        generation = self.generation
+        db = self.db
+        key = (
+            request.path,
+            tuple(sorted(request.args.items(multi=True))),
+            generation,
         )
+        return db, key
+
+    def _save_response(self, key, entry: CachedResponse):
+        """Save the response in cache with the given key, unless its body exceeds
+        the maximum size of cached bodies."""
+        if len(entry.body) <= self.response_cache_body_size:
+            self.responses_cache.add(key, entry)
+
+    def _cached_response(self, build):
+        """Return the response with the body and mimetype returned by the given
+        function with the current database instance in argument. The response is
+        saved in cache for subsequent identical requests until the database is
+        reloaded."""
+        db, key = self._cache_key()
+        entry = self.responses_cache.get(key)
+        if entry is None:
+            entry = CachedResponse(*build(db))
+            self._save_response(key, entry)
+        return self._entry_response(entry)
+
+    def _streamed_response(self, build):
+        """Return the response served from cache if available, or the response
+        streamed with the chunks and the mimetype returned by the given function with
+        the current database instance in argument. When the complete streamed body
+        does not exceed the maximum size of cached bodies, it is saved in cache for
+        subsequent identical requests until the database is reloaded."""
+        db, key = self._cache_key()
+        entry = self.responses_cache.get(key)
+        if entry is not None:
+            return self._entry_response(entry)
+        chunks, mimetype = build(db)
+
+        def generate():
+            body = []
+            size = 0
+            cacheable = self.responses_cache.size > 0
+            for chunk in chunks:
+                chunk = chunk.encode()
+                if cacheable:
+                    size += len(chunk)
+                    if size <= self.response_cache_body_size:
+                        body.append(chunk)
+                    else:
+                        # Body is too large to be saved in cache, release the
+                        # chunks collected so far.
+                        cacheable = False
+                        body = []
+                yield chunk
+            if cacheable:
+                self.responses_cache.add(key, CachedResponse(b"".join(body), mimetype))
+
+        return Response(response=generate(), mimetype=mimetype)
+
+    def _entry_response(self, entry: CachedResponse):
+        """Return the response with the body of the given cache entry. The response
+        has a strong entity tag, it is converted to 304 Not Modified when it matches
+        the conditional request headers."""
+        response = Response(response=entry.body, mimetype=entry.mimetype)
+        response.set_etag(entry.etag)
+        # Clients must revalidate cached responses as the database can be reloaded.
+        response.headers["Cache-Control"] = "no-cache"
+        return response.make_conditional(request)
+
+    def _drawings_schema_object(self) -> Schema:
+        """Return the drawing parameters Schema, load it if not loaded yet."""
+        if self._drawings_schema is None:
+            schema = DrawingParameters.load_schema(self.drawings_schema)
+            self._drawings_schema_digest = content_digest(schema._schema)
+            self._drawings_schema = schema
+        return self._drawings_schema
+
+    def _drawing_parameters(self, db_loader, defaults):
+        """Return drawing parameters loaded with the given loader and the drawing
+        parameters Schema. When the request does not override default drawing
+        parameters, the default drawing parameters object is returned."""
+        if not defaults:
+            return DrawingParameters.load(db_loader, self._drawings_schema_object())
+        if self._default_parameters is None:
+            self._default_parameters = DrawingParameters.load(
+                DBDictsLoader(self.default_drawing_parameters),
+                self._drawings_schema_object(),
+            )
+        return self._default_parameters
+
+    def _db_digest(self, db):
+        """Return the hash of the content of the given database instance. The hash is
+        computed once per database instance. It depends on the content of the
+        database only, so it is the same in all processes serving the same
+        database."""
+        ref, digest = self._digest
+        if ref is None or ref() is not db:
+            digest = content_digest((db._schema._schema, db._loader.content))
+            self._digest = (weakref.ref(db), digest)
+        return digest
 
-    def _dump(self):
-        return Response(
-            response=DBDumperFactory.get("yaml")().dump(self.db._loader.content),
-            mimetype=self.MIMETYPES["yaml"],
-        )
+    def _schema(self):
+        def build(db):
+            return (
+                SchemaDumperFactory.get("yaml")().dump(db._schema),
+                self.MIMETYPES["yaml"],
+            )
 
-    def _tags(self):
-        try:
-            tags = self.db.tags(
-                request.args.get("node"),
-                request.args.get("infrastructure"),
-                request.args.get("datacenter"),
-                "on_nodes" in request.args,
-                "on_racks" in request.args,
+        return self._cached_response(build)
+
+    def _dump(self):
+        def build(db):
+            return (
+                DBDumperFactory.get("yaml")().dump(db._loader.content),
+                self.MIMETYPES["yaml"],
             )
-        except RacksDBRequestError as err:
-            abort(400, str(err))
-        except RacksDBNotFoundError as err:
-            abort(404, str(err))
-        dump_format = request.args.get("format", "json")
-        dumper = DBDumperFactory.get(dump_format)()
-        return Response(
-            response=dumper.dump(tags), mimetype=self.MIMETYPES[dump_format]
-        )
 
-    def _dump_view(self, content):
-        data = getattr(self.db, content)
+        return self._cached_response(build)
+
+    def _tags(self):
+        def build(db):
+            try:
+                tags = db.tags(
+                    request.args.get("node"),
+                    request.args.get("infrastructure"),
+                    request.args.get("datacenter"),
+                    "on_nodes" in request.args,
+                    "on_racks" in request.args,
+                )
+            except RacksDBRequestError as err:
+                abort(400, str(err))
+            except RacksDBNotFoundError as err:
+                abort(404, str(err))
+            dump_format = request.args.get("format", "json")
+            dumper = DBDumperFactory.get(dump_format)()
+            return dumper.dump(tags), self.MIMETYPES[dump_format]
+
+        return self._cached_response(build)
+
+    def _view_dumper(self, db, content, streamed=False):
+        """Return the data of the view with the given content filtered with query
+        arguments, the dumper and the format selected in query arguments. When
+        streamed is True, data is a generator of the values filtered lazily while
+        the response is generated."""
+        data = getattr(db, content)
         view = self.views[content]
         filters = {}
         for _filter in view.filters:
@@ -184,10 +424,14 @@ class RacksDBWebBlueprint(Blueprint):
             if value is not None and _filter.nargs is not None:
                 value = value.split(",")
             filters[_filter.name] = value
-        data = data.filter(**filters)
+        if streamed:
+            data = data.iter_filter(**filters)
+        else:
+            data = data.filter(**filters)
 
         if "list" in request.args:
-            data = [item.name for item in data]
+            names = (item.name for item in data)
+            data = names if streamed else list(names)
 
         dump_format = request.args.get("format", "json")
         dumper = DBDumperFactory.get(dump_format)(
@@ -195,37 +439,60 @@ class RacksDBWebBlueprint(Blueprint):
             objects_map=view.objects_map,
             fold="fold" in request.args,
         )
-        return Response(
-            response=dumper.dump(data), mimetype=self.MIMETYPES[dump_format]
-        )
+        return data, dumper, dump_format
+
+    def _dump_view(self, content):
+        # JSON and NDJSON responses which are not in cache are streamed as they are
+        # generated without being fully serialized in memory, without entity tag.
+        if request.args.get("format", "json") in self.STREAMED_FORMATS:
+
+            def stream(db):
+                data, dumper, dump_format = self._view_dumper(
+                    db, content, streamed=True
+                )
+                return dumper.stream(data), self.MIMETYPES[dump_format]
+
+            return self._streamed_response(stream)
+
+        def build(db):
+            data, dumper, dump_format = self._view_dumper(db, content)
+            return dumper.dump(data), self.MIMETYPES[dump_format]
+
+        return self._cached_response(build)
 
     def _draw(self, entity, name, format):
+        # Capture current database instance to keep using it for the whole request
+        # in case it is reloaded in the meantime.
+        db = self.db
         # Manage drawing parameters
+        # True when the request does not override default drawing parameters
+        defaults = False
         if request.method == "GET":
             content = copy.deepcopy(self.default_drawing_parameters)
             merge_args_parameters(content, request.args)
             db_loader = DBDictsLoader(content)
             # Build drawing parameters db with request parameters.
-            pass
+            defaults = not any(arg.startswith("parameters.") for arg in request.args)
         else:
             if not len(request.data):
                 db_loader = DBDictsLoader(self.default_drawing_parameters)
+                defaults = True
             elif request.is_json:
                 db_loader = DBDictsLoader(
                     self.default_drawing_parameters, request.get_json()
                 )
             elif request.content_type == "application/x-yaml":
-                db_loader = DBStringLoader(
-                    request.data.decode(), initial=self.default_drawing_parameters
-                )
+                # Initial content is deep-merged with request content, copy it to
+                # keep default drawing parameters untouched.
+                try:
+                    db_loader = DBStringLoader(
+                        request.data.decode(),
+                        initial=copy.deepcopy(self.default_drawing_parameters),
+                    )
+                except DBFormatError as err:
+                    abort(400, f"Unable to load drawing parameters: {str(err)}")
             else:
                 abort(415, "Unsupported request body format")
-        try:
-            parameters = DrawingParameters.load(db_loader, self.drawings_schema)
-        except DBSchemaError as err:
-            abort(500, f"Unable to load drawing parameters schema: {str(err)}")
-        except DBFormatError as err:
-            abort(400, f"Unable to load drawing parameters: {str(err)}")
 
         # Handle coordinates query parameters
         with_coordinates = "coordinates" in request.args
@@ -233,6 +500,79 @@ class RacksDBWebBlueprint(Blueprint):
         if coordinates_format not in {"json", "yaml"}:
             abort(400, "Unsupported coordinates format")
 
+        # Search for the drawing in cache, with the hash of all inputs of the
+        # drawing as key.
+        drawing = None
+        if self.drawings_cache.enabled:
+            # Load drawing parameters schema to compute its digest.
+            self._drawings_schema_object()
+            key = self.drawings_cache.key(
+                entity=entity,
+                name=name,
+                format=format,
+                parameters=db_loader.content,
+                coordinates=coordinates_format if with_coordinates else None,
+                db=self._db_digest(db),
+                drawings_schema=self._drawings_schema_digest,
+                version=get_version(),
+            )
+            drawing = self.drawings_cache.get(key, with_coordinates)
+        if drawing is None:
+            drawing = self._render(
+                db,
+                entity,
+                name,
+                format,
+                db_loader,
+                defaults,
+                with_coordinates,
+                coordinates_format,
+            )
+            if self.drawings_cache.enabled:
+                self.drawings_cache.add(key, drawing)
+
+        file = io.BytesIO(drawing.image)
+        if with_coordinates:
+            coordinates_fh = io.StringIO(drawing.coordinates)
+            # Send coordinates in multipart response along with generated image.
+            multipart = MultipartEncoder(
+                fields={
+                    "image": (f"{name}.{format}", file, self.MIMETYPES[format]),
+                    "coordinates": (
+                        f"coordinates.{coordinates_format}",
+                        coordinates_fh,
+                        self.MIMETYPES[coordinates_format],
+                    ),
+                }
+            )
+            return Response(multipart.to_string(), mimetype=multipart.content_type)
+
+        return send_file(
+            file,
+            mimetype=self.MIMETYPES[format],
+        )
+
+    def _render(
+        self,
+        db,
+        entity,
+        name,
+        format,
+        db_loader,
+        defaults,
+        with_coordinates,
+        coordinates_format,
+    ):
+        """Render drawing of the given entity with parameters provided by the
+        loader, or default parameters, and return it with its optional
+        coordinates."""
+        try:
+            parameters = self._drawing_parameters(db_loader, defaults)
+        except DBSchemaError as err:
+            abort(500, f"Unable to load drawing parameters schema: {str(err)}")
+        except DBFormatError as err:
+            abort(400, f"Unable to load drawing parameters: {str(err)}")
+
         # Create volatile in-memory file handlers
         file = io.BytesIO()
         coordinates_fh = io.StringIO() if with_coordinates else None
@@ -244,7 +584,7 @@ class RacksDBWebBlueprint(Blueprint):
                 else:
                     draw_infra_class = InfrastructureDrawer
                 drawer = draw_infra_class(
-                    self.db,
+                    db,
                     name,
                     file,
                     format,
@@ -254,7 +594,7 @@ class RacksDBWebBlueprint(Blueprint):
                 )
             elif entity == "room":
                 drawer = RoomDrawer(
-                    self.db,
+                    db,
                     name,
                     file,
                     format,
@@ -267,37 +607,17 @@ class RacksDBWebBlueprint(Blueprint):
             drawer.draw()
         except RacksDBError as err:
             abort(400, str(err))
-        file.seek(0)
-
-        if with_coordinates:
-            coordinates_fh.seek(0)
-            # Send coordinates in multipart response along with generated image.
-            multipart = MultipartEncoder(
-                fields={
-                    "image": (f"{name}.{format}", file, self.MIMETYPES[format]),
-                    "coordinates": (
-                        f"coordinates.{coordinates_format}",
-                        coordinates_fh,
-                        self.MIMETYPES[coordinates_format],
-                    ),
-                }
-            )
-            return Response(multipart.to_string(), mimetype=multipart.content_type)
-
-        return send_file(
-            file,
-            mimetype=self.MIMETYPES[format],
+        return CachedDrawing(
+            file.getvalue(),
+            coordinates_fh.getvalue() if with_coordinates else None,
         )
 
     def _openapi(self):
-        _drawings_schema = Schema(
-            SchemaFileLoader(self.drawings_schema),
-            SchemaDefinedTypeLoader(DrawingParameters.DEFINED_TYPES_MODULE),
-        )
+        db = self.db
         data = OpenAPIGenerator(
-            self.db._prefix,
+            db._prefix,
             get_version(),
-            {"RacksDB": self.db._schema, "Drawings": _drawings_schema},
+            {"RacksDB": db._schema, "Drawings": self._drawings_schema_object()},
             self.views,
         ).generate()
         dumper = DBDumperFactory.get("yaml")()
@@ -342,6 +662,75 @@ class RacksDBWebApp(Flask):
             default=env_or_default(RacksDBEnv.DB, RacksDB.DEFAULT_DB),
             type=Path,
         )
+        parser.add_argument(
+            "--cache",
+            help=(
+                "Directory of database snapshots to speed up loading when files are "
+                "unmodified (default: %(default)s)"
+            ),
+            default=env_or_default(RacksDBEnv.CACHE, None),
+            type=Path,
+        )
+        parser.add_argument(
+            "--workers",
+            help=(
+                "Number of parallel processes to parse database files "
+                "(default: %(default)s)"
+            ),
+            default=1,
+            type=int,
+        )
+        parser.add_argument(
+            "--reload-interval",
+            help=(
+                "Interval in seconds between checks of database files "
+                "modifications to reload database automatically, 0 to disable "
+                "(default: %(default)s)"
+            ),
+            default=0,
+            type=float,
+        )
+        parser.add_argument(
+            "--response-cache-size",
+            help=(
+                "Maximum number of responses kept in cache, 0 to disable "
+                "(default: %(default)s)"
+            ),
+            default=128,
+            type=int,
+        )
+        parser.add_argument(
+            "--response-cache-body-size",
+            help=(
+                "Maximum size in bytes of response bodies kept in cache "
+                "(default: %(default)s)"
+            ),
+            default=1048576,
+            type=int,
+        )
+        parser.add_argument(
+            "--drawings-cache-size",
+            help=(
+                "Maximum number of drawings kept in memory cache, 0 to disable "
+                "(default: %(default)s)"
+            ),
+            default=32,
+            type=int,
+        )
+        parser.add_argument(
+            "--drawings-cache-dir",
+            help="Directory of drawings cache shared by processes (default: none)",
+            type=Path,
+        )
+        parser.add_argument(
+            "--drawings-cache-dir-size",
+            help=(
+                "Maximum number of drawings kept in cache directory, 0 for no limit "
+                "(default: %(default)s)"
+            ),
+            default=1024,
+            type=int,
+        )
         parser.add_argument(
             "--host",
             help="Binding interface for listening socket (default: %(default)s)",
@@ -396,6 +785,14 @@ class RacksDBWebApp(Flask):
                     self.args.db,
                     self.args.drawings_schema,
                     openapi=self.args.openapi,
+                    cache=self.args.cache,
+                    workers=self.args.workers,
+                    reload_interval=self.args.reload_interval,
+                    response_cache_size=self.args.response_cache_size,
+                    response_cache_body_size=self.args.response_cache_body_size,
+                    drawings_cache_size=self.args.drawings_cache_size,
+                    drawings_cache_dir=self.args.drawings_cache_dir,
+                    drawings_cache_dir_size=self.args.drawings_cache_dir_size,
                 )
             )
         except DBSchemaError as err:
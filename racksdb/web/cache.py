@@ -0,0 +1,202 @@
+# Copyright (c) 2026 Rackslab
+#
+# This file is part of RacksDB.
+#
+# SPDX-License-Identifier: MIT
+
+import collections
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import logging
+import typing as t
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+
+class CachedResponse:
+    """Serialized body of response with its mimetype and strong entity tag computed
+    with the hash of the body."""
+
+    def __init__(self, body: t.Union[str, bytes], mimetype: str):
+        if isinstance(body, str):
+            body = body.encode()
+        self.body = body
+        self.mimetype = mimetype
+        self.etag = hashlib.sha256(body).hexdigest()
+
+
+class LRUCache:
+    """Thread-safe cache with a bounded number of entries. When the cache is full,
+    the least recently used entry is evicted. The cache is disabled when size is
+    0."""
+
+    def __init__(self, size: int):
+        self.size = size
+        self._entries = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key):
+        """Return the cached entry with the given key, or None if not found."""
+        with self._lock:
+            try:
+                self._entries.move_to_end(key)
+            except KeyError:
+                return None
+            return self._entries[key]
+
+    def add(self, key, entry):
+        """Add the entry with the given key in cache and return it."""
+        if self.size <= 0:
+            return entry
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.size:
+                self._entries.popitem(last=False)
+        return entry
+
+    def clear(self):
+        """Remove all entries from cache."""
+        with self._lock:
+            self._entries.clear()
+
+
+class CachedDrawing:
+    """Rendered image with its optional coordinates."""
+
+    def __init__(self, image: bytes, coordinates: t.Optional[str]):
+        self.image = image
+        self.coordinates = coordinates
+
+
+class DrawingsCache:
+    """Cache of rendered drawings, addressed by the hash of all the inputs of the
+    drawing. Drawings are kept in memory in a bounded LRU cache. When a directory is
+    provided, drawings are also saved in files in this directory, so they can be
+    shared by multiple processes and restored after restart. The number of drawings
+    in directory is bounded by directory_size, the least recently used drawings are
+    removed when a new drawing is saved. The directory is not bounded when
+    directory_size is 0."""
+
+    def __init__(
+        self,
+        size: int,
+        directory: t.Optional[Path] = None,
+        directory_size: int = 1024,
+    ):
+        self.memory = LRUCache(size)
+        self.directory = directory
+        self.directory_size = directory_size
+
+    @property
+    def enabled(self) -> bool:
+        """True if drawings are saved in memory or in directory."""
+        return self.memory.size > 0 or self.directory is not None
+
+    @staticmethod
+    def key(**inputs) -> str:
+        """Return the hash of the canonical JSON representation of the given inputs
+        of the drawing."""
+        return hashlib.sha256(
+            json.dumps(inputs, sort_keys=True, default=str).encode()
+        ).hexdigest()
+
+    def _paths(self, key: str) -> t.Tuple[Path, Path]:
+        return (
+            self.directory / f"{key}.image",
+            self.directory / f"{key}.coordinates",
+        )
+
+    def get(self, key: str, with_coordinates: bool) -> t.Optional[CachedDrawing]:
+        """Return the cached drawing with the given key, or None if not found."""
+        drawing = self.memory.get(key)
+        if drawing is not None or self.directory is None:
+            return drawing
+        image_path, coordinates_path = self._paths(key)
+        try:
+            image = image_path.read_bytes()
+            coordinates = coordinates_path.read_text() if with_coordinates else None
+        except FileNotFoundError:
+            return None
+        except OSError as err:
+            logger.warning("Unable to read cached drawing %s: %s", image_path, err)
+            return None
+        # Update modification time of the image file to mark the drawing as recently
+        # used, this is ignored if the file has been removed in the meantime.
+        try:
+            os.utime(image_path)
+        except OSError:
+            pass
+        return self.memory.add(key, CachedDrawing(image, coordinates))
+
+    def _write(self, path: Path, content: bytes):
+        """Write content in file renamed atomically to avoid concurrent processes
+        reading partially written files."""
+        fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as fh:
+                fh.write(content)
+            os.replace(tmp, path)
+        except BaseException:
+            os.unlink(tmp)
+            raise
+
+    def add(self, key: str, drawing: CachedDrawing) -> CachedDrawing:
+        """Add the drawing with the given key in cache and return it."""
+        self.memory.add(key, drawing)
+        if self.directory is None:
+            return drawing
+        image_path, coordinates_path = self._paths(key)
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            # Write coordinates before image, as the presence of the image file
+            # indicates the drawing is available.
+            if drawing.coordinates is not None:
+                self._write(coordinates_path, drawing.coordinates.encode())
+            self._write(image_path, drawing.image)
+        except OSError as err:
+            logger.warning("Unable to save drawing in cache %s: %s", image_path, err)
+        self._evict()
+        return drawing
+
+    def _evict(self):
+        """Remove the least recently used drawings from directory, according to the
+        modification times of the image files, until the number of drawings is below
+        the maximum size of the directory. Files removed concurrently by other
+        processes are ignored."""
+        if self.directory_size <= 0:
+            return
+        entries = []
+        try:
+            for image_path in self.directory.glob("*.image"):
+                try:
+                    entries.append((image_path.stat().st_mtime_ns, image_path))
+                except FileNotFoundError:
+                    pass
+        except OSError as err:
+            logger.warning(
+                "Unable to list drawings in cache %s: %s", self.directory, err
+            )
+            return
+        if len(entries) <= self.directory_size:
+            return
+        entries.sort()
+        for _, image_path in entries[: len(entries) - self.directory_size]:
+            # Remove image before coordinates, as the presence of the image file
+            # indicates the drawing is available.
+            for path in self._paths(image_path.stem):
+                try:
+                    path.unlink()
+                except FileNotFoundError:
+                    pass
+                except OSError as err:
+                    logger.warning(
+                        "Unable to remove drawing from cache %s: %s", path, err
+                    )